@@ -82,7 +82,8 @@ openai_client = None
 try:
     from openai import OpenAI
     if OPENAI_API_KEY:
-        openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        from utils.faults import openai_http_client
+        openai_client = OpenAI(api_key=OPENAI_API_KEY, http_client=openai_http_client())
 except ImportError:
     print("⚠️  OpenAI 패키지가 설치되지 않았습니다. STT 기능을 사용하려면 'pip install openai'를 실행하세요.")
 
@@ -99,6 +100,10 @@ call_responses = {}
 active_mock_calls = {}
 call_metadata = {}
 
+# 업스트림 호스트 DNS 미리 해석 (백그라운드)
+from utils.http import prime_upstream_dns
+prime_upstream_dns()
+
 # 라우트 등록 (모듈화된 라우트 사용)
 from routes.geo import register_geo_routes
 from routes.stt import register_stt_routes
@@ -108,6 +113,9 @@ from routes.emergency import register_emergency_routes
 from routes.auth import register_auth_routes
 from routes.chat import register_chat_routes
 from routes.twilio import register_twilio_routes
+from routes.metrics import register_metrics_routes
+from routes.beds import register_bed_routes
+from routes.admin import register_admin_routes
 
 # 라우트 등록
 register_geo_routes(app)
@@ -118,6 +126,9 @@ register_emergency_routes(app)
 register_auth_routes(app)
 register_chat_routes(app, socketio)
 register_twilio_routes(app, call_responses, call_metadata, socketio)
+register_metrics_routes(app)
+register_bed_routes(app, socketio)
+register_admin_routes(app)
 
 # 서버 상태 확인 페이지
 @app.route('/')
@@ -133,7 +144,9 @@ def index():
         <ul>
             <li><code>/api/geo/coord2address</code> - 좌표 → 주소 변환</li>
             <li><code>/api/geo/coord2region</code> - 좌표 → 행정구역 변환</li>
+            <li><code>/api/geo/locate</code> - 좌표 → 주소 + 행정구역 동시 변환</li>
             <li><code>/api/geo/address2coord</code> - 주소 → 좌표 변환</li>
+            <li><code>/api/geo/address2coord/batch</code> - 주소 목록 → 좌표 일괄 변환</li>
             <li><code>/api/geo/route</code> - 경로 조회</li>
             <li><code>/api/stt/transcribe</code> - 음성 → 텍스트 변환 (STT)</li>
             <li><code>/api/hospitals/top3</code> - 병원 Top3 조회</li>
@@ -151,6 +164,8 @@ def index():
             <li><code>/api/telephony/call</code> - 전화 걸기</li>
             <li><code>/twilio/gather</code> - Twilio 다이얼 입력 콜백</li>
             <li><code>/twilio/status</code> - Twilio 통화 상태 콜백</li>
+            <li><code>/metrics</code> - 운영 지표 (Prometheus 형식)</li>
+            <li><code>/api/admin/profile</code> - 샘플링 프로파일 수집 (관리자 전용)</li>
         </ul>
     </body>
     </html>
@@ -191,9 +206,10 @@ if __name__ == '__main__':
             import eventlet
             # monkey patch는 서버 시작 직전에만 적용
             # 라우트 등록은 이미 완료되었으므로 문제 없음
-            # socket은 제외하여 DNS 해석 문제 방지
-            eventlet.monkey_patch(socket=False, dns=False)
-            print("✅ eventlet monkey patch 적용됨 (socket, dns 제외)")
+            # socket은 제외하여 DNS 해석 문제 방지 (eventlet의 DNS 패치는 socket 패치에 포함됨)
+            # 블로킹 소켓을 쓰는 외부 API 호출은 utils/concurrency.py가 tpool로 위임
+            eventlet.monkey_patch(socket=False)
+            print("✅ eventlet monkey patch 적용됨 (socket 제외)")
             final_async_mode = 'eventlet'
         except Exception as e:
             print(f"⚠️  eventlet monkey patch 실패: {e}")
@@ -215,6 +231,26 @@ if __name__ == '__main__':
     # SocketIO의 async_mode 업데이트
     socketio.async_mode = final_async_mode
     
+    # 테이블 생성 때 만든 DB 연결 풀을 새로 만듦 (그대로 두면 실제 큐/잠금을 기다리며 허브 전체가 멈추거나 잠금 오류)
+    # 병렬 조회 executor는 요청 처리 중(패치 이후)에 utils.concurrency.new_executor()로 만들어지므로 다시 초기화할 필요 없음
+    # import 시점에 만든 잠금은 실제 OS 잠금으로 남아 tpool 스레드와 그린스레드가 함께 써도 안전함
+    if final_async_mode in ['eventlet', 'gevent']:
+        with app.app_context():
+            db.engine.dispose(close=False)
+    
+    # 캐시 스냅샷 주기 저장 (병원 기본정보·등급·역지오코딩·경로 캐시)
+    # SIGTERM(배포/재시작)에도 atexit 저장이 실행되도록 정상 종료로 변환
+    import signal
+    import sys
+    from utils.cache_snapshot import run_cache_snapshot_loop
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    socketio.start_background_task(run_cache_snapshot_loop, socketio.sleep)
+    
+    # 외부 API 호출(data.go.kr, 카카오, OpenAI, Twilio) 실행 방식 확인
+    # eventlet에서 소켓을 패치하지 않으므로 블로킹 호출은 tpool(실제 OS 스레드)로 위임되어 허브를 막지 않음
+    from utils.concurrency import get_io_mode
+    print(f"🔌 외부 I/O 실행 방식: {get_io_mode()}")
+    
     # Flask-SocketIO 서버 실행
     print(f"🚀 SocketIO 서버 시작 (모드: {final_async_mode})")
     if final_async_mode in ['eventlet', 'gevent']:
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""오프라인 벤치마크 (run_benchmarks.py), STT 파이프라인 비교 (stt_pipeline.py), 장애 주입 지연 예산 점검 (degraded.py), 부하 테스트 (load_test.py, stub_upstream.py) 및 업스트림 픽스처 (fixtures.py, make_fixtures.py)"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def prepare_offline_environment(work_dir: Path = None) -> Path:
+    """config import 전에 호출: 실제 캐시/로그 파일을 건드리지 않도록 임시 경로 사용, API 키가 없으면 더미 값 사용"""
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix="savebridge-bench-"))
+    for key in ("KAKAO_REST_API_KEY", "DATA_GO_KR_SERVICE_KEY", "OPENAI_API_KEY"):
+        os.environ.setdefault(key, "offline-benchmark")
+    os.environ.update({
+        "CACHE_SNAPSHOT_DIR": str(work_dir / "cache"),
+        "REVERSE_GEOCODE_CACHE_PATH": str(work_dir / "reverse_geocode_cache.pkl"),
+        "BED_HISTORY_PATH": str(work_dir / "bed_history.npz"),
+        "ETA_SAMPLE_LOG_PATH": "",
+        "TRACE_SLOW_LOG_PATH": "",
+        "DATABASE_URI": "sqlite://",
+    })
+    return work_dir
+
+
+def create_benchmark_app(*registrars):
+    """메모리 DB를 쓰는 최소 Flask 앱 (registrars: register_*_routes(app)를 호출하는 함수들)"""
+    from flask import Flask
+    from models import db
+    from routes.metrics import register_metrics_routes
+
+    app = Flask("benchmarks")
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    register_metrics_routes(app)
+    for register in registrars:
+        register(app)
+    return app
+
+
+def clear_upstream_caches() -> None:
+    """병원 기본정보/등급/병상/경로 캐시 초기화 (매번 업스트림을 호출하는 콜드 실행용)"""
+    from services import hospital_service as hs
+    from utils.geo import ROUTE_CACHE
+
+    for cache in (hs.BASEINFO_CACHE, hs.GRADE_CACHE, hs.BED_CACHE, ROUTE_CACHE):
+        cache.clear()
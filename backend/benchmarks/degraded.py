@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업스트림 장애 주입 상태에서의 지연 예산 점검 (오프라인)
+
+업스트림은 픽스처 어댑터, OpenAI는 대역 클라이언트(모델 지연 흉내)를 쓰고 그 앞에 utils.faults 장애 주입을 끼워
+장애 프로필별로 다음 경로를 --runs회씩 실행합니다.
+
+  top3            : /api/hospitals/top3 (매회 캐시 초기화 → data.go.kr, 카카오 호출 발생)
+  stt_transcribe  : /api/stt/transcribe (Whisper 1회 + 채팅 3회)
+  stt_convert     : /api/stt/convert-to-sbar (채팅 3회)
+
+프로필마다 p50/p95/최대 지연, 실패 건수, 주입된 장애 횟수를 출력하고 p95가 예산(--top3-budget-ms, --stt-budget-ms)을
+넘으면 FAIL로 표시합니다. 기본 프로필은 baseline, slow, flaky, truncated, drip이며 timeouts는 읽기 타임아웃까지
+기다리므로 --profiles로 직접 지정할 때만 실행됩니다. --faults로 utils/faults.py 형식의 규칙 파일을 추가할 수 있습니다.
+
+사용법:
+    python benchmarks/degraded.py [--runs 20] [--profiles slow,flaky] [--faults rules.json]
+                                  [--top3-budget-ms 5000] [--stt-budget-ms 20000] [--fail-on-budget] [--json PATH]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from benchmarks import clear_upstream_caches, create_benchmark_app, prepare_offline_environment
+
+WORK_DIR = prepare_offline_environment()
+
+from benchmarks.fixtures import FIXTURE_PATH, FixtureAdapter, FixtureResponder, install_transport, load_fixtures
+from utils.faults import FAULT_CONNECT_ERROR, FAULT_DRIP, FAULT_ERROR, FAULT_TIMEOUT, FAULT_TRUNCATE, FaultPlan
+
+_DATA_GO_KR = "apis.data.go.kr"
+_KAKAO_NAVI = "apis-navi.kakaomobility.com"
+_KAKAO_LOCAL = "dapi.kakao.com"
+_OPENAI = "api.openai.com"
+
+PROFILES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "baseline": {},
+    "slow": {
+        "*": {"latency_ms": {"dist": "lognormal", "p50": 300, "p95": 1500}},
+        _OPENAI: {"latency_ms": {"dist": "lognormal", "p50": 400, "p95": 2000}},
+    },
+    "flaky": {
+        "*": {"error_rate": 0.10, "error_status": [500, 502, 503], "connect_error_rate": 0.02},
+    },
+    "truncated": {
+        _DATA_GO_KR: {"truncate_rate": 0.15},
+        _KAKAO_NAVI: {"truncate_rate": 0.15},
+        _KAKAO_LOCAL: {"truncate_rate": 0.15},
+    },
+    "drip": {
+        "*": {"drip_rate": 0.3, "drip_bytes_per_sec": 8192, "drip_max_ms": 3000},
+    },
+    "timeouts": {
+        "*": {"timeout_rate": 0.05, "latency_ms": {"dist": "exponential", "mean": 200}},
+    },
+}
+DEFAULT_PROFILES = ("baseline", "slow", "flaky", "truncated", "drip")
+
+_SAMPLE_TRANSCRIPT = "60대 남성 숨이 안 쉬어지고 가슴이 아프다고 함. 혈압 이백에 일백, 맥박 110, 산소포화도 88. 약 20분 전 발생."
+
+
+class _Namespace:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class _RetryableStatus(Exception):
+    """openai 클라이언트가 재시도하는 상태 코드 (429, 5xx)"""
+
+
+class MockOpenAI:
+    """OpenAI 클라이언트 대역: 모델 지연을 흉내 내고 api.openai.com 규칙의 장애를 주입 (openai 기본 재시도 2회 흉내)"""
+
+    def __init__(self, plan: FaultPlan, whisper_sec: float, chat_sec: float, timeout_sec: float, max_retries: int = 2):
+        self.plan = plan
+        self.whisper_sec = whisper_sec
+        self.chat_sec = chat_sec
+        self.timeout_sec = timeout_sec
+        self.max_retries = max_retries
+        self.rng = random.Random(7)
+        self.audio = _Namespace(transcriptions=_Namespace(create=self._transcribe))
+        self.chat = _Namespace(completions=_Namespace(create=self._chat))
+
+    def _call(self, path: str, model_sec: float, body: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._attempt(path, model_sec, body)
+            except (ConnectionError, _RetryableStatus) as e:
+                if attempt == self.max_retries:
+                    raise RuntimeError(f"OpenAI {path}: {e}") from None
+                time.sleep(min(0.5 * 2 ** attempt, 8.0) * self.rng.uniform(0.75, 1.0))
+        raise AssertionError("unreachable")
+
+    def _attempt(self, path: str, model_sec: float, body: str) -> str:
+        decision = self.plan.decide(f"https://{_OPENAI}{path}")
+        kind = decision.kind if decision else None
+        latency = (decision.latency if decision else 0.0) + model_sec * self.rng.uniform(0.8, 1.2)
+        if kind == FAULT_CONNECT_ERROR:
+            raise ConnectionError("injected fault: connection refused")
+        if kind == FAULT_TIMEOUT or latency > self.timeout_sec:
+            time.sleep(self.timeout_sec)
+            raise ConnectionError("injected fault: request timed out")
+        time.sleep(latency)
+        if kind == FAULT_ERROR:
+            if decision.error_status >= 500 or decision.error_status == 429:
+                raise _RetryableStatus(f"Error code: {decision.error_status}")
+            raise RuntimeError(f"Error code: {decision.error_status}")
+        if kind == FAULT_TRUNCATE:
+            raise ValueError("injected fault: truncated JSON response")
+        if kind == FAULT_DRIP:
+            time.sleep(decision.drip_seconds(len(body.encode("utf-8")) + 400))
+        return body
+
+    def _transcribe(self, **kwargs):
+        return self._call("/v1/audio/transcriptions", self.whisper_sec, _SAMPLE_TRANSCRIPT)
+
+    def _chat(self, **kwargs):
+        content = self._call("/v1/chat/completions", self.chat_sec, "Pre-KTAS 2점. S: " + _SAMPLE_TRANSCRIPT)
+        return _Namespace(choices=[_Namespace(message=_Namespace(content=content))])
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_profile(name: str, spec: Dict[str, Any], fixtures: Dict[str, Any], args) -> List[Dict[str, Any]]:
+    """장애 프로필 하나로 top3/STT 경로를 실행하고 경로별 결과 반환"""
+    from routes.hospitals import register_hospitals_routes
+    from routes.stt import register_stt_routes
+    from utils.faults import FaultInjectionAdapter
+
+    plan = FaultPlan(spec, seed=args.seed)
+    install_transport(FaultInjectionAdapter(FixtureAdapter(FixtureResponder(fixtures)), plan))
+    openai_client = MockOpenAI(plan, args.whisper_ms / 1000.0, args.chat_ms / 1000.0, args.openai_timeout)
+    app = create_benchmark_app(register_hospitals_routes, lambda a: register_stt_routes(a, openai_client))
+    client = app.test_client()
+    scenarios = fixtures["meta"]["scenarios"]
+
+    def top3(i):
+        clear_upstream_caches()
+        return client.post("/api/hospitals/top3", json=scenarios[i % len(scenarios)])
+
+    def stt_transcribe(i):
+        return client.post("/api/stt/transcribe", content_type="multipart/form-data",
+                           data={"audio": (io.BytesIO(b"RIFF" + b"\0" * 2048), "sample.wav")})
+
+    def stt_convert(i):
+        return client.post("/api/stt/convert-to-sbar", json={"text": _SAMPLE_TRANSCRIPT})
+
+    results = []
+    for path, call, budget in (("top3", top3, args.top3_budget_ms),
+                               ("stt_transcribe", stt_transcribe, args.stt_budget_ms),
+                               ("stt_convert", stt_convert, args.stt_budget_ms)):
+        latencies, failures = [], 0
+        for i in range(args.runs):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                resp = call(i)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            if resp.status_code != 200:
+                failures += 1
+        p95 = _percentile(latencies, 0.95)
+        results.append({
+            "profile": name,
+            "path": path,
+            "runs": args.runs,
+            "failures": failures,
+            "p50_ms": round(_percentile(latencies, 0.5), 1),
+            "p95_ms": round(p95, 1),
+            "max_ms": round(max(latencies), 1),
+            "budget_ms": budget,
+            "within_budget": p95 <= budget,
+        })
+    results.append({"profile": name, "injected": plan.stats()})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업스트림 장애 주입 상태의 top3/STT 지연 예산 점검")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_PATH, help="업스트림 픽스처(.json.gz)")
+    parser.add_argument("--profiles", default=",".join(DEFAULT_PROFILES),
+                        help=f"실행할 장애 프로필 (쉼표 구분, 전체: {', '.join(PROFILES)})")
+    parser.add_argument("--faults", type=Path, action="append", default=[],
+                        help="utils/faults.py 형식 규칙 파일 (파일 이름이 프로필 이름, 여러 번 지정 가능)")
+    parser.add_argument("--runs", type=int, default=20, help="프로필·경로별 실행 횟수")
+    parser.add_argument("--seed", type=int, default=20261019, help="장애 주입 난수 시드")
+    parser.add_argument("--whisper-ms", type=float, default=1200.0, help="Whisper 모델 지연 흉내")
+    parser.add_argument("--chat-ms", type=float, default=1500.0, help="채팅 완성 1회 모델 지연 흉내")
+    parser.add_argument("--openai-timeout", type=float, default=30.0, help="OpenAI 호출 타임아웃(초)")
+    parser.add_argument("--top3-budget-ms", type=float, default=5000.0, help="top3 p95 지연 예산")
+    parser.add_argument("--stt-budget-ms", type=float, default=20000.0, help="STT p95 지연 예산")
+    parser.add_argument("--fail-on-budget", action="store_true", help="예산 초과가 있으면 종료 코드 1")
+    parser.add_argument("--json", type=Path, help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    profiles = {name: PROFILES[name] for name in args.profiles.split(",") if name}
+    for path in args.faults:
+        profiles[path.stem] = json.loads(path.read_text(encoding="utf-8"))
+
+    fixtures = load_fixtures(args.fixtures)
+    # STT 라우트가 작업 디렉토리에 stt_history.txt를 남기므로 임시 디렉토리에서 실행
+    os.chdir(WORK_DIR)
+
+    results: List[Dict[str, Any]] = []
+    over_budget = []
+    print(f"{'profile':<12} {'path':<16} {'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9} {'fail':>6} {'budget':>8}  result")
+    for name, spec in profiles.items():
+        for row in run_profile(name, spec, fixtures, args):
+            results.append(row)
+            if "injected" in row:
+                injected = ", ".join(f"{host} {kind}={count}" for host, kinds in row["injected"].items()
+                                     for kind, count in kinds.items())
+                print(f"{'':<12} 주입: {injected or '-'}")
+                continue
+            status = "PASS" if row["within_budget"] else "FAIL"
+            if not row["within_budget"]:
+                over_budget.append(f"{row['profile']}/{row['path']}")
+            print(f"{row['profile']:<12} {row['path']:<16} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                  f"{row['max_ms']:>9.1f} {row['failures']:>3}/{row['runs']:<2} {row['budget_ms']:>8.0f}  {status}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"results": results}, ensure_ascii=False, indent=2), encoding="utf-8")
+    if over_budget:
+        print(f"\n⚠️ 지연 예산 초과 (p95): {', '.join(over_budget)}")
+        if args.fail_on_budget:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
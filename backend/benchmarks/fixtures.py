@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""벤치마크용 업스트림 응답 픽스처
+
+fixtures/upstream.json.gz 형식:
+    {"meta": {"source": "synthetic" | "live", "created_at": ..., "scenarios": [top3 요청 본문, ...]},
+     "responses": {fixture_key(url, params): 응답 본문(XML 문자열)}}
+
+- build_synthetic_fixtures(): 서울/경기/인천 응급의료기관을 본뜬 결정적(seed 고정) 합성 데이터
+- make_fixtures.py --live: 실제 data.go.kr 응답을 RecordingAdapter로 녹화
+- FixtureResponder: 키로 녹화된 응답을 찾아 반환 (없으면 빈 목록), 카카오 길찾기/좌표 변환은 좌표로 합성
+- install_fixture_transport(): utils.http 공유 세션에 FixtureAdapter를 연결하여 네트워크 없이 실행
+"""
+
+import gzip
+import json
+import math
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from xml.sax.saxutils import escape
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+FIXTURE_PATH = FIXTURE_DIR / "upstream.json.gz"
+
+# 응답을 구분하는 요청 파라미터 (serviceKey, pageNo, numOfRows는 제외)
+_KEY_PARAMS = ("STAGE1", "STAGE2", "HPID")
+
+ER_BED_OP = "getEmrrmRltmUsefulSckbdInfoInqire"
+BASEINFO_OP = "getEgytBassInfoInqire"
+EGYT_LIST_OP = "getEgytListInfoInqire"
+STRM_LIST_OP = "getStrmListInfoInqire"
+KAKAO_DIRECTIONS_PATH = "/v1/directions"
+KAKAO_COORD2REGION_PATH = "/v2/local/geo/coord2regioncode.json"
+KAKAO_COORD2ADDR_PATH = "/v2/local/geo/coord2address.json"
+
+_EMPTY_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>00</resultCode>'
+    '<resultMsg>NORMAL SERVICE.</resultMsg></header><body><items/><numOfRows>0</numOfRows>'
+    '<pageNo>1</pageNo><totalCount>0</totalCount></body></response>'
+)
+
+
+def fixture_key(url: str, params: Dict[str, Any]) -> str:
+    """응답 픽스처 키: API 이름 + 구분 파라미터 (예: getEgytBassInfoInqire|HPID=A1100001)"""
+    operation = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+    parts = [operation] + [f"{name}={params[name]}" for name in _KEY_PARAMS if params.get(name)]
+    return "|".join(parts)
+
+
+def load_fixtures(path: Path = FIXTURE_PATH) -> Dict[str, Any]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_fixtures(fixtures: Dict[str, Any], path: Path = FIXTURE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mtime=0: 같은 내용이면 같은 파일 (합성 픽스처 재생성 시 불필요한 변경 방지)
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+        f.write(json.dumps(fixtures, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# 합성 픽스처
+# ---------------------------------------------------------------------------
+
+_SYNTHETIC_REGIONS = {
+    "서울특별시": ((37.5665, 126.9780), 0.12, [
+        "종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구", "강북구", "도봉구",
+        "노원구", "은평구", "서대문구", "마포구", "양천구", "강서구", "구로구", "금천구", "영등포구", "동작구",
+        "관악구", "서초구", "강남구", "송파구", "강동구",
+    ]),
+    "경기도": ((37.4138, 127.5183), 0.55, [
+        "수원시", "성남시", "의정부시", "안양시", "부천시", "광명시", "평택시", "동두천시", "안산시", "고양시",
+        "과천시", "구리시", "남양주시", "오산시", "시흥시", "군포시", "의왕시", "하남시", "용인시", "파주시",
+        "이천시", "안성시", "김포시", "화성시", "광주시", "양주시", "포천시", "여주시", "연천군", "가평군", "양평군",
+    ]),
+    "인천광역시": ((37.4563, 126.7052), 0.12, [
+        "중구", "동구", "미추홀구", "연수구", "남동구", "부평구", "계양구", "서구", "강화군", "옹진군",
+    ]),
+}
+
+_SYNTHETIC_SCENARIOS = [
+    {"lat": 37.4979, "lon": 127.0276, "sido": "서울특별시", "sigungu": "강남구",
+     "symptom": "뇌졸중 의심(FAST+)", "stt_text": "60대 남성 우측 편마비, 언어장애"},
+    {"lat": 37.2636, "lon": 127.0286, "sido": "경기도", "sigungu": "수원시",
+     "symptom": "다발성 외상/중증 외상", "stt_text": "교통사고 다발성 골절 의식 저하"},
+]
+
+_GRADES = [
+    ("G001", "권역응급의료센터", 0.08),
+    ("G006", "지역응급의료센터", 0.35),
+    ("G007", "지역응급의료기관", 0.57),
+]
+_DIVISIONS = [("상급종합병원(3차)", 0.1), ("종합병원(2차)", 0.6), ("병원", 0.3)]
+
+
+def _pick(rng: random.Random, choices):
+    r = rng.random()
+    acc = 0.0
+    for *value, weight in choices:
+        acc += weight
+        if r <= acc:
+            return value
+    return choices[-1][:-1]
+
+
+def _xml_items(items: List[Dict[str, Any]]) -> str:
+    body = "".join(
+        "<item>" + "".join(f"<{k}>{escape(str(v))}</{k}>" for k, v in item.items() if v is not None) + "</item>"
+        for item in items
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>00</resultCode>'
+        f'<resultMsg>NORMAL SERVICE.</resultMsg></header><body><items>{body}</items>'
+        f'<numOfRows>{len(items)}</numOfRows><pageNo>1</pageNo><totalCount>{len(items)}</totalCount></body></response>'
+    )
+
+
+def build_synthetic_fixtures(seed: int = 20261019) -> Dict[str, Any]:
+    """서울/경기/인천 응급의료기관을 본뜬 합성 응답 (seed가 같으면 항상 같은 결과)"""
+    rng = random.Random(seed)
+    hospitals = []
+    serial = 0
+    for sido, ((clat, clon), radius, sigungus) in _SYNTHETIC_REGIONS.items():
+        trauma_index = rng.randrange(len(sigungus))
+        for si, sigungu in enumerate(sigungus):
+            slat = clat + rng.uniform(-radius, radius)
+            slon = clon + rng.uniform(-radius, radius) * 1.2
+            for n in range(rng.choice((1, 2, 2, 3))):
+                serial += 1
+                emcls, emcls_name = _pick(rng, _GRADES)
+                div_name, = _pick(rng, _DIVISIONS)
+                trauma = si == trauma_index and n == 0
+                if trauma:
+                    emcls, emcls_name, div_name = "G001", "권역응급의료센터", "상급종합병원(3차)"
+                hospitals.append({
+                    "hpid": f"A{serial:07d}",
+                    "sido": sido,
+                    "sigungu": sigungu,
+                    "dutyName": f"{sigungu} {'대학' if '3차' in div_name else ''}병원 {n + 1}",
+                    "dutyAddr": f"{sido} {sigungu} 병원로 {rng.randint(1, 400)}",
+                    "dutyTel3": f"02-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+                    "wgs84Lat": round(slat + rng.uniform(-0.02, 0.02), 6),
+                    "wgs84Lon": round(slon + rng.uniform(-0.02, 0.02), 6),
+                    "dutyDiv": "A" if "3차" in div_name else "B",
+                    "dutyDivNam": div_name,
+                    "dutyEmcls": emcls,
+                    "dutyEmclsName": emcls_name,
+                    "trauma": trauma,
+                })
+
+    def beds(h):
+        yn = lambda p: "Y" if rng.random() < p else "N"  # noqa: E731
+        return {
+            "hpid": h["hpid"], "dutyname": h["dutyName"], "hvidate": "20261019120000",
+            "hvec": rng.randint(-2, 20), "hvoc": rng.randint(0, 6), "hvicc": rng.randint(0, 10),
+            "hvgc": rng.randint(0, 40), "hvcc": rng.randint(0, 6), "hvncc": rng.randint(0, 4),
+            "hvccc": rng.randint(0, 4), "hvctayn": yn(0.9), "hvmriayn": yn(0.7), "hvangioayn": yn(0.5),
+            "hvventiayn": yn(0.8), "hv1": h["dutyTel3"], "hv2": rng.randint(0, 3), "hv3": rng.randint(0, 3),
+            "hv4": rng.randint(0, 3), "hv5": rng.randint(0, 3), "hv6": rng.randint(0, 3), "hv7": rng.randint(0, 3),
+            "hv8": rng.randint(0, 3), "hv9": rng.randint(0, 3), "hv10": yn(0.3), "hv11": yn(0.3),
+            "hv12": rng.randint(0, 3), "dutytel3": h["dutyTel3"], "hvdnm": "당직의",
+        }
+
+    bed_rows = {h["hpid"]: beds(h) for h in hospitals}
+    responses: Dict[str, str] = {}
+    for sido, (_, _, sigungus) in _SYNTHETIC_REGIONS.items():
+        in_sido = [h for h in hospitals if h["sido"] == sido]
+        grade_item = lambda h: {"hpid": h["hpid"], "dutyName": h["dutyName"], "dutyEmcls": h["dutyEmcls"],  # noqa: E731
+                                "dutyEmclsName": h["dutyEmclsName"]}
+        trauma_item = lambda h: {"hpid": h["hpid"], "dutyName": h["dutyName"], "dutyEmcls": "G099",  # noqa: E731
+                                 "dutyEmclsName": "권역외상센터"}
+        responses[fixture_key(ER_BED_OP, {"STAGE1": sido})] = _xml_items([bed_rows[h["hpid"]] for h in in_sido])
+        responses[fixture_key(EGYT_LIST_OP, {"STAGE1": sido})] = _xml_items([grade_item(h) for h in in_sido])
+        responses[fixture_key(STRM_LIST_OP, {"STAGE1": sido})] = _xml_items(
+            [trauma_item(h) for h in in_sido if h["trauma"]])
+        for sigungu in sigungus:
+            local = [h for h in in_sido if h["sigungu"] == sigungu]
+            responses[fixture_key(ER_BED_OP, {"STAGE1": sido, "STAGE2": sigungu})] = _xml_items(
+                [bed_rows[h["hpid"]] for h in local])
+            responses[fixture_key(STRM_LIST_OP, {"STAGE1": sido, "STAGE2": sigungu})] = _xml_items(
+                [trauma_item(h) for h in local if h["trauma"]])
+    for h in hospitals:
+        responses[fixture_key(BASEINFO_OP, {"HPID": h["hpid"]})] = _xml_items([{
+            key: h[key] for key in ("hpid", "dutyName", "dutyAddr", "dutyTel3", "wgs84Lat", "wgs84Lon",
+                                    "dutyDiv", "dutyDivNam", "dutyEmcls", "dutyEmclsName")
+        }])
+
+    return {
+        "meta": {"source": "synthetic", "seed": seed, "hospitals": len(hospitals),
+                 "scenarios": _SYNTHETIC_SCENARIOS},
+        "responses": responses,
+    }
+
+
+# ---------------------------------------------------------------------------
+# 재생 / 녹화
+# ---------------------------------------------------------------------------
+
+def _kakao_directions(params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+    """출발지/목적지 좌표로 길찾기 응답 합성 (직선거리 × 1.3, 평균 35km/h, 경로 꼭짓점 24개)"""
+    try:
+        olon, olat = (float(v) for v in params["origin"].split(","))
+        dlon, dlat = (float(v) for v in params["destination"].split(","))
+    except (KeyError, ValueError):
+        return 400, {"msg": "invalid origin/destination"}
+    dlat_r, dlon_r = math.radians(dlat - olat), math.radians(dlon - olon)
+    a = math.sin(dlat_r / 2) ** 2 + math.cos(math.radians(olat)) * math.cos(math.radians(dlat)) * math.sin(dlon_r / 2) ** 2
+    distance_m = 6371000.0 * 2 * math.asin(math.sqrt(a)) * 1.3
+    vertexes: List[float] = []
+    for i in range(24):
+        t = i / 23
+        # 직선에서 조금 벗어난 경로 (폴리라인 단순화가 실제로 동작하도록)
+        bend = math.sin(t * math.pi * 3) * 0.002
+        vertexes.extend([round(olon + (dlon - olon) * t + bend, 6), round(olat + (dlat - olat) * t - bend, 6)])
+    return 200, {"routes": [{
+        "result_code": 0,
+        "summary": {"distance": int(distance_m), "duration": int(distance_m / (35000 / 3600))},
+        "sections": [{"roads": [{"vertexes": vertexes}]}],
+    }]}
+
+
+def fixture_hospitals(fixtures: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """픽스처의 병원 기본정보 응답에서 병원 목록 추출 (hpid, 이름, 시도, 시군구, 좌표)"""
+    hospitals = []
+    for key, body in fixtures.get("responses", {}).items():
+        if not key.startswith(BASEINFO_OP + "|"):
+            continue
+        try:
+            item = ET.fromstring(body.encode("utf-8")).find(".//item")
+        except ET.ParseError:
+            continue
+        if item is None:
+            continue
+        addr = (item.findtext("dutyAddr") or "").split()
+        try:
+            lat, lon = float(item.findtext("wgs84Lat")), float(item.findtext("wgs84Lon"))
+        except (TypeError, ValueError):
+            continue
+        if len(addr) < 2:
+            continue
+        hospitals.append({
+            "hpid": item.findtext("hpid"), "name": item.findtext("dutyName"), "address": " ".join(addr),
+            "sido": addr[0], "sigungu": addr[1], "lat": lat, "lon": lon,
+        })
+    hospitals.sort(key=lambda h: h["hpid"] or "")
+    return hospitals
+
+
+class FixtureResponder:
+    """픽스처에서 요청에 맞는 응답 찾기 (스레드 안전, 적중/누락 횟수 기록)"""
+
+    def __init__(self, fixtures: Dict[str, Any]):
+        self.responses: Dict[str, str] = fixtures.get("responses", {})
+        self.meta: Dict[str, Any] = fixtures.get("meta", {})
+        self.hospitals = fixture_hospitals(fixtures)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _nearest_hospital(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        try:
+            lon, lat = float(params["x"]), float(params["y"])
+        except (KeyError, ValueError):
+            return None
+        return min(self.hospitals, key=lambda h: (h["lat"] - lat) ** 2 + (h["lon"] - lon) ** 2, default=None)
+
+    def _kakao_local(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """좌표 → 행정구역/주소: 가장 가까운 픽스처 병원의 시도/시군구로 합성"""
+        nearest = self._nearest_hospital(params)
+        if nearest is None:
+            return 200, {"meta": {"total_count": 0}, "documents": []}
+        if path.endswith(KAKAO_COORD2REGION_PATH):
+            doc = {"region_type": "B", "region_1depth_name": nearest["sido"], "region_2depth_name": nearest["sigungu"]}
+        else:
+            address = f"{nearest['sido']} {nearest['sigungu']} 구급로 {int(abs(float(params['x'])) * 1000) % 300 + 1}"
+            doc = {"address": {"address_name": address}, "road_address": {"address_name": address}}
+        return 200, {"meta": {"total_count": 1}, "documents": [doc]}
+
+    def respond(self, path: str, params: Dict[str, str]) -> Tuple[int, str, bytes]:
+        """(상태 코드, Content-Type, 본문)"""
+        if path.endswith(KAKAO_DIRECTIONS_PATH):
+            status, body = _kakao_directions(params)
+            return status, "application/json", json.dumps(body).encode("utf-8")
+        if path.endswith((KAKAO_COORD2REGION_PATH, KAKAO_COORD2ADDR_PATH)):
+            status, body = self._kakao_local(path, params)
+            return status, "application/json", json.dumps(body, ensure_ascii=False).encode("utf-8")
+        key = fixture_key(path, params)
+        body = self.responses.get(key)
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return 200, "application/xml; charset=UTF-8", (body or _EMPTY_XML).encode("utf-8")
+
+
+def _build_response(request: requests.PreparedRequest, status: int, content_type: str, body: bytes) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers = CaseInsensitiveDict({"Content-Type": content_type, "Content-Length": str(len(body))})
+    resp.url = request.url
+    resp.request = request
+    resp.encoding = "utf-8"
+    resp.reason = "OK" if status == 200 else "Error"
+    return resp
+
+
+class FixtureAdapter(BaseAdapter):
+    """requests 세션용 어댑터: 네트워크 대신 FixtureResponder 응답 반환 (latency_sec만큼 지연 가능)"""
+
+    def __init__(self, responder: FixtureResponder, latency_sec: float = 0.0):
+        super().__init__()
+        self.responder = responder
+        self.latency_sec = latency_sec
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        parts = urlsplit(request.url)
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+        status, content_type, body = self.responder.respond(parts.path, dict(parse_qsl(parts.query)))
+        return _build_response(request, status, content_type, body)
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """실제로 요청하면서 data.go.kr XML 응답 본문을 픽스처 키로 저장"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.responses: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def send(self, request, *args, **kwargs):
+        resp = super().send(request, *args, **kwargs)
+        parts = urlsplit(request.url)
+        if resp.status_code == 200 and "apis.data.go.kr" in parts.netloc:
+            with self._lock:
+                self.responses[fixture_key(parts.path, dict(parse_qsl(parts.query)))] = resp.content.decode("utf-8")
+        return resp
+
+
+def install_transport(adapter: BaseAdapter) -> None:
+    """utils.http 공유 세션(재시도/비재시도) 모두에 어댑터 연결"""
+    from utils.http import get_session
+    for session in (get_session(), get_session(retries=False)):
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+
+def install_fixture_transport(fixtures: Optional[Dict[str, Any]] = None, latency_sec: float = 0.0) -> FixtureResponder:
+    """공유 세션이 네트워크 대신 픽스처로 응답하도록 설정"""
+    responder = FixtureResponder(fixtures if fixtures is not None else load_fixtures())
+    install_transport(FixtureAdapter(responder, latency_sec))
+    return responder
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다중 구급차 부하 테스트 (서버 한 대가 동시에 감당하는 구급대 수 확인용)
+
+구급차 N대가 여러 시도에 나뉘어 경로를 따라 이동하면서 실제 EMS 화면과 같은 순서로 API를 호출합니다.
+    로그인 → (이동하며) 좌표→행정구역 → 병원 Top3 → 응급 요청 생성 → 병원 호출 → 병원 승인
+    → Socket.IO 세션 참여 + 채팅 메시지 송수신 → 인계 완료
+Socket.IO 연결은 구급차마다 테스트 내내 유지하며, 보낸 채팅이 new_message 이벤트로 돌아오기까지의 시간도 측정합니다.
+
+업스트림은 로컬 대역 서버(stub_upstream.py)를 사용합니다:
+    python benchmarks/stub_upstream.py --port 8099 --latency-ms 80 --jitter-ms 40
+    DATA_GO_KR_BASE_URL=http://127.0.0.1:8099 KAKAO_NAVI_BASE_URL=http://127.0.0.1:8099 \\
+    KAKAO_LOCAL_BASE_URL=http://127.0.0.1:8099 python app.py
+    python scripts/seed_data.py   # EMS 계정 (ems_001 / password123)
+
+사용법:
+    python benchmarks/load_test.py --base-url http://localhost:5001 --ambulances 50 --duration 120 \\
+        [--sidos 서울특별시,경기도,인천광역시] [--ramp-up 10] [--think-time 2] [--no-socketio] [--json result.json]
+
+엔드포인트별 처리량(req/s), 지연 시간 p50/p95/p99/최대(ms), 오류율을 출력합니다.
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from benchmarks.fixtures import FIXTURE_PATH, fixture_hospitals, load_fixtures
+
+try:
+    import socketio
+except ImportError:  # python-socketio 클라이언트가 없으면 HTTP만 측정
+    socketio = None
+
+try:
+    import websocket  # noqa: F401  (websocket-client가 있으면 WebSocket으로 업그레이드)
+    SOCKETIO_TRANSPORTS = None
+except ImportError:
+    SOCKETIO_TRANSPORTS = ["polling"]
+
+SYMPTOMS = [
+    "뇌졸중 의심(FAST+)", "심근경색 의심(STEMI)", "다발성 외상/중증 외상", "성인 호흡곤란", "성인 경련",
+]
+KTAS_CLASSES = ["1", "2", "3"]
+
+
+class LoadStats:
+    """엔드포인트별 지연 시간/상태 코드 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, label: str, seconds: float, ok: bool, status: Any) -> None:
+        with self._lock:
+            self.latencies[label].append(seconds)
+            self.statuses[label][str(status)] += 1
+            if not ok:
+                self.errors[label] += 1
+
+    def summary(self, elapsed: float) -> List[Dict[str, Any]]:
+        rows = []
+        with self._lock:
+            for label in sorted(self.latencies):
+                values = sorted(self.latencies[label])
+                count = len(values)
+
+                def pct(p):
+                    return round(values[min(count - 1, int(math.ceil(p / 100.0 * count)) - 1)] * 1000.0, 1)
+
+                rows.append({
+                    "endpoint": label,
+                    "count": count,
+                    "rps": round(count / elapsed, 2) if elapsed else None,
+                    "error_rate": round(self.errors[label] / count, 4),
+                    "p50_ms": pct(50),
+                    "p95_ms": pct(95),
+                    "p99_ms": pct(99),
+                    "max_ms": round(values[-1] * 1000.0, 1),
+                    "statuses": dict(self.statuses[label]),
+                })
+        return rows
+
+
+class Ambulance(threading.Thread):
+    """구급차 1대: 임무(출동 → 이송 병원 선정 → 채팅 → 인계)를 종료 시각까지 반복"""
+
+    def __init__(self, index: int, args, sido: str, hospitals: List[Dict[str, Any]], stats: LoadStats,
+                 stop_at: float, start_delay: float):
+        super().__init__(name=f"ambulance-{index}", daemon=True)
+        self.index = index
+        self.args = args
+        self.sido = sido
+        self.hospitals = hospitals
+        self.stats = stats
+        self.stop_at = stop_at
+        self.start_delay = start_delay
+        self.rng = random.Random(args.seed * 1000 + index)
+        self.http = requests.Session()
+        self.sio = None
+        self.team_id = args.team_id
+        self.ems_id: Optional[str] = None
+        self.missions = 0
+        # 채팅 내용 → 전송 시각 (new_message 이벤트 수신 지연 측정용)
+        self._pending_messages: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+
+    # -- 호출 헬퍼 -----------------------------------------------------------
+
+    def call(self, label: str, method: str, path: str, expect=(200, 201), **kwargs) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            resp = self.http.request(method, self.args.base_url + path, timeout=self.args.timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.stats.record(label, time.perf_counter() - started, False, type(e).__name__)
+            return None
+        elapsed = time.perf_counter() - started
+        ok = resp.status_code in expect
+        try:
+            data = resp.json()
+        except ValueError:
+            data = None
+            ok = False
+        # coord2region/top3 등은 업스트림 실패 시에도 200과 error 필드를 돌려줌
+        if ok and isinstance(data, dict) and data.get("error"):
+            ok = False
+        self.stats.record(label, elapsed, ok, resp.status_code)
+        return data if ok else None
+
+    def sleep(self, seconds: float) -> bool:
+        """종료 시각 전이면 대기 후 True"""
+        remaining = self.stop_at - time.time()
+        if remaining <= 0:
+            return False
+        time.sleep(min(seconds, remaining))
+        return time.time() < self.stop_at
+
+    # -- Socket.IO ---------------------------------------------------------
+
+    def connect_socket(self) -> None:
+        if socketio is None or self.args.no_socketio:
+            return
+        sio = socketio.Client(reconnection=False)
+
+        @sio.on("new_message")
+        def on_new_message(data):
+            content = (data or {}).get("content")
+            with self._pending_lock:
+                sent = self._pending_messages.pop(content, None)
+            if sent is not None:
+                self.stats.record("socket.io new_message (delivery)", time.perf_counter() - sent, True, "event")
+
+        started = time.perf_counter()
+        try:
+            sio.connect(self.args.base_url, transports=SOCKETIO_TRANSPORTS, wait_timeout=self.args.timeout)
+        except Exception as e:
+            self.stats.record("socket.io connect", time.perf_counter() - started, False, type(e).__name__)
+            return
+        self.stats.record("socket.io connect", time.perf_counter() - started, True, "connected")
+        self.sio = sio
+
+    def emit(self, event: str, data: Dict[str, Any]) -> None:
+        if self.sio is None:
+            return
+        started = time.perf_counter()
+        try:
+            self.sio.emit(event, data)
+            self.stats.record(f"socket.io {event}", time.perf_counter() - started, True, "sent")
+        except Exception as e:
+            self.stats.record(f"socket.io {event}", time.perf_counter() - started, False, type(e).__name__)
+
+    # -- 시나리오 -----------------------------------------------------------
+
+    def login(self) -> None:
+        if not self.args.ems_id:
+            return
+        data = self.call("POST /api/auth/login", "POST", "/api/auth/login",
+                         json={"ems_id": self.args.ems_id, "password": self.args.password})
+        if data:
+            self.team_id = data.get("team_id", self.team_id)
+            self.ems_id = data.get("ems_id")
+
+    def route(self):
+        """출발 지점(임의 병원 주변)에서 다른 병원 방향으로 이동하는 좌표 목록"""
+        start = self.rng.choice(self.hospitals)
+        end = self.rng.choice(self.hospitals)
+        olat = start["lat"] + self.rng.uniform(-0.03, 0.03)
+        olon = start["lon"] + self.rng.uniform(-0.03, 0.03)
+        steps = max(1, self.args.steps)
+        return [
+            (round(olat + (end["lat"] - olat) * i / steps * 0.5, 6), round(olon + (end["lon"] - olon) * i / steps * 0.5, 6))
+            for i in range(steps + 1)
+        ]
+
+    def mission(self) -> None:
+        path = self.route()
+        region = None
+        for lat, lon in path:
+            region = self.call("GET /api/geo/coord2region", "GET", "/api/geo/coord2region",
+                               params={"lat": lat, "lon": lon}) or region
+            if not self.sleep(self.args.think_time):
+                return
+        lat, lon = path[-1]
+        if not region or not region.get("sido"):
+            return
+
+        symptom = self.rng.choice(SYMPTOMS)
+        top3 = self.call("POST /api/hospitals/top3", "POST", "/api/hospitals/top3", json={
+            "lat": lat, "lon": lon, "sido": region["sido"], "sigungu": region["sigungu"], "symptom": symptom,
+        })
+        hospitals = (top3 or {}).get("hospitals") or []
+        if not hospitals or not self.sleep(self.args.think_time):
+            return
+
+        created = self.call("POST /api/emergency/request", "POST", "/api/emergency/request", json={
+            "team_id": self.team_id, "patient_sex": self.rng.choice(["M", "F"]),
+            "patient_age": self.rng.randint(1, 95), "pre_ktas_class": self.rng.choice(KTAS_CLASSES),
+            "stt_full_text": f"부하 테스트 환자 ({symptom})", "current_lat": lat, "current_lon": lon,
+        })
+        if not created:
+            return
+        target = hospitals[0]
+        assignment = self.call("POST /api/emergency/call-hospital", "POST", "/api/emergency/call-hospital", json={
+            "request_id": created["request_id"], "hospital_id": target["hpid"],
+            "distance_km": target.get("distance_km"), "eta_minutes": target.get("eta_minutes"),
+        })
+        if not assignment:
+            return
+        # 병원 측 승인 (채팅 세션 생성)
+        accepted = self.call("POST /api/emergency/update-response", "POST", "/api/emergency/update-response", json={
+            "assignment_id": assignment["assignment_id"], "response_status": "승인",
+        })
+        session_id = (accepted or {}).get("session_id")
+        if not session_id:
+            return
+
+        self.emit("join_session", {"session_id": session_id})
+        for n in range(self.args.chat_messages):
+            if not self.sleep(self.args.think_time):
+                break
+            content = f"[load {self.index}] 환자 상태 업데이트 {n + 1} {uuid.uuid4().hex[:8]}"
+            if self.sio is not None:
+                with self._pending_lock:
+                    self._pending_messages[content] = time.perf_counter()
+            self.call("POST /api/chat/messages", "POST", "/api/chat/messages", json={
+                "session_id": session_id, "sender_type": "EMS", "sender_ref_id": self.ems_id or self.team_id,
+                "content": content,
+            })
+        self.call("GET /api/chat/messages", "GET", "/api/chat/messages", params={"session_id": session_id})
+        if self.ems_id:
+            self.call("POST /api/chat/session/<id>/complete", "POST", f"/api/chat/session/{session_id}/complete",
+                      json={"ems_id": self.ems_id})
+        self.emit("leave_session", {"session_id": session_id})
+        with self._pending_lock:
+            self._pending_messages.clear()
+        self.missions += 1
+
+    def run(self) -> None:
+        time.sleep(self.start_delay)
+        try:
+            self.login()
+            self.connect_socket()
+            while time.time() < self.stop_at:
+                self.mission()
+        except Exception as e:
+            print(f"⚠️ {self.name} 오류: {e}")
+        finally:
+            if self.sio is not None:
+                try:
+                    self.sio.disconnect()
+                except Exception:
+                    pass
+            self.http.close()
+
+
+def print_report(rows: List[Dict[str, Any]], elapsed: float, ambulances: List[Ambulance]) -> None:
+    header = f"{'endpoint':<42}{'count':>7}{'req/s':>8}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['endpoint']:<42}{r['count']:>7}{r['rps']:>8.2f}{r['error_rate'] * 100:>6.1f}%"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+    total = sum(r["count"] for r in rows if not r["endpoint"].startswith("socket.io"))
+    errors = sum(round(r["count"] * r["error_rate"]) for r in rows if not r["endpoint"].startswith("socket.io"))
+    missions = sum(a.missions for a in ambulances)
+    connected = sum(1 for a in ambulances if a.sio is not None)
+    print(f"\nHTTP {total}건 ({total / elapsed:.1f} req/s), 오류 {errors}건 ({errors / max(total, 1):.1%}), "
+          f"완료 임무 {missions}건, Socket.IO 연결 유지 {connected}/{len(ambulances)} (지연 단위 ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="다중 구급차 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:5001", help="백엔드 주소")
+    parser.add_argument("--ambulances", type=int, default=20, help="동시 구급차 수")
+    parser.add_argument("--duration", type=float, default=60.0, help="테스트 시간(초)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="구급차 투입을 나눠서 시작하는 시간(초)")
+    parser.add_argument("--sidos", default="서울특별시,경기도,인천광역시", help="구급차를 배치할 시도 (쉼표로 구분)")
+    parser.add_argument("--steps", type=int, default=3, help="임무마다 이동하며 위치를 갱신하는 횟수")
+    parser.add_argument("--think-time", type=float, default=1.0, help="화면 조작 사이 대기 시간(초)")
+    parser.add_argument("--chat-messages", type=int, default=3, help="임무마다 보내는 채팅 메시지 수")
+    parser.add_argument("--ems-id", default="ems_001", help="로그인할 EMS 계정 (빈 값이면 로그인 생략)")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--team-id", type=int, default=1, help="로그인하지 않을 때 사용할 team_id")
+    parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃(초)")
+    parser.add_argument("--no-socketio", action="store_true", help="Socket.IO 연결 없이 HTTP만 측정")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_PATH, help="구급차 위치를 고를 병원 목록(픽스처)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+    args.base_url = args.base_url.rstrip("/")
+
+    hospitals = fixture_hospitals(load_fixtures(args.fixtures))
+    by_sido: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for h in hospitals:
+        by_sido[h["sido"]].append(h)
+    sidos = [s.strip() for s in args.sidos.split(",") if s.strip() in by_sido]
+    if not sidos:
+        print(f"❌ 픽스처에 해당 시도의 병원이 없습니다: {args.sidos} (사용 가능: {', '.join(sorted(by_sido))})")
+        sys.exit(1)
+    if socketio is None and not args.no_socketio:
+        print("⚠️ python-socketio 클라이언트가 없어 Socket.IO 연결은 측정하지 않습니다.")
+
+    stats = LoadStats()
+    started = time.time()
+    stop_at = started + args.ramp_up + args.duration
+    ambulances = [
+        Ambulance(i, args, sidos[i % len(sidos)], by_sido[sidos[i % len(sidos)]], stats, stop_at,
+                  args.ramp_up * i / max(args.ambulances, 1))
+        for i in range(args.ambulances)
+    ]
+    print(f"구급차 {args.ambulances}대 ({', '.join(sidos)}), {args.duration:.0f}초 + 투입 {args.ramp_up:.0f}초 → {args.base_url}\n")
+    for ambulance in ambulances:
+        ambulance.start()
+    for ambulance in ambulances:
+        ambulance.join(timeout=max(0.0, stop_at - time.time()) + args.timeout + 5)
+    elapsed = time.time() - started
+
+    rows = stats.summary(elapsed)
+    print_report(rows, elapsed, ambulances)
+    if args.json:
+        args.json.write_text(json.dumps({
+            "ambulances": args.ambulances, "duration_sec": round(elapsed, 1), "sidos": sidos,
+            "missions": sum(a.missions for a in ambulances), "endpoints": rows,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
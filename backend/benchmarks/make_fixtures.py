@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 업스트림 픽스처 생성 스크립트
+
+기본: 결정적 합성 데이터(서울/경기/인천)로 benchmarks/fixtures/upstream.json.gz 재생성
+--live: 실제 data.go.kr API(DATA_GO_KR_SERVICE_KEY 필요)를 호출하며 top3가 사용하는 응답을 녹화
+        (범위 조회, 병상, 등급 목록, 광역시면 인접 도 범위까지)
+
+사용법:
+    python benchmarks/make_fixtures.py
+    python benchmarks/make_fixtures.py --live --sido 서울특별시 --sigungu 강남구 --lat 37.4979 --lon 127.0276 \\
+        [--symptom "뇌졸중 의심(FAST+)"] [--out PATH]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from benchmarks.fixtures import FIXTURE_PATH, RecordingAdapter, build_synthetic_fixtures, install_transport, save_fixtures
+
+
+def record_live(args) -> dict:
+    from config import DATA_GO_KR_KEY, PROVINCE_INCLUDE_METROS, METRO_FALLBACK_PROVINCE
+    from services.hospital_service import (
+        fetch_scope_hospitals, fetch_beds_for_sidos, fetch_hospital_grade_info, grade_target_regions, is_metropolitan
+    )
+
+    recorder = RecordingAdapter()
+    install_transport(recorder)
+    origin = (args.lat, args.lon)
+    sidos = [args.sido]
+    if is_metropolitan(args.sido) and METRO_FALLBACK_PROVINCE.get(args.sido):
+        sidos.append(METRO_FALLBACK_PROVINCE[args.sido])
+    for index, sido in enumerate(sidos):
+        extra = PROVINCE_INCLUDE_METROS.get(sido, [])
+        sigungu = args.sigungu if index == 0 else None
+        hpids = set()
+        for hospital_type in ("general", "trauma", "pediatric"):
+            hospitals = fetch_scope_hospitals(sido, extra, hospital_type, sigungu=sigungu, origin=origin)
+            hpids.update(h["hpid"] for h in hospitals if h.get("hpid"))
+        fetch_beds_for_sidos([sido] + extra)
+        fetch_hospital_grade_info(sorted(hpids), DATA_GO_KR_KEY, grade_target_regions(sido, extra))
+        print(f"녹화: {sido} {sigungu or ''} 병원 {len(hpids)}개, 응답 {len(recorder.responses)}건")
+
+    scenario = {"lat": args.lat, "lon": args.lon, "sido": args.sido, "sigungu": args.sigungu,
+                "symptom": args.symptom, "stt_text": ""}
+    return {
+        "meta": {"source": "live", "created_at": int(time.time()), "scenarios": [scenario]},
+        "responses": recorder.responses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 업스트림 응답 픽스처 생성")
+    parser.add_argument("--live", action="store_true", help="실제 API 응답 녹화 (기본: 합성 데이터)")
+    parser.add_argument("--sido", default="서울특별시")
+    parser.add_argument("--sigungu", default="강남구")
+    parser.add_argument("--lat", type=float, default=37.4979)
+    parser.add_argument("--lon", type=float, default=127.0276)
+    parser.add_argument("--symptom", default="뇌졸중 의심(FAST+)")
+    parser.add_argument("--seed", type=int, default=20261019, help="합성 데이터 seed")
+    parser.add_argument("--out", type=Path, default=FIXTURE_PATH, help="출력 파일(.json.gz)")
+    args = parser.parse_args()
+
+    fixtures = record_live(args) if args.live else build_synthetic_fixtures(args.seed)
+    save_fixtures(fixtures, args.out)
+    print(f"✅ 픽스처 저장: {args.out} (응답 {len(fixtures['responses'])}건, {args.out.stat().st_size / 1024:.1f}KB)")
+
+
+if __name__ == "__main__":
+    main()
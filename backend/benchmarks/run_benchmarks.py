@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+병원 순위 파이프라인 오프라인 벤치마크
+
+녹화/합성 픽스처(benchmarks/fixtures/upstream.json.gz)만 사용하며 네트워크를 호출하지 않습니다.
+
+마이크로: evaluate_requirements, enrich_hospital_records, prioritize_by_region, serialize_hospital_payload,
+          XML 파서(병상, 기본정보, 등급 목록) - 1회 = 픽스처 범위 전체 병원 처리
+매크로  : api_hospitals_top3 전체 (Flask 테스트 클라이언트, 업스트림은 픽스처 어댑터)
+          top3_warm(캐시 유지) / top3_cold(매회 병원·등급·병상·경로 캐시 초기화)
+
+벤치마크별 ops/s, p50/p95 지연(ms), 1회 실행 중 최대 할당량(tracemalloc peak, KB), 실행 중 GC 횟수를 출력하고
+저장된 기준선과 비교하여 p50 또는 할당량이 허용 비율(--tolerance)보다 나빠지면 회귀로 표시합니다.
+기준선은 기계마다 다르므로 같은 기계에서 변경 전에 --save-baseline으로 저장하세요.
+
+사용법:
+    python benchmarks/run_benchmarks.py [--filter top3] [--min-time 1.0] [--save-baseline]
+                                        [--baseline PATH] [--tolerance 0.15] [--fail-on-regression] [--json PATH]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from benchmarks import clear_upstream_caches, create_benchmark_app, prepare_offline_environment
+
+prepare_offline_environment()
+
+from benchmarks.fixtures import (
+    BASEINFO_OP, EGYT_LIST_OP, ER_BED_OP, FIXTURE_PATH, fixture_key, install_fixture_transport, load_fixtures
+)
+
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+class Benchmark:
+    def __init__(self, name: str, fn: Callable[[], Any], setup: Optional[Callable[[], None]] = None, items: int = 1):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.items = items
+
+
+def _gc_collections() -> int:
+    return sum(stat["collections"] for stat in gc.get_stats())
+
+
+def run_benchmark(bench: Benchmark, min_time: float, max_iterations: int = 100000,
+                  warmup: int = 3, alloc_iterations: int = 5) -> Dict[str, Any]:
+    """min_time초 이상(최소 5회) 반복 실행하여 지연 분포, 할당량, GC 횟수 측정"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            if bench.setup:
+                bench.setup()
+            bench.fn()
+
+        latencies: List[float] = []
+        gc_before = _gc_collections()
+        started = time.perf_counter()
+        while (time.perf_counter() - started < min_time or len(latencies) < 5) and len(latencies) < max_iterations:
+            if bench.setup:
+                bench.setup()
+            t0 = time.perf_counter()
+            bench.fn()
+            latencies.append(time.perf_counter() - t0)
+        gc_runs = _gc_collections() - gc_before
+
+        # 할당량은 tracemalloc 오버헤드가 커서 시간 측정과 분리
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_iterations):
+                if bench.setup:
+                    bench.setup()
+                tracemalloc.reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+                bench.fn()
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - base)
+        finally:
+            tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    p95_index = min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))
+    return {
+        "name": bench.name,
+        "iterations": len(latencies),
+        "items": bench.items,
+        "ops_per_sec": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(statistics.median(latencies) * 1000.0, 4),
+        "p95_ms": round(latencies[p95_index] * 1000.0, 4),
+        "alloc_peak_kb": round(statistics.median(peaks) / 1024.0, 1),
+        "gc_collections": gc_runs,
+    }
+
+
+def build_benchmarks(fixtures: Dict[str, Any]) -> List[Benchmark]:
+    from config import SYMPTOM_RULES
+    from routes.hospitals import register_hospitals_routes
+    from services import hospital_service as hs
+
+    install_fixture_transport(fixtures)
+    scenario = fixtures["meta"]["scenarios"][0]
+    sido, sigungu = scenario["sido"], scenario["sigungu"]
+    lat, lon = scenario["lat"], scenario["lon"]
+    responses = fixtures["responses"]
+
+    bed_xml = responses[fixture_key(ER_BED_OP, {"STAGE1": sido})].encode("utf-8")
+    grade_xml = responses[fixture_key(EGYT_LIST_OP, {"STAGE1": sido})].encode("utf-8")
+    beds = hs.parse_er_beds_xml(bed_xml)
+    baseinfo_xmls = [
+        body.encode("utf-8") for key, body in responses.items()
+        if key.startswith(BASEINFO_OP + "|") and key.split("HPID=", 1)[1] in beds
+    ]
+    hospitals_raw = [hs.parse_baseinfo_xml(body) for body in baseinfo_xmls]
+    grades = hs.parse_grade_list_xml(grade_xml)
+    rule = SYMPTOM_RULES.get(scenario["symptom"], {})
+    enriched = hs.enrich_hospital_records(hospitals_raw, beds, grades, lat, lon, sigungu, rule, "general",
+                                          scenario["symptom"])
+
+    client = create_benchmark_app(register_hospitals_routes).test_client()
+
+    def top3(body):
+        def call():
+            resp = client.post("/api/hospitals/top3", json=body)
+            if resp.status_code != 200:
+                raise RuntimeError(f"top3 {resp.status_code}: {resp.get_data(as_text=True)[:200]}")
+        return call
+
+    n = len(hospitals_raw)
+    benchmarks = [
+        Benchmark("evaluate_requirements", lambda: [hs.evaluate_requirements(h, rule) for h in enriched], items=len(enriched)),
+        Benchmark("enrich_hospital_records", lambda: hs.enrich_hospital_records(
+            hospitals_raw, beds, grades, lat, lon, sigungu, rule, "general", scenario["symptom"]), items=n),
+        Benchmark("prioritize_by_region", lambda: hs.prioritize_by_region(enriched, max_regions=3), items=len(enriched)),
+        Benchmark("serialize_hospital_payload", lambda: [hs.serialize_hospital_payload(h) for h in enriched],
+                  items=len(enriched)),
+        Benchmark("parse_er_beds_xml", lambda: hs.parse_er_beds_xml(bed_xml), items=len(beds)),
+        Benchmark("parse_baseinfo_xml", lambda: [hs.parse_baseinfo_xml(body) for body in baseinfo_xmls], items=n),
+        Benchmark("parse_grade_list_xml", lambda: hs.parse_grade_list_xml(grade_xml), items=len(grades)),
+    ]
+    for index, body in enumerate(fixtures["meta"]["scenarios"]):
+        suffix = "" if index == 0 else f"_{index}"
+        benchmarks.append(Benchmark(f"top3_warm{suffix}", top3(body)))
+        benchmarks.append(Benchmark(f"top3_cold{suffix}", top3(body), setup=clear_upstream_caches))
+    return benchmarks
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """기준선 대비 변화율 기록, 회귀한 벤치마크 이름 목록 반환"""
+    regressions = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if not base:
+            result["vs_baseline"] = None
+            continue
+        deltas = {}
+        for key in ("p50_ms", "p95_ms", "alloc_peak_kb"):
+            if base.get(key):
+                deltas[key] = round(result[key] / base[key] - 1.0, 3)
+        result["vs_baseline"] = deltas
+        if deltas.get("p50_ms", 0) > tolerance or deltas.get("alloc_peak_kb", 0) > tolerance:
+            regressions.append(result["name"])
+    return regressions
+
+
+def print_table(results: List[Dict[str, Any]], regressions: List[str]) -> None:
+    header = f"{'benchmark':<28}{'items':>6}{'ops/s':>11}{'p50 ms':>11}{'p95 ms':>11}{'peak KB':>10}{'gc':>5}  vs baseline"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        delta = r.get("vs_baseline")
+        if delta is None:
+            note = "-"
+        else:
+            note = " ".join(f"{key.split('_')[0]} {value:+.0%}" for key, value in delta.items())
+            if r["name"] in regressions:
+                note += "  ⚠️ REGRESSION"
+        print(f"{r['name']:<28}{r['items']:>6}{r['ops_per_sec']:>11.1f}{r['p50_ms']:>11.3f}{r['p95_ms']:>11.3f}"
+              f"{r['alloc_peak_kb']:>10.1f}{r['gc_collections']:>5}  {note}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="병원 순위 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_PATH, help="업스트림 픽스처(.json.gz)")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    parser.add_argument("--min-time", type=float, default=1.0, help="벤치마크별 최소 측정 시간(초)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH, help="기준선 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="회귀 판정 허용 비율 (p50, 할당량)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    parser.add_argument("--json", type=Path, help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    benchmarks = [b for b in build_benchmarks(fixtures) if args.filter in b.name]
+    print(f"픽스처: {args.fixtures.name} ({fixtures['meta'].get('source')}, 응답 {len(fixtures['responses'])}건)\n")
+
+    results = [run_benchmark(bench, args.min_time) for bench in benchmarks]
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("results", {})
+    regressions = compare(results, baseline, args.tolerance)
+    print_table(results, regressions)
+
+    if args.json:
+        args.json.write_text(json.dumps({"results": results}, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        saved = {}
+        if args.baseline.exists():
+            saved = json.loads(args.baseline.read_text(encoding="utf-8")).get("results", {})
+        saved.update({r["name"]: {k: r[k] for k in ("ops_per_sec", "p50_ms", "p95_ms", "alloc_peak_kb")} for r in results})
+        args.baseline.write_text(json.dumps({"created_at": int(time.time()), "results": saved},
+                                            ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n✅ 기준선 저장: {args.baseline}")
+    elif not baseline:
+        print(f"\n기준선 없음 ({args.baseline}) - --save-baseline으로 저장하면 다음 실행부터 비교합니다.")
+    if regressions:
+        print(f"\n⚠️ 회귀: {', '.join(regressions)} (허용 {args.tolerance:.0%})")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
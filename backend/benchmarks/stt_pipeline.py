@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+STT 후처리 파이프라인 비교: staged(채팅 3회) vs structured(구조화 출력 1회)
+
+services/stt_service.py의 두 경로를 같은 구급대원 보고 문장으로 실행하여 지연(p50/p95)과 토큰 사용량, 1회당 비용을 비교합니다.
+
+기본(오프라인): 모델 대역 클라이언트가 실제 프롬프트 길이로 토큰을 추정하고
+               지연 = 첫 토큰 지연 + 입력 토큰/처리 속도 + 출력 토큰/생성 속도 로 흉내 냅니다 (모델별 MODEL_PROFILES).
+               --invalid-rate로 구조화 출력 검증 실패(→ staged 재처리) 비율을 지정할 수 있습니다.
+--live       : 실제 OpenAI API 호출 (OPENAI_API_KEY 필요, 요금 발생). 토큰은 응답 usage 값.
+
+모델은 STT_STAGED_MODEL / STT_STRUCTURED_MODEL 설정을 따르며, 비용은 MODEL_PROFILES의 100만 토큰당 단가(USD)로 계산합니다.
+두 모델이 다르면 staged를 STT_STRUCTURED_MODEL로도 실행하여(staged@모델) 호출 수를 줄인 효과와 모델 변경 효과를 따로 보고합니다
+(--staged-model로 비교할 모델 지정).
+
+사용법:
+    python benchmarks/stt_pipeline.py [--runs 10] [--time-scale 0.1] [--invalid-rate 0.05] [--staged-model gpt-4o] [--json PATH]
+    STT_STRUCTURED_MODEL=gpt-4o python benchmarks/stt_pipeline.py --live --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from benchmarks import prepare_offline_environment
+
+prepare_offline_environment()
+
+from config import OPENAI_API_KEY, STT_STAGED_MODEL, STT_STRUCTURED_MODEL
+from services.stt_service import ARS_SYSTEM, SBAR_SYSTEM, TEXT_PROMPTS, TRANSLATION_SYSTEM, run_stt_pipeline
+
+# 모델별 생성 속도(토큰/초), 입력 처리 속도(토큰/초), 첫 토큰 지연(ms), 100만 토큰당 단가(USD)
+MODEL_PROFILES: Dict[str, Dict[str, float]] = {
+    "gpt-4-turbo": {"output_tps": 25.0, "prefill_tps": 4000.0, "ttft_ms": 600.0, "input_usd": 10.0, "output_usd": 30.0},
+    "gpt-4o": {"output_tps": 70.0, "prefill_tps": 8000.0, "ttft_ms": 450.0, "input_usd": 2.5, "output_usd": 10.0},
+    "gpt-4o-mini": {"output_tps": 90.0, "prefill_tps": 10000.0, "ttft_ms": 350.0, "input_usd": 0.15, "output_usd": 0.6},
+}
+_DEFAULT_PROFILE = MODEL_PROFILES["gpt-4o"]
+
+# 구급대원 보고 예시와 단계별 예상 출력 (오프라인 대역 응답 및 출력 토큰 추정용)
+SAMPLES: List[Dict[str, str]] = [
+    {
+        "input": "60대 남성 숨이 안 쉬어지고 가슴이 아프다고 함. 혈압 이백에 일백, 맥박 110, 산소포화도 88. 약 20분 전 발생. 과거력 고혈압 당뇨.",
+        "text": "60대 남성, severe dyspnea와 chest pain 호소. BP 200/100, HR 110, SpO2 88%. 약 20분 전 발생. 과거력 hypertension, diabetes mellitus.",
+        "sbar_summary": "Pre-KTAS 2점으로 추정되는 환자, 60대 남성으로 약 20분 전부터 severe dyspnea와 chest pain이 발생하였고, 과거력으로 hypertension, diabetes mellitus가 있으며 현재 BP 200/100, HR 110, SpO2 88%로, acute coronary syndrome이 의심되는 상태로 cath lab이 가능한 응급의료센터로의 긴급 이송이 필요합니다.",
+        "ars_narrative": "프리케이타스 2점으로 추정되는 60대 남성 환자입니다. 약 20분 전부터 심한 호흡곤란과 흉통이 있으며, 혈압 200에 100, 심박수 110회, 산소포화도 88퍼센트로 급성 관상동맥 증후군이 의심되어 심혈관 중재술이 가능한 병원으로 긴급 이송이 필요합니다.",
+    },
+    {
+        "input": "70대 여자 갑자기 말이 어눌해지고 오른쪽 팔다리 힘이 빠짐. 마지막 정상 한 시간 전. 혈압 180에 100 의식은 명료.",
+        "text": "70대 여성, 갑자기 dysarthria와 right hemiparesis 발생. last normal time 약 1시간 전. BP 180/100, mental state Alert.",
+        "sbar_summary": "Pre-KTAS 2점으로 추정되는 환자, 70대 여성으로 약 1시간 전 last normal time 이후 갑작스러운 dysarthria와 right hemiparesis가 발생하였고, 현재 BP 180/100, mental state Alert로, acute stroke이 의심되는 상태로 뇌혈관중재술이 가능한 응급의료센터로의 긴급 이송이 필요합니다.",
+        "ars_narrative": "프리케이타스 2점으로 추정되는 70대 여성 환자입니다. 약 1시간 전부터 언어장애와 우측 편마비가 있으며 혈압 180에 100, 의식은 명료하고 급성 뇌졸중이 의심되어 뇌혈관중재술이 가능한 병원으로 긴급 이송이 필요합니다.",
+    },
+    {
+        "input": "20대 남자 오토바이 사고 왼쪽 허벅지 변형 있고 출혈 있음. 맥박 120 혈압 90에 60 의식 약간 처짐.",
+        "text": "20대 남성, 오토바이 사고 후 left femur deformity와 bleeding 관찰. HR 120, BP 90/60, mental state drowsy.",
+        "sbar_summary": "Pre-KTAS 2점으로 추정되는 환자, 20대 남성으로 오토바이 사고 후 left femur deformity와 bleeding이 있으며 현재 HR 120, BP 90/60, mental state drowsy로, femur fracture와 hypovolemic shock이 의심되는 상태로 권역외상센터로의 긴급 이송이 필요합니다.",
+        "ars_narrative": "프리케이타스 2점으로 추정되는 20대 남성 외상 환자입니다. 오토바이 사고로 왼쪽 허벅지 변형과 출혈이 있고 심박수 120회, 혈압 90에 60, 의식이 처져 있어 대퇴골 골절과 저혈량 쇼크가 의심되며 권역외상센터로 긴급 이송이 필요합니다.",
+    },
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (tiktoken이 있으면 사용, 없으면 ASCII 4자당 1토큰·한글 1자당 1토큰으로 근사)"""
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except ImportError:
+        ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+        return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+class _Namespace:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class SimulatedOpenAI:
+    """채팅 완성 대역: 단계(시스템 메시지)에 맞는 예시 출력을 돌려주고 토큰 수에 비례해 지연"""
+
+    def __init__(self, time_scale: float, invalid_rate: float, seed: int = 7):
+        self.time_scale = time_scale
+        self.invalid_rate = invalid_rate
+        self.rng = random.Random(seed)
+        self.sample = SAMPLES[0]
+        self.chat = _Namespace(completions=_Namespace(create=self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, str]], response_format=None, **kwargs):
+        profile = MODEL_PROFILES.get(model, _DEFAULT_PROFILE)
+        system = messages[0]["content"]
+        finish_reason = "stop"
+        if response_format is not None:
+            content = json.dumps({k: self.sample[k] for k in ("text", "sbar_summary", "ars_narrative")},
+                                 ensure_ascii=False)
+            if self.rng.random() < self.invalid_rate:
+                # 출력 길이 한도에 걸려 잘린 JSON
+                content, finish_reason = content[:len(content) // 2], "length"
+        elif system == TRANSLATION_SYSTEM:
+            content = self.sample["text"]
+        elif system == SBAR_SYSTEM:
+            content = self.sample["sbar_summary"]
+        elif system == ARS_SYSTEM:
+            content = self.sample["ars_narrative"]
+        else:
+            raise ValueError("unknown stage")
+        prompt_tokens = sum(estimate_tokens(m["content"]) + 4 for m in messages)
+        completion_tokens = estimate_tokens(content)
+        latency_ms = (profile["ttft_ms"] + prompt_tokens / profile["prefill_tps"] * 1000.0
+                      + completion_tokens / profile["output_tps"] * 1000.0) * self.rng.uniform(0.85, 1.15)
+        time.sleep(latency_ms / 1000.0 * self.time_scale)
+        return _Namespace(
+            choices=[_Namespace(message=_Namespace(content=content, refusal=None), finish_reason=finish_reason)],
+            usage=_Namespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+        )
+
+
+def _cost_usd(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    profile = MODEL_PROFILES.get(model, _DEFAULT_PROFILE)
+    return (prompt_tokens * profile["input_usd"] + completion_tokens * profile["output_usd"]) / 1e6
+
+
+class UsageRecorder:
+    """채팅 완성 호출마다 토큰 사용량과 비용 누적 (검증 실패로 버려진 구조화 호출 포함)"""
+
+    def __init__(self, client):
+        self.client = client
+        self.audio = getattr(client, "audio", None)
+        self.chat = _Namespace(completions=_Namespace(create=self._create))
+        self.model_override = None  # 설정하면 파이프라인이 요청한 모델 대신 이 모델로 호출
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+
+    def _create(self, model: str, **kwargs):
+        model = self.model_override or model
+        completion = self.client.chat.completions.create(model=model, **kwargs)
+        usage = completion.usage
+        self.calls += 1
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.cost_usd += _cost_usd(model, usage.prompt_tokens, usage.completion_tokens)
+        return completion
+
+
+def run_mode(mode: str, client: UsageRecorder, runs: int, time_scale: float, model: str = None) -> Dict[str, Any]:
+    """한 모드를 runs회 실행하고 지연·토큰·비용 요약 반환 (model: 설정된 모델 대신 사용할 모델)"""
+    latencies, calls, prompt_tokens, completion_tokens, costs = [], [], [], [], []
+    fallbacks = 0
+    client.model_override = model
+    for i in range(runs):
+        sample = SAMPLES[i % len(SAMPLES)]
+        if isinstance(client.client, SimulatedOpenAI):
+            client.client.sample = sample
+        client.reset()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_stt_pipeline(client, sample["input"], TEXT_PROMPTS, mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000.0 / time_scale)
+        if result["mode"] != mode:
+            fallbacks += 1
+        calls.append(client.calls)
+        prompt_tokens.append(client.prompt_tokens)
+        completion_tokens.append(client.completion_tokens)
+        costs.append(client.cost_usd)
+    client.model_override = None
+    ordered = sorted(latencies)
+    return {
+        "mode": mode,
+        "model": model or (STT_STAGED_MODEL if mode == "staged" else STT_STRUCTURED_MODEL),
+        "runs": runs,
+        "fallbacks": fallbacks,
+        "calls": round(statistics.mean(calls), 2),
+        "p50_ms": round(statistics.median(ordered), 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 1),
+        "prompt_tokens": round(statistics.mean(prompt_tokens), 1),
+        "completion_tokens": round(statistics.mean(completion_tokens), 1),
+        "cost_usd": round(statistics.mean(costs), 5),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT 후처리 파이프라인 staged / structured 지연·토큰 비용 비교")
+    parser.add_argument("--runs", type=int, default=9, help="모드별 실행 횟수 (예시 문장을 돌아가며 사용)")
+    parser.add_argument("--live", action="store_true", help="실제 OpenAI API 호출 (요금 발생)")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="오프라인 대역 지연 배율 (0.1이면 10배 빨리 실행, 보고 지연은 원래 척도로 환산)")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="오프라인 구조화 출력 검증 실패 비율")
+    parser.add_argument("--staged-model", default=STT_STRUCTURED_MODEL,
+                        help="staged를 추가로 실행할 모델 (기본: STT_STRUCTURED_MODEL, STT_STAGED_MODEL과 같으면 생략)")
+    parser.add_argument("--json", type=Path, help="결과를 JSON으로 저장")
+    args = parser.parse_args()
+
+    if args.live:
+        from openai import OpenAI
+        client = UsageRecorder(OpenAI(api_key=OPENAI_API_KEY))
+        time_scale = 1.0
+        source = "OpenAI API (usage 실측)"
+    else:
+        client = UsageRecorder(SimulatedOpenAI(args.time_scale, args.invalid_rate))
+        time_scale = args.time_scale
+        source = "오프라인 대역 (토큰·지연 추정)"
+    print(f"{source}, 모드별 {args.runs}회\n")
+
+    staged = run_mode("staged", client, args.runs, time_scale)
+    structured = run_mode("structured", client, args.runs, time_scale)
+    same_model = None
+    if args.staged_model and args.staged_model != staged["model"]:
+        same_model = run_mode("staged", client, args.runs, time_scale, model=args.staged_model)
+    results = [staged] + ([same_model] if same_model else []) + [structured]
+    print(f"{'mode':<11} {'model':<12} {'calls':>5} {'p50(ms)':>9} {'p95(ms)':>9} {'in tok':>8} {'out tok':>8} "
+          f"{'USD/run':>9} {'fallback':>8}")
+    for r in results:
+        print(f"{r['mode']:<11} {r['model']:<12} {r['calls']:>5.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+              f"{r['prompt_tokens']:>8.0f} {r['completion_tokens']:>8.0f} {r['cost_usd']:>9.5f} "
+              f"{r['fallbacks']:>3}/{r['runs']:<4}")
+    print(f"\nstructured@{structured['model']} / staged@{staged['model']}: "
+          f"p50 {structured['p50_ms'] / staged['p50_ms']:.2f}배, 비용 {structured['cost_usd'] / staged['cost_usd']:.2f}배"
+          + (" (파이프라인 + 모델 변경)" if structured["model"] != staged["model"] else ""))
+    if same_model:
+        print(f"structured@{structured['model']} / staged@{same_model['model']}: "
+              f"p50 {structured['p50_ms'] / same_model['p50_ms']:.2f}배, "
+              f"비용 {structured['cost_usd'] / same_model['cost_usd']:.2f}배"
+              + (" (같은 모델, 1회 호출로 줄인 효과만)" if same_model["model"] == structured["model"] else ""))
+
+    if args.json:
+        args.json.write_text(json.dumps({"source": source, "results": results}, ensure_ascii=False, indent=2),
+                             encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
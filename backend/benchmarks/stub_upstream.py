@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업스트림(data.go.kr, 카카오 길찾기/좌표 변환) 로컬 대역 HTTP 서버
+
+벤치마크 픽스처(benchmarks/fixtures/upstream.json.gz)로 응답하므로 부하 테스트 중 실제 API 호출 한도를 쓰지 않습니다.
+백엔드는 업스트림 주소 환경변수만 바꿔 실행하면 됩니다 (시작 시 출력되는 값 사용).
+
+사용법:
+    python benchmarks/stub_upstream.py [--port 8099] [--latency-ms 80] [--jitter-ms 40]
+
+    DATA_GO_KR_BASE_URL=http://127.0.0.1:8099 KAKAO_NAVI_BASE_URL=http://127.0.0.1:8099 \\
+    KAKAO_LOCAL_BASE_URL=http://127.0.0.1:8099 python app.py
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from benchmarks.fixtures import FIXTURE_PATH, FixtureResponder, load_fixtures
+
+
+def make_handler(responder: FixtureResponder, latency_sec: float, jitter_sec: float):
+    counts = {"requests": 0}
+    lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if latency_sec or jitter_sec:
+                time.sleep(max(0.0, latency_sec + random.uniform(-jitter_sec, jitter_sec)))
+            status, content_type, body = responder.respond(parts.path, dict(parse_qsl(parts.query)))
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                counts["requests"] += 1
+
+        def log_message(self, format, *args):
+            pass
+
+    StubHandler.counts = counts
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업스트림 로컬 대역 서버 (픽스처 응답)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURE_PATH, help="업스트림 픽스처(.json.gz)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답마다 추가할 지연 (실제 API 흉내)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 변동 폭 (±)")
+    args = parser.parse_args()
+
+    responder = FixtureResponder(load_fixtures(args.fixtures))
+    handler = make_handler(responder, args.latency_ms / 1000.0, args.jitter_ms / 1000.0)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+
+    print(f"업스트림 대역 서버: {base_url} (병원 {len(responder.hospitals)}곳, 응답 {len(responder.responses)}건)")
+    print("백엔드 실행 시 환경변수:")
+    for name in ("DATA_GO_KR_BASE_URL", "KAKAO_NAVI_BASE_URL", "KAKAO_LOCAL_BASE_URL"):
+        print(f"  export {name}={base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n요청 {handler.counts['requests']}건 (픽스처 적중 {responder.hits}, 누락 {responder.misses})")
+
+
+if __name__ == "__main__":
+    main()
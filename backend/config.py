@@ -36,17 +36,90 @@ TWILIO_CALLER_NUMBER = os.getenv("TWILIO_CALLER_NUMBER")
 TWILIO_FALLBACK_TARGET = os.getenv("TWILIO_FALLBACK_TARGET", "01049323766")
 TWILIO_CALLBACK_BASE_URL = os.getenv("TWILIO_CALLBACK_BASE_URL")
 
+# 업스트림 기본 주소 (부하 테스트 시 benchmarks/stub_upstream.py 같은 로컬 대역 서버로 교체)
+DATA_GO_KR_BASE_URL = os.getenv("DATA_GO_KR_BASE_URL", "https://apis.data.go.kr").rstrip("/")
+KAKAO_NAVI_BASE_URL = os.getenv("KAKAO_NAVI_BASE_URL", "https://apis-navi.kakaomobility.com").rstrip("/")
+KAKAO_LOCAL_BASE_URL = os.getenv("KAKAO_LOCAL_BASE_URL", "https://dapi.kakao.com").rstrip("/")
+
 # API URL
-ER_BED_URL = "https://apis.data.go.kr/B552657/ErmctInfoInqireService/getEmrrmRltmUsefulSckbdInfoInqire"
-EGET_BASE_URL = "https://apis.data.go.kr/B552657/ErmctInfoInqireService/getEgytBassInfoInqire"
-EGET_LIST_URL = "https://apis.data.go.kr/B552657/ErmctInfoInqireService/getEgytListInfoInqire"
-STRM_LIST_URL = "https://apis.data.go.kr/B552657/ErmctInfoInqireService/getStrmListInfoInqire"
-KAKAO_DIRECTIONS_URL = "https://apis-navi.kakaomobility.com/v1/directions"
+ER_BED_URL = f"{DATA_GO_KR_BASE_URL}/B552657/ErmctInfoInqireService/getEmrrmRltmUsefulSckbdInfoInqire"
+EGET_BASE_URL = f"{DATA_GO_KR_BASE_URL}/B552657/ErmctInfoInqireService/getEgytBassInfoInqire"
+EGET_LIST_URL = f"{DATA_GO_KR_BASE_URL}/B552657/ErmctInfoInqireService/getEgytListInfoInqire"
+STRM_LIST_URL = f"{DATA_GO_KR_BASE_URL}/B552657/ErmctInfoInqireService/getStrmListInfoInqire"
+KAKAO_DIRECTIONS_URL = f"{KAKAO_NAVI_BASE_URL}/v1/directions"
 
 # 카카오 API URL
-KAKAO_COORD2REGION_URL = "https://dapi.kakao.com/v2/local/geo/coord2regioncode.json"
-KAKAO_COORD2ADDR_URL = "https://dapi.kakao.com/v2/local/geo/coord2address.json"
-KAKAO_ADDRESS_URL = "https://dapi.kakao.com/v2/local/search/address.json"
+KAKAO_COORD2REGION_URL = f"{KAKAO_LOCAL_BASE_URL}/v2/local/geo/coord2regioncode.json"
+KAKAO_COORD2ADDR_URL = f"{KAKAO_LOCAL_BASE_URL}/v2/local/geo/coord2address.json"
+KAKAO_ADDRESS_URL = f"{KAKAO_LOCAL_BASE_URL}/v2/local/search/address.json"
+
+# 외부 I/O 실행 방식 (utils/concurrency.py)
+# auto: eventlet/gevent에서 소켓이 패치되지 않았으면 블로킹 호출을 실제 OS 스레드 풀로 위임
+# direct: 위임하지 않고 호출 스레드에서 그대로 실행
+OUTBOUND_IO_MODE = os.getenv("OUTBOUND_IO_MODE", "auto")
+
+# DNS 캐시 설정 (업스트림 호스트 주소 재사용, 만료 시 한 호출자만 다시 해석)
+DNS_CACHE_TTL_SEC = int(os.getenv("DNS_CACHE_TTL_SEC", "300"))
+
+# 헤지 요청 설정 (utils/hedge.py, http_get(hedge=True)로 사용하는 호출에만 적용)
+# 엔드포인트별 최근 HTTP_HEDGE_WINDOW개 응답 시간의 p90까지 응답이 없으면 한 번 더 요청
+# 추가 요청은 전체 호출의 HTTP_HEDGE_BUDGET_RATIO(기본 5%) 이내로 제한
+HTTP_HEDGE_PERCENTILE = float(os.getenv("HTTP_HEDGE_PERCENTILE", "90"))
+HTTP_HEDGE_WINDOW = int(os.getenv("HTTP_HEDGE_WINDOW", "200"))
+HTTP_HEDGE_MIN_SAMPLES = int(os.getenv("HTTP_HEDGE_MIN_SAMPLES", "20"))
+HTTP_HEDGE_MIN_DELAY_MS = float(os.getenv("HTTP_HEDGE_MIN_DELAY_MS", "50"))
+HTTP_HEDGE_BUDGET_RATIO = float(os.getenv("HTTP_HEDGE_BUDGET_RATIO", "0.05"))
+HTTP_HEDGE_BUDGET_BURST = float(os.getenv("HTTP_HEDGE_BUDGET_BURST", "5"))
+HTTP_HEDGE_MAX_WORKERS = int(os.getenv("HTTP_HEDGE_MAX_WORKERS", "64"))
+
+# 운영 지표 (/metrics) - 응답 시간을 기록할 API 라우트 (쉼표로 구분한 경로 접두사)
+METRICS_ROUTE_PREFIXES = tuple(
+    p.strip() for p in os.getenv(
+        "METRICS_ROUTE_PREFIXES", "/api/hospitals/top3,/api/stt/transcribe,/api/chat/"
+    ).split(",") if p.strip()
+)
+
+# 카카오 길찾기 경로 캐시 설정
+# 출발지를 약 200m 격자로 스냅하고, 교통 상황 시간대(분 단위 버킷)별로 구분하여 재사용
+ROUTE_CACHE_TTL_SEC = int(os.getenv("ROUTE_CACHE_TTL_SEC", "300"))
+ROUTE_CACHE_MAXSIZE = int(os.getenv("ROUTE_CACHE_MAXSIZE", "2048"))
+ROUTE_CACHE_GRID_M = float(os.getenv("ROUTE_CACHE_GRID_M", "200"))
+ROUTE_CACHE_TIME_BUCKET_MIN = int(os.getenv("ROUTE_CACHE_TIME_BUCKET_MIN", "15"))
+
+# ETA 행렬(1 출발지 → 다수 목적지) 설정
+# provider: kakao(카카오 길찾기 병렬 호출) | local(직선거리 기반 로컬 대체 구현, 테스트용)
+ETA_MATRIX_PROVIDER = os.getenv("ETA_MATRIX_PROVIDER", "kakao")
+ETA_MATRIX_MAX_WORKERS = int(os.getenv("ETA_MATRIX_MAX_WORKERS", "8"))
+# 행렬 응답 대기 상한 (top3 재정렬은 상위 3곳이 응답하면 나머지를 기다리지 않으며,
+# 기다리지 않은 호출은 top3 경로 조회가 새로 요청하지 않고 이어서 기다림)
+ETA_MATRIX_TIMEOUT_SEC = float(os.getenv("ETA_MATRIX_TIMEOUT_SEC", "2.5"))
+# top3 선정 전 실제 주행 시간으로 재정렬할 상위 후보 수
+ETA_RERANK_TOP_N = int(os.getenv("ETA_RERANK_TOP_N", "10"))
+
+# 병원 목록 조회 범위 계획 (services/hospital_service.py plan_scope_stages)
+# 요청 시군구 + SCOPE_NEIGHBOR_DEPTH 단계 인접 시군구(data/sigungu_neighbors.json)를 STAGE2로 먼저 조회하고,
+# 출발지 SCOPE_QUALIFY_RADIUS_KM 이내에서 응급실 병상이 있고 증상 요건을 충족하는 후보가
+# SCOPE_MIN_CANDIDATES개 미만이면 시도 전체로 확장 (-1: 항상 시도 전체, 인접 데이터가 없으면 시도 전체)
+SCOPE_NEIGHBOR_DEPTH = int(os.getenv("SCOPE_NEIGHBOR_DEPTH", "1"))
+SCOPE_MIN_CANDIDATES = int(os.getenv("SCOPE_MIN_CANDIDATES", "8"))
+SCOPE_QUALIFY_RADIUS_KM = float(os.getenv("SCOPE_QUALIFY_RADIUS_KM", "50"))
+
+# 병원 정보 캐시 설정
+# 기본정보(주소, 좌표, 등급)는 거의 바뀌지 않으므로 길게, 실시간 병상 정보는 짧게 유지
+BASEINFO_CACHE_TTL_SEC = int(os.getenv("BASEINFO_CACHE_TTL_SEC", str(6 * 3600)))
+BASEINFO_CACHE_MAXSIZE = int(os.getenv("BASEINFO_CACHE_MAXSIZE", "5000"))
+BED_CACHE_TTL_SEC = int(os.getenv("BED_CACHE_TTL_SEC", "30"))
+# 병원 캐시 예열 (services/prefetch.py) - EMS 로그인/위치 확인 시 백그라운드 조회
+# 같은 (시도, 시군구) 범위는 PREFETCH_MIN_INTERVAL_SEC 동안 다시 예열하지 않음
+PREFETCH_MAX_WORKERS = int(os.getenv("PREFETCH_MAX_WORKERS", "2"))
+PREFETCH_MIN_INTERVAL_SEC = float(os.getenv("PREFETCH_MIN_INTERVAL_SEC", "120"))
+# 병상 변경 스트림 (Socket.IO "beds:{시도}" 방) - 구독자가 있는 시도의 병상 정보를 주기적으로 조회
+BED_STREAM_POLL_SEC = float(os.getenv("BED_STREAM_POLL_SEC", "30"))
+
+# 경로 폴리라인 단순화 허용 오차 (m, Douglas–Peucker). 0이면 단순화하지 않음
+ROUTE_SIMPLIFY_TOLERANCE_M = float(os.getenv("ROUTE_SIMPLIFY_TOLERANCE_M", "5"))
+# 요청 파라미터(tolerance_m, route_tolerance_m)로 지정할 수 있는 최대 허용 오차 (m, 더 크면 이 값으로 제한)
+ROUTE_SIMPLIFY_MAX_TOLERANCE_M = float(os.getenv("ROUTE_SIMPLIFY_MAX_TOLERANCE_M", "100"))
 
 # 증상별 필수 요구사항
 SYMPTOM_RULES = {
@@ -105,3 +178,75 @@ BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_DB_PATH = BASE_DIR / "instance" / "site.db"
 DATABASE_URI = os.getenv("DATABASE_URI", f"sqlite:///{DEFAULT_DB_PATH}")
 
+# 캐시 스냅샷 (utils/cache_snapshot.py) - 병원 기본정보·등급 목록·역지오코딩·경로 캐시를 파일로 저장했다가 시작 시 복원
+# CACHE_SNAPSHOT_INTERVAL_SEC마다 바뀐 캐시만 저장(0이면 종료 시에만), CACHE_SNAPSHOT_MAX_AGE_SEC보다 오래된 파일은 복원하지 않음
+CACHE_SNAPSHOT_DIR = Path(os.getenv("CACHE_SNAPSHOT_DIR", str(BASE_DIR / "instance" / "cache")))
+CACHE_SNAPSHOT_INTERVAL_SEC = float(os.getenv(
+    "CACHE_SNAPSHOT_INTERVAL_SEC", os.getenv("REVERSE_GEOCODE_CACHE_SAVE_INTERVAL_SEC", "60")))
+CACHE_SNAPSHOT_MAX_AGE_SEC = float(os.getenv("CACHE_SNAPSHOT_MAX_AGE_SEC", str(24 * 3600)))
+
+# 역지오코딩(coord2region/coord2address) 캐시 설정
+# 좌표를 약 50m 격자로 스냅하여 저장하고, 재시작 후에도 유지되도록 파일로 저장 (항목 TTL 안이면 파일 나이와 무관하게 복원)
+REVERSE_GEOCODE_GRID_M = float(os.getenv("REVERSE_GEOCODE_GRID_M", "50"))
+REVERSE_GEOCODE_CACHE_TTL_SEC = int(os.getenv("REVERSE_GEOCODE_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+REVERSE_GEOCODE_CACHE_MAXSIZE = int(os.getenv("REVERSE_GEOCODE_CACHE_MAXSIZE", "50000"))
+REVERSE_GEOCODE_CACHE_PATH = Path(os.getenv("REVERSE_GEOCODE_CACHE_PATH", str(BASE_DIR / "instance" / "reverse_geocode_cache.pkl")))
+
+# 주소 → 좌표(지오코딩) 캐시 및 일괄 변환 설정
+GEOCODE_CACHE_TTL_SEC = int(os.getenv("GEOCODE_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+GEOCODE_CACHE_MAXSIZE = int(os.getenv("GEOCODE_CACHE_MAXSIZE", "20000"))
+GEOCODE_BATCH_MAX_ITEMS = int(os.getenv("GEOCODE_BATCH_MAX_ITEMS", "200"))
+GEOCODE_BATCH_MAX_WORKERS = int(os.getenv("GEOCODE_BATCH_MAX_WORKERS", "8"))
+
+# 오프라인 행정구역 경계 인덱스 (scripts/build_region_index.py로 생성)
+# 경계선에서 REGION_BORDER_EPS_M 이내이거나 데이터 범위 밖의 좌표는 카카오 API로 조회
+REGION_INDEX_DIR = Path(os.getenv("REGION_INDEX_DIR", str(BASE_DIR / "data")))
+REGION_INDEX_MMAP = os.getenv("REGION_INDEX_MMAP", "1") == "1"
+REGION_BORDER_EPS_M = float(os.getenv("REGION_BORDER_EPS_M", "30"))
+
+# 로컬 ETA 추정 모델 (scripts/train_eta_model.py로 학습)
+# ETA_SAMPLE_LOG_PATH를 지정하면 카카오 길찾기 성공 결과를 학습용으로 기록 (기본: 기록하지 않음)
+# 출발·도착 좌표는 지역 셀(0.25도) 단위로만 저장하며, 파일 쓰기는 캐시 스냅샷 주기에 모아서 수행
+ETA_MODEL_PATH = Path(os.getenv("ETA_MODEL_PATH", str(BASE_DIR / "data" / "eta_model.npz")))
+ETA_SAMPLE_LOG_PATH = os.getenv("ETA_SAMPLE_LOG_PATH", "")
+
+
+# 병상 이력(링 버퍼) 및 도착 시점 가용 병상 예측 (services/bed_history.py)
+# hpid·항목별 최근 BED_HISTORY_CAPACITY개 변경 기록을 보관하고 BED_HISTORY_SAVE_INTERVAL_SEC마다 파일로 저장
+# (저장은 캐시 스냅샷 주기에 함께 확인하므로 실제 간격은 CACHE_SNAPSHOT_INTERVAL_SEC 단위, 종료 시에는 항상 저장)
+# 예측: 최근 BED_FORECAST_WINDOW_MIN분 추세(선형)를 ETA만큼 연장 (연장 길이는 관찰 구간 이내로 제한)
+BED_HISTORY_CAPACITY = int(os.getenv("BED_HISTORY_CAPACITY", "256"))
+BED_HISTORY_PATH = Path(os.getenv("BED_HISTORY_PATH", str(BASE_DIR / "instance" / "bed_history.npz")))
+BED_HISTORY_SAVE_INTERVAL_SEC = int(os.getenv("BED_HISTORY_SAVE_INTERVAL_SEC", "300"))
+BED_FORECAST_WINDOW_MIN = float(os.getenv("BED_FORECAST_WINDOW_MIN", "60"))
+
+# 요청 구간 시간 측정 (utils/tracing.py) - Server-Timing 헤더, ?debug_timings=1이면 응답에 _timings 추가
+# TRACE_SLOW_REQUEST_MS 이상 걸린 요청은 TRACE_SLOW_SAMPLE_RATE 비율로 TRACE_SLOW_LOG_PATH에 기록 (빈 값이면 기록하지 않음)
+TRACE_ROUTE_PREFIXES = tuple(
+    p.strip() for p in os.getenv("TRACE_ROUTE_PREFIXES", "/api/hospitals/top3").split(",") if p.strip()
+)
+TRACE_SLOW_REQUEST_MS = float(os.getenv("TRACE_SLOW_REQUEST_MS", "3000"))
+TRACE_SLOW_SAMPLE_RATE = float(os.getenv("TRACE_SLOW_SAMPLE_RATE", "1.0"))
+TRACE_SLOW_LOG_PATH = os.getenv("TRACE_SLOW_LOG_PATH", str(BASE_DIR / "instance" / "slow_requests.jsonl"))
+
+# 관리자 전용 API (routes/admin.py) - X-Admin-Token 헤더로 인증, 값이 없으면 관리자 API 비활성화
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# 샘플링 프로파일러 (/api/admin/profile, utils/profiler.py) - 1회 최대 수집 시간과 기본 표본 간격
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+PROFILER_DEFAULT_INTERVAL_MS = float(os.getenv("PROFILER_DEFAULT_INTERVAL_MS", "10"))
+
+# 업스트림 장애 주입 (utils/faults.py) - 시험 환경 전용, 둘 다 비어 있으면 꺼짐
+# 호스트별 지연 분포, 오류율, 잘린 응답, 느린 본문 전송 규칙을 JSON 문자열 또는 JSON 파일 경로로 지정
+FAULT_INJECTION = os.getenv("FAULT_INJECTION", "")
+FAULT_INJECTION_PATH = os.getenv("FAULT_INJECTION_PATH", "")
+FAULT_INJECTION_SEED = int(os.getenv("FAULT_INJECTION_SEED")) if os.getenv("FAULT_INJECTION_SEED") else None
+
+# STT 후처리 파이프라인 (services/stt_service.py)
+# staged: 의학용어 번역 → SBAR → ARS 순서로 3회 호출 / structured: JSON 스키마 구조화 출력 1회 (검증 실패 시 staged로 대체)
+# 요청별로 pipeline 파라미터(staged|structured)로 바꿀 수 있음
+# 두 경로는 모델도 다름: pipeline=structured로 바꾸면 STT_STAGED_MODEL 대신 STT_STRUCTURED_MODEL로 호출됨
+# (structured 검증 실패 시 대체 staged는 STT_STAGED_MODEL, 비교는 benchmarks/stt_pipeline.py의 staged@모델 행 참고)
+STT_PIPELINE_MODE = os.getenv("STT_PIPELINE_MODE", "staged")
+STT_STAGED_MODEL = os.getenv("STT_STAGED_MODEL", "gpt-4-turbo")
+# 구조화 출력(response_format json_schema)을 지원하는 모델이어야 함 (gpt-4-turbo는 json_object만 지원)
+STT_STRUCTURED_MODEL = os.getenv("STT_STRUCTURED_MODEL", "gpt-4o")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""관리자 전용 라우트 (운영 중 진단)"""
+
+import hmac
+from flask import request, jsonify, Response
+
+from config import ADMIN_TOKEN, PROFILER_MAX_SECONDS, PROFILER_DEFAULT_INTERVAL_MS
+from utils.profiler import PROFILER, PROFILE_MODE_CPU, PROFILE_MODE_WALL, render_collapsed
+
+
+def _admin_error():
+    """관리자 인증 실패 응답 (ADMIN_TOKEN 미설정이면 404, 토큰 불일치면 403, 통과하면 None)"""
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "관리자 API가 비활성화되어 있습니다."}), 404
+    token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        return jsonify({"error": "관리자 권한이 없습니다."}), 403
+    return None
+
+
+def register_admin_routes(app):
+    """관리자 라우트 등록"""
+
+    @app.route('/api/admin/profile', methods=['POST'])
+    def api_admin_profile():
+        """샘플링 프로파일 수집 API
+
+        파라미터: seconds(기본 10), interval_ms(기본 PROFILER_DEFAULT_INTERVAL_MS),
+        mode(cpu: 실행 중인 스택만 | wall: 대기 중인 그린스레드 포함), format(collapsed | json)
+        """
+        error = _admin_error()
+        if error:
+            return error
+        try:
+            seconds = float(request.args.get('seconds', 10))
+            interval_ms = float(request.args.get('interval_ms', PROFILER_DEFAULT_INTERVAL_MS))
+        except ValueError:
+            return jsonify({"error": "seconds, interval_ms는 숫자여야 합니다."}), 400
+        mode = request.args.get('mode', PROFILE_MODE_CPU)
+        if mode not in (PROFILE_MODE_CPU, PROFILE_MODE_WALL):
+            return jsonify({"error": "mode는 cpu 또는 wall이어야 합니다."}), 400
+        if not 0 < seconds <= PROFILER_MAX_SECONDS:
+            return jsonify({"error": f"seconds는 0 초과 {PROFILER_MAX_SECONDS:g} 이하여야 합니다."}), 400
+        interval_ms = max(interval_ms, 1.0)
+
+        result = PROFILER.profile(seconds, interval_ms / 1000.0, mode)
+        if result is None:
+            return jsonify({"error": "이미 프로파일을 수집 중입니다."}), 409
+        if "error" in result:
+            return jsonify({"error": f"프로파일 수집 중 오류가 발생했습니다: {result['error']}"}), 500
+
+        if request.args.get('format') == 'json':
+            return jsonify(result), 200
+        headers = {
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Overhead-Ms": str(result["sampler_overhead_ms"]),
+        }
+        return Response(render_collapsed(result["stacks"]), mimetype="text/plain; charset=utf-8", headers=headers)
@@ -5,6 +5,14 @@
 from flask import request, jsonify, session
 from models import db, EMSTeam, Hospital
 from utils.password import verify_password, hash_password
+from services.prefetch import schedule_prefetch
+from utils.geo import guess_region_from_address
+
+
+def _hospital_sido(hospital):
+    """병원 주소의 시도 (병상 변경 구독 방 이름으로 사용)"""
+    region = guess_region_from_address(hospital.address)
+    return region[0] if region else None
 
 
 def register_auth_routes(app):
@@ -38,6 +46,9 @@ def register_auth_routes(app):
             session['ems_id'] = team.ems_id
             session['logged_in'] = True
             
+            # 팀 담당 지역의 병원/병상/등급 캐시 예열 (첫 top3 조회가 느리지 않도록, 같은 지역 팀끼리 중복 제거)
+            schedule_prefetch(team.region, reason="login")
+            
             return jsonify({
                 "team_id": team.team_id,
                 "ems_id": team.ems_id,
@@ -96,6 +107,7 @@ def register_auth_routes(app):
             return jsonify({
                 "hospital_id": hospital.hospital_id,
                 "hospital_name": hospital.name,
+                "sido": _hospital_sido(hospital),
                 "message": "로그인 성공"
             }), 200
             
@@ -168,7 +180,8 @@ def register_auth_routes(app):
                     return jsonify({
                         "user_type": "HOSPITAL",
                         "hospital_id": hospital.hospital_id,
-                        "hospital_name": hospital.name
+                        "hospital_name": hospital.name,
+                        "sido": _hospital_sido(hospital)
                     }), 200
         
         # 로그인되지 않은 경우에도 200을 반환하되, user 정보는 null
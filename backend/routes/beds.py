@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""실시간 병상 변경 스트림 WebSocket 이벤트"""
+
+from flask import request
+from flask_socketio import emit, join_room, leave_room
+
+from services.bed_stream import BedStream, bed_room
+
+
+def register_bed_routes(app, socketio=None):
+    """병상 변경 스트림 이벤트 등록 (클라이언트는 subscribe_beds로 시도 방에 참여)"""
+    if not socketio:
+        return None
+
+    bed_stream = BedStream(socketio)
+
+    @socketio.on('subscribe_beds')
+    def handle_subscribe_beds(data):
+        """시도 병상 변경 구독 (현재 전체 상태를 bed_snapshot으로 먼저 전송)"""
+        try:
+            sido = (data or {}).get('sido')
+            if not sido:
+                print(f"⚠️ subscribe_beds: sido가 없습니다. data={data}")
+                return
+            join_room(bed_room(sido))
+            print(f"✅ 클라이언트 {request.sid}가 병상 스트림 {sido}을(를) 구독했습니다.")
+            emit('bed_snapshot', bed_stream.subscribe(sido))
+        except Exception as e:
+            print(f"❌ subscribe_beds 오류: {e}")
+            import traceback
+            traceback.print_exc()
+
+    @socketio.on('unsubscribe_beds')
+    def handle_unsubscribe_beds(data):
+        """시도 병상 변경 구독 해제"""
+        try:
+            sido = (data or {}).get('sido')
+            if sido:
+                leave_room(bed_room(sido))
+                emit('beds_unsubscribed', {'sido': sido})
+        except Exception as e:
+            print(f"❌ unsubscribe_beds 오류: {e}")
+
+    return bed_stream
@@ -3,11 +3,17 @@
 """지오코딩 관련 라우트"""
 
 from flask import request, jsonify
-from config import KAKAO_KEY
+from config import KAKAO_KEY, GEOCODE_BATCH_MAX_ITEMS
 from utils.geo import (
-    kakao_coord2address, kakao_coord2region, kakao_address2coord,
-    get_driving_info_kakao
+    kakao_coord2address, lookup_region, kakao_address2coord,
+    get_driving_info_kakao, get_route_cache_stats, get_geocode_cache_stats,
+    batch_address2coord, get_address_cache_stats
 )
+from utils.http import get_dns_stats, get_hedge_stats
+from utils.polyline import format_route_path, parse_route_format, parse_tolerance
+from utils.cache_snapshot import get_cache_snapshot_stats
+from utils.concurrency import new_executor
+from services.prefetch import schedule_prefetch, get_prefetch_stats
 
 
 def register_geo_routes(app):
@@ -64,9 +70,11 @@ def register_geo_routes(app):
             if lat == 0 and lon == 0:
                 return jsonify({"error": "유효한 좌표를 입력해주세요."}), 400
             
-            result = kakao_coord2region(lon, lat, KAKAO_KEY)
+            result = lookup_region(lon, lat, KAKAO_KEY)
             if result:
                 sido, sigungu = result
+                # 구급차 위치 기준 병원/병상/등급 캐시 예열 (같은 범위는 중복 실행하지 않음)
+                schedule_prefetch(sido, sigungu, reason="coord2region")
                 return jsonify({"sido": sido, "sigungu": sigungu}), 200
             else:
                 # 카카오 API 호출 실패 시에도 200 반환 (네트워크 문제일 수 있음)
@@ -77,6 +85,46 @@ def register_geo_routes(app):
             # 에러 발생 시에도 200 반환하여 프론트엔드가 처리할 수 있도록
             return jsonify({"error": str(e), "sido": None, "sigungu": None}), 200
 
+    @app.route('/api/geo/locate', methods=['GET'])
+    def api_locate():
+        """좌표 → 주소 + 행정구역 동시 변환 API (두 조회를 병렬 실행, 병원/병상/등급 캐시 예열)"""
+        try:
+            lat_str = request.args.get('lat')
+            lon_str = request.args.get('lon')
+            
+            if lat_str is None or lon_str is None:
+                return jsonify({"error": "lat와 lon 파라미터가 필요합니다."}), 400
+            
+            try:
+                lat = float(lat_str)
+                lon = float(lon_str)
+            except (ValueError, TypeError):
+                return jsonify({"error": "lat와 lon은 숫자여야 합니다."}), 400
+            
+            if lat == 0 and lon == 0:
+                return jsonify({"error": "유효한 좌표를 입력해주세요."}), 400
+            
+            with new_executor(2) as executor:
+                address_future = executor.submit(kakao_coord2address, lon, lat, KAKAO_KEY)
+                region_future = executor.submit(lookup_region, lon, lat, KAKAO_KEY)
+                address = address_future.result()
+                region = region_future.result()
+            
+            sido, sigungu = region if region else (None, None)
+            if sido:
+                schedule_prefetch(sido, sigungu, reason="locate")
+            
+            response = {"address": address, "sido": sido, "sigungu": sigungu}
+            if not address and not region:
+                # 카카오 API 호출 실패 시에도 200 반환 (네트워크 문제일 수 있음)
+                response["error"] = "위치 정보를 찾을 수 없습니다."
+            return jsonify(response), 200
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            # 에러 발생 시에도 200 반환하여 프론트엔드가 처리할 수 있도록
+            return jsonify({"error": str(e), "address": None, "sido": None, "sigungu": None}), 200
+
     @app.route('/api/geo/route', methods=['GET'])
     def api_geo_route():
         """경로 조회 API (카카오 길찾기)"""
@@ -85,16 +133,21 @@ def register_geo_routes(app):
             origin_lon = request.args.get('origin_lon', type=float)
             dest_lat = request.args.get('dest_lat', type=float)
             dest_lon = request.args.get('dest_lon', type=float)
+            # 목적지 병원 hpid (선택) - top3 조회와 경로 캐시를 공유하기 위해 사용
+            hpid = request.args.get('hpid') or None
+            # 경로 포맷 (coords | polyline | f32) 및 단순화 허용 오차(m)
+            route_format = parse_route_format(request.args.get('format'))
+            tolerance_m = parse_tolerance(request.args.get('tolerance_m'))
             
             if not all([origin_lat, origin_lon, dest_lat, dest_lon]):
                 return jsonify({"error": "origin_lat, origin_lon, dest_lat, dest_lon 파라미터가 필요합니다."}), 400
             
             # 카카오 길찾기 API 호출
-            real_dist, real_eta, path_coords = get_driving_info_kakao(origin_lat, origin_lon, dest_lat, dest_lon, KAKAO_KEY)
+            real_dist, real_eta, path_coords = get_driving_info_kakao(origin_lat, origin_lon, dest_lat, dest_lon, KAKAO_KEY, hpid)
             
             if path_coords:
                 return jsonify({
-                    "path_coords": path_coords,
+                    "path_coords": format_route_path(path_coords, route_format, tolerance_m),
                     "distance_km": real_dist,
                     "eta_minutes": real_eta
                 })
@@ -108,6 +161,19 @@ def register_geo_routes(app):
             print(f"경로 조회 오류: {e}")
             return jsonify({"error": str(e)}), 500
 
+    @app.route('/api/geo/cache/stats', methods=['GET'])
+    def api_geo_cache_stats():
+        """지오코딩/경로 캐시 지표 조회 API"""
+        return jsonify({
+            "route": get_route_cache_stats(),
+            "reverse_geocode": get_geocode_cache_stats(),
+            "address2coord": get_address_cache_stats(),
+            "dns": get_dns_stats(),
+            "hedging": get_hedge_stats(),
+            "prefetch": get_prefetch_stats(),
+            "snapshots": get_cache_snapshot_stats()
+        }), 200
+
     @app.route('/api/geo/address2coord', methods=['GET'])
     def api_address2coord():
         """주소 → 좌표 변환 API"""
@@ -135,3 +201,23 @@ def register_geo_routes(app):
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+
+    @app.route('/api/geo/address2coord/batch', methods=['POST', 'OPTIONS'])
+    def api_address2coord_batch():
+        """주소 목록 → 좌표 일괄 변환 API (입력 순서대로 항목별 결과/오류 반환)"""
+        if request.method == 'OPTIONS':
+            return '', 200
+        
+        try:
+            data = request.get_json(silent=True) or {}
+            addresses = data.get('addresses')
+            
+            if not isinstance(addresses, list) or not addresses:
+                return jsonify({"error": "addresses 배열이 필요합니다."}), 400
+            if len(addresses) > GEOCODE_BATCH_MAX_ITEMS:
+                return jsonify({"error": f"한 번에 최대 {GEOCODE_BATCH_MAX_ITEMS}개 주소까지 변환할 수 있습니다."}), 400
+            
+            results = batch_address2coord([str(a) if a is not None else "" for a in addresses], KAKAO_KEY)
+            return jsonify({"results": results}), 200
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
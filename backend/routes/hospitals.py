@@ -4,18 +4,21 @@
 
 import re
 from flask import request, jsonify
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from config import (
     KAKAO_KEY, DATA_GO_KR_KEY, SYMPTOM_RULES, METRO_FALLBACK_PROVINCE,
-    PROVINCE_INCLUDE_METROS
+    PROVINCE_INCLUDE_METROS, ETA_RERANK_TOP_N
 )
 from services.hospital_service import (
     fetch_scope_hospitals, fetch_beds_for_sidos, fetch_hospital_grade_info,
-    evaluate_requirements, prioritize_by_region, save_or_update_hospital,
-    serialize_hospital_payload, is_metropolitan
+    prioritize_by_region, save_or_update_hospital,
+    serialize_hospital_payload, is_metropolitan, grade_target_regions, enrich_hospital_records
 )
-from utils.geo import calculate_distance, get_driving_info_kakao, guess_region_from_address
-from utils.http import safe_int
+from services.bed_history import attach_bed_forecasts
+from utils.geo import get_driving_info_kakao, get_eta_matrix
+from utils.polyline import format_route_path, parse_route_format, parse_tolerance
+from utils.concurrency import new_executor
+from utils.tracing import span, traced, annotate
 
 
 def register_hospitals_routes(app):
@@ -35,6 +38,9 @@ def register_hospitals_routes(app):
             sigungu = data.get('sigungu', '')
             symptom = data.get('symptom', '')
             stt_text = data.get('stt_text')
+            # 경로 포맷 (coords | polyline | f32) 및 단순화 허용 오차(m)
+            route_format = parse_route_format(data.get('route_format'))
+            route_tolerance_m = parse_tolerance(data.get('route_tolerance_m'))
             
             # 심정지 상태 감지 (심정지일 경우 거리 우선 정렬)
             is_cardiac_arrest = False
@@ -63,71 +69,26 @@ def register_hospitals_routes(app):
             
             extra_sidos = PROVINCE_INCLUDE_METROS.get(sido, [])
             scope_targets = [sido] + extra_sidos
-            all_hospitals_raw = fetch_scope_hospitals(sido, extra_sidos, hospital_type)
-            if not all_hospitals_raw:
-                return jsonify({"error": "해당 행정구역의 응급 대상 병원을 찾지 못했습니다."}), 404
-
+            # 병상(시도 단위 스냅샷)을 먼저 받아 두고, 요청 시군구와 인접 시군구를 먼저 조회한 뒤
+            # 병상이 있고 증상 요건을 충족하는 후보가 부족할 때만 시도 전체로 확장
             beds_dict = fetch_beds_for_sidos(scope_targets)
             rule = SYMPTOM_RULES.get(symptom, {})
+            all_hospitals_raw = fetch_scope_hospitals(sido, extra_sidos, hospital_type, sigungu=sigungu, origin=(lat, lon),
+                                                      rule=rule, bed_source=beds_dict)
+            annotate(sido=sido, sigungu=sigungu, hospital_type=hospital_type, candidates=len(all_hospitals_raw))
+            if not all_hospitals_raw:
+                return jsonify({"error": "해당 행정구역의 응급 대상 병원을 찾지 못했습니다."}), 404
             
             # 모든 병원의 hpid 수집하여 등급 정보 일괄 조회
             all_hpids = [h.get("hpid") for h in all_hospitals_raw if h.get("hpid")]
-            target_regions = list(set([sido] + extra_sidos + ([METRO_FALLBACK_PROVINCE.get(sido)] if is_metropolitan(sido) and METRO_FALLBACK_PROVINCE.get(sido) else [])))
+            target_regions = grade_target_regions(sido, extra_sidos)
             grade_info_dict = fetch_hospital_grade_info(all_hpids, DATA_GO_KR_KEY, target_regions)
 
-            def enrich_records(
-                hospitals_raw, bed_source, is_local_region=None
-            ):
-                enriched = []
-                for hospital in hospitals_raw:
-                    hpid = hospital.get("hpid")
-                    if not hpid:
-                        continue
-                    merged = dict(hospital)
-                    if hpid in bed_source:
-                        for key, value in bed_source[hpid].items():
-                            if key in ("dutyName", "dutytel3"):
-                                continue
-                            if value is not None:
-                                merged[key] = value
-                    # 등급 정보 병합
-                    if hpid in grade_info_dict:
-                        grade_info = grade_info_dict[hpid]
-                        if grade_info.get("dutyEmcls"):
-                            merged["dutyEmcls"] = grade_info["dutyEmcls"]
-                        if grade_info.get("dutyEmclsName"):
-                            merged["dutyEmclsName"] = grade_info["dutyEmclsName"]
-                    guess = guess_region_from_address(merged.get("dutyAddr"))
-                    region_name = guess[1] if guess and len(guess) > 1 else (guess[0] if guess else None)
-                    merged["region_name"] = region_name or sigungu or merged.get("region_name")
-                    
-                    # 거리 계산
-                    if merged.get("wgs84Lat") and merged.get("wgs84Lon"):
-                        merged["distance_km"] = calculate_distance(lat, lon, merged["wgs84Lat"], merged["wgs84Lon"])
-                        if merged["distance_km"] > 150.0:
-                            continue
-                    else:
-                        merged["distance_km"] = float('inf')
-                        continue
-                    
-                    # 지역 내 병원 판단
-                    if is_local_region is None:
-                        is_local = (not sigungu) or (merged["region_name"] == sigungu)
-                        merged["_is_local_region"] = is_local
-                    else:
-                        merged["_is_local_region"] = is_local_region
-                    
-                    score, fully_met = evaluate_requirements(merged, rule)
-                    merged["_requirement_score"] = score
-                    merged["_meets_conditions"] = fully_met
-                    
-                    # 소아 중증 환자의 경우: 소아중환자실(hvncc) 보유 병원에 가산점
-                    if hospital_type == "pediatric" and symptom == "소아 중증(신생아/영아)":
-                        hvncc = safe_int(merged.get("hvncc", 0))
-                        if hvncc >= 1:
-                            merged["_requirement_score"] = score + 10.0
-                    enriched.append(merged)
-                return enriched
+            def enrich_records(hospitals_raw, bed_source, is_local_region=None):
+                return enrich_hospital_records(
+                    hospitals_raw, bed_source, grade_info_dict, lat, lon, sigungu, rule, hospital_type, symptom,
+                    is_local_region=is_local_region
+                )
 
             merged_hospitals = enrich_records(all_hospitals_raw, beds_dict)
             local_hospitals = [h for h in merged_hospitals if h.get("_is_local_region")]
@@ -150,22 +111,34 @@ def register_hospitals_routes(app):
                     return 1.0
                 return 0.0
             
+            def travel_key(hospital):
+                """이동 시간 기준 정렬 키: 실제 주행 ETA가 있으면 사용, 없으면 로컬 모델 추정값"""
+                if hospital.get("_route_eta_minutes") is not None:
+                    return hospital["_route_eta_minutes"]
+                if hospital.get("_est_eta_minutes") is not None:
+                    return hospital["_est_eta_minutes"]
+                return float('inf')
+
+            def bed_risk_key(hospital):
+                """도착 시점에 응급실 병상이 없을 것으로 예상되면 1 (예측값이 없으면 0)"""
+                at_eta = hospital.get("_hvec_at_eta")
+                return 1 if at_eta is not None and at_eta < 1 else 0
+
+            @traced("sort")
             def sort_records(records):
-                """병원 정렬: 심정지 시 거리 우선, 그 외는 요구사항 점수 > 등급 우선순위 > 거리"""
-                # 심정지 상태면 거리만으로 정렬 (시간이 생명이므로)
+                """병원 정렬: 심정지 시 이동 시간 우선, 그 외는 요구사항 점수 > 등급 우선순위 > 도착 시점 병상 예측 > 이동 시간"""
+                # 심정지 상태면 이동 시간만으로 정렬 (시간이 생명이므로)
                 if is_cardiac_arrest:
-                    return sorted(
-                        records,
-                        key=lambda x: x.get("distance_km", float('inf'))
-                    )
-                # 그 외는 기존 로직: 요구사항 점수 > 등급 우선순위 > 거리
+                    return sorted(records, key=travel_key)
+                # 그 외: 요구사항 점수 > 등급 우선순위 > 도착 시점 병상 예측 > 이동 시간
                 else:
                     return sorted(
                         records,
                         key=lambda x: (
                             -x.get("_requirement_score", 0.0),
                             -get_priority_score(x),
-                            x.get("distance_km", float('inf'))
+                            bed_risk_key(x),
+                            travel_key(x)
                         )
                     )
 
@@ -194,6 +167,31 @@ def register_hospitals_routes(app):
 
             combined_candidates = sort_records(combined_candidates)
             combined_candidates = [h for h in combined_candidates if h.get("distance_km", float('inf')) <= 100.0]
+
+            # 상위 후보는 ETA 행렬(실제 주행 시간)로 재정렬 - 결과는 경로 캐시에 남고,
+            # 응답을 기다리지 않은 호출도 아래 top3 경로 조회가 새로 요청하지 않고 그 결과를 기다림
+            rerank_pool = combined_candidates[:ETA_RERANK_TOP_N]
+
+            def apply_eta_matrix(eta_matrix):
+                for hospital in rerank_pool:
+                    if hospital.get("hpid") in eta_matrix:
+                        hospital["_route_eta_minutes"] = eta_matrix[hospital["hpid"]][1]
+                attach_bed_forecasts(rerank_pool)
+
+            def top3_settled(eta_matrix, pending_ids):
+                # 지금까지의 결과로 정한 상위 3곳이 모두 응답했으면 나머지 후보는 기다리지 않고 경로 조회 시작
+                apply_eta_matrix(eta_matrix)
+                return not any(h.get("hpid") in pending_ids for h in sort_records(rerank_pool)[:3])
+
+            with span("eta_matrix"):
+                eta_matrix = get_eta_matrix(
+                    lat, lon,
+                    [(h["hpid"], h["wgs84Lat"], h["wgs84Lon"]) for h in rerank_pool if h.get("wgs84Lat") and h.get("wgs84Lon")],
+                    KAKAO_KEY,
+                    settled=top3_settled
+                )
+            apply_eta_matrix(eta_matrix)
+            combined_candidates = sort_records(rerank_pool) + combined_candidates[ETA_RERANK_TOP_N:]
             
             # top3는 거리 제한 적용: 50km 이내 우선, 부족하면 최대 100km까지 확장
             top3_filtered_50km = [h for h in combined_candidates if h.get("distance_km", float('inf')) <= 50.0]
@@ -220,16 +218,18 @@ def register_hospitals_routes(app):
             fallback_sido = METRO_FALLBACK_PROVINCE.get(sido) if is_metropolitan(sido) else None
             fallback_hospitals = []
             if fallback_sido:
-                fallback_extra = PROVINCE_INCLUDE_METROS.get(fallback_sido, [])
-                fallback_raw = fetch_scope_hospitals(fallback_sido, fallback_extra, hospital_type)
-                fallback_beds = fetch_beds_for_sidos([fallback_sido] + fallback_extra)
-                fallback_profiles = enrich_records(fallback_raw, fallback_beds, is_local_region=False)
-                # 심정지 상태면 거리순 정렬만 사용
-                if is_cardiac_arrest:
-                    fallback_sorted = sort_records(fallback_profiles)
-                    fallback_hospitals.extend(fallback_sorted[:10])
-                else:
-                    fallback_hospitals.extend(prioritize_by_region(fallback_profiles, max_regions=3))
+                # 인접 도 조회 구간 (안의 scope/beds/enrich도 각 이름으로 합산됨)
+                with span("fallback"):
+                    fallback_extra = PROVINCE_INCLUDE_METROS.get(fallback_sido, [])
+                    fallback_raw = fetch_scope_hospitals(fallback_sido, fallback_extra, hospital_type)
+                    fallback_beds = fetch_beds_for_sidos([fallback_sido] + fallback_extra)
+                    fallback_profiles = enrich_records(fallback_raw, fallback_beds, is_local_region=False)
+                    # 심정지 상태면 거리순 정렬만 사용
+                    if is_cardiac_arrest:
+                        fallback_sorted = sort_records(fallback_profiles)
+                        fallback_hospitals.extend(fallback_sorted[:10])
+                    else:
+                        fallback_hospitals.extend(prioritize_by_region(fallback_profiles, max_regions=3))
 
             used_hpids = {h.get("hpid") for h in top3}
             neighbor_augmented = []
@@ -268,9 +268,10 @@ def register_hospitals_routes(app):
             ]
             
             if hospitals_with_coords:
-                with ThreadPoolExecutor(max_workers=min(5, len(hospitals_with_coords))) as executor:
+                # 카카오 길찾기 (경로 캐시 적중 시 빠름)
+                with span("routes"), new_executor(min(5, len(hospitals_with_coords))) as executor:
                     future_to_hospital = {
-                        executor.submit(get_driving_info_kakao, lat, lon, h_lat, h_lon, KAKAO_KEY): (hospital, h_lat, h_lon)
+                        executor.submit(get_driving_info_kakao, lat, lon, h_lat, h_lon, KAKAO_KEY, hospital.get("hpid")): (hospital, h_lat, h_lon)
                         for hospital, h_lat, h_lon in hospitals_with_coords
                     }
                     
@@ -283,16 +284,14 @@ def register_hospitals_routes(app):
                                 hospital["distance_km"] = real_dist
                                 hospital["eta_minutes"] = real_eta
                                 if path_coords:
-                                    route_paths[hospital.get("hpid", "")] = path_coords
+                                    route_paths[hospital.get("hpid", "")] = format_route_path(path_coords, route_format, route_tolerance_m)
                             else:
-                                if isinstance(hospital.get("distance_km"), (int, float)):
-                                    dist = hospital["distance_km"]
-                                    hospital["eta_minutes"] = int((dist * 1.3 / 40) * 60)
+                                if hospital.get("_est_eta_minutes") is not None:
+                                    hospital["eta_minutes"] = hospital["_est_eta_minutes"]
                         except Exception as e:
                             print(f"경로 정보 조회 오류 ({hospital.get('hpid', 'unknown')}): {e}")
-                            if isinstance(hospital.get("distance_km"), (int, float)):
-                                dist = hospital["distance_km"]
-                                hospital["eta_minutes"] = int((dist * 1.3 / 40) * 60)
+                            if hospital.get("_est_eta_minutes") is not None:
+                                hospital["eta_minutes"] = hospital["_est_eta_minutes"]
             
             for hospital in top3:
                 if hospital.get("distance_km", float('inf')) <= 100.0:
@@ -310,21 +309,22 @@ def register_hospitals_routes(app):
                 backup_candidates = backup_sorted[needed:]
             
             # 병원 정보를 DB에 저장
-            with app.app_context():
+            with span("db"), app.app_context():
                 for hospital in top3 + backup_candidates + neighbor_candidates:
                     hpid = hospital.get("hpid")
                     if hpid:
                         save_or_update_hospital(hospital)
             
-            result_hospitals = [serialize_hospital_payload(h) for h in top3]
-            backup_payload = [serialize_hospital_payload(h) for h in backup_candidates]
-            
-            return jsonify({
-                "hospitals": result_hospitals,
-                "route_paths": route_paths,
-                "backup_hospitals": backup_payload,
-                "neighbor_hospitals": [serialize_hospital_payload(h) for h in neighbor_candidates]
-            }), 200
+            with span("serialize"):
+                result_hospitals = [serialize_hospital_payload(h) for h in top3]
+                backup_payload = [serialize_hospital_payload(h) for h in backup_candidates]
+                response = jsonify({
+                    "hospitals": result_hospitals,
+                    "route_paths": route_paths,
+                    "backup_hospitals": backup_payload,
+                    "neighbor_hospitals": [serialize_hospital_payload(h) for h in neighbor_candidates]
+                })
+            return response, 200
             
         except Exception as e:
             import traceback
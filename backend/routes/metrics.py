@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""운영 지표 라우트 (/metrics, Prometheus 텍스트 형식) 및 요청 구간 시간 측정 훅"""
+
+import json
+import time
+from flask import request, g, Response
+
+from config import METRICS_ROUTE_PREFIXES, TRACE_ROUTE_PREFIXES
+from utils.cache import all_cache_stats
+from utils.http import get_hedge_stats
+from utils.metrics import record_route_latency, render_prometheus, render_snapshot
+from utils.tracing import start_trace, end_trace, maybe_log_slow_trace
+
+
+def _collect_cache_lines():
+    caches = all_cache_stats()
+    lines = []
+    for key, metric_type, help_text in (
+        ("hits", "counter", "In-memory cache hits"),
+        ("misses", "counter", "In-memory cache misses"),
+        ("evictions", "counter", "In-memory cache LRU evictions"),
+        ("size", "gauge", "In-memory cache entries"),
+    ):
+        name = f"cache_{key}_total" if metric_type == "counter" else f"cache_{key}"
+        lines.extend(render_snapshot(name, help_text, metric_type, ("cache",),
+                                     (((c["name"],), c[key]) for c in caches)))
+    return lines
+
+
+def _collect_hedge_lines():
+    hedges = sorted(get_hedge_stats().items())
+    lines = []
+    for key, help_text in (
+        ("hedges_fired", "Hedged duplicate upstream calls fired"),
+        ("hedges_won", "Hedged duplicate upstream calls that answered first"),
+    ):
+        lines.extend(render_snapshot(f"upstream_{key}_total", help_text, "counter", ("endpoint",),
+                                     (((endpoint,), stats[key]) for endpoint, stats in hedges)))
+    return lines
+
+
+def _wants_timings() -> bool:
+    return request.args.get("debug_timings") == "1" or request.headers.get("X-Debug-Timings") == "1"
+
+
+def _finish_trace(response) -> None:
+    """Server-Timing 헤더 추가, 요청 시 _timings 블록 추가, 느린 요청 기록"""
+    trace = end_trace()
+    if trace is None:
+        return
+    response.headers["Server-Timing"] = trace.server_timing()
+    if _wants_timings() and response.is_json:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict):
+            body["_timings"] = trace.as_dict()
+            response.set_data(json.dumps(body, ensure_ascii=False))
+    maybe_log_slow_trace(trace, request.method, request.path, response.status_code)
+
+
+def register_metrics_routes(app):
+    """운영 지표 라우트 및 API 응답 시간 기록 훅 등록"""
+
+    @app.before_request
+    def _metrics_start_timer():
+        if request.path.startswith(METRICS_ROUTE_PREFIXES):
+            g._metrics_started = time.perf_counter()
+        if request.method != 'OPTIONS' and request.path.startswith(TRACE_ROUTE_PREFIXES):
+            g._trace = start_trace(request.path)
+
+    @app.after_request
+    def _metrics_record_latency(response):
+        started = g.pop("_metrics_started", None)
+        if started is not None:
+            # 경로 변수(session_id 등)로 레이블이 늘어나지 않도록 라우트 규칙 이름 사용
+            route = request.url_rule.rule if request.url_rule is not None else request.path
+            method, status = request.method, response.status_code
+            if response.is_streamed:
+                # 스트리밍 응답(SSE 등)은 본문 전송이 끝나 응답이 닫힐 때까지를 측정
+                response.call_on_close(
+                    lambda: record_route_latency(route, method, status, time.perf_counter() - started))
+            else:
+                record_route_latency(route, method, status, time.perf_counter() - started)
+        if g.pop("_trace", None) is not None:
+            _finish_trace(response)
+        return response
+
+    @app.teardown_request
+    def _trace_teardown(exc):
+        # 처리되지 않은 예외로 after_request가 호출되지 않은 경우 Trace 정리
+        if g.pop("_trace", None) is not None:
+            end_trace()
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus 지표 조회"""
+        body = render_prometheus(_collect_cache_lines() + _collect_hedge_lines())
+        return Response(body, mimetype="text/plain; version=0.0.4; charset=utf-8")
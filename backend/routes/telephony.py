@@ -8,6 +8,7 @@ import time
 from datetime import datetime
 from models import db, RequestAssignment
 from utils.phone import normalize_phone_number, resolve_callback_base
+from utils.concurrency import run_blocking_io
 from config import (
     TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_CALLER_NUMBER,
     TWILIO_FALLBACK_TARGET
@@ -60,7 +61,7 @@ def register_telephony_routes(app, twilio_client, call_responses, active_mock_ca
                     print(f"   병원명: {hospital_name}")
                     print(f"   환자 정보: {patient_info[:100] if patient_info else '없음'}...")
                     
-                    call = twilio_client.calls.create(
+                    call = run_blocking_io(twilio_client.calls.create,
                         to=normalized_to,
                         from_=normalized_from,
                         url=voice_url,
@@ -97,7 +98,7 @@ def register_telephony_routes(app, twilio_client, call_responses, active_mock_ca
                     print(f"   전화는 발신되지만 ARS 기능은 작동하지 않을 수 있습니다.")
                     print(f"   공개 URL을 사용하려면 ngrok을 실행하고 TWILIO_CALLBACK_BASE_URL 환경변수를 설정하세요.")
                     
-                    call = twilio_client.calls.create(
+                    call = run_blocking_io(twilio_client.calls.create,
                         to=normalized_to,
                         from_=normalized_from,
                         url=voice_url,
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시군구 경계 GeoJSON → 오프라인 행정구역 인덱스 변환 스크립트
+
+입력: WGS84(경도, 위도) 좌표계의 시군구 경계 GeoJSON (Polygon / MultiPolygon)
+      예) 통계청 SGIS 또는 행정안전부 행정구역 경계 SHP를 WGS84 GeoJSON으로 변환한 파일
+출력: backend/data/sigungu_index.json, backend/data/sigungu_coords.bin, backend/data/sigungu_neighbors.json
+
+사용법:
+    python scripts/build_region_index.py sigungu.geojson --sido-field SIDO_NM --sigungu-field SIGUNGU_NM
+"""
+
+import argparse
+import json
+import struct
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.region_index import INDEX_FILE_NAME, COORDS_FILE_NAME, NEIGHBORS_FILE_NAME
+
+# 인접 판정용 정점 격자 크기 (도, 약 10m) - 서로 다른 파일에서 온 경계의 미세한 오차 허용
+NEIGHBOR_SNAP_DEG = 1e-4
+
+
+def iter_polygons(geometry):
+    """Polygon / MultiPolygon geometry에서 폴리곤(링 목록) 순회"""
+    gtype = geometry.get("type")
+    if gtype == "Polygon":
+        yield geometry["coordinates"]
+    elif gtype == "MultiPolygon":
+        for polygon in geometry["coordinates"]:
+            yield polygon
+
+
+def compute_neighbors(regions, flat):
+    """경계 정점을 격자로 스냅해 정점(또는 바로 옆 격자)을 공유하는 시군구를 인접으로 판정"""
+    keys = list(regions.keys())
+    owners = {}
+    for idx, key in enumerate(keys):
+        for start, count in regions[key]["rings"]:
+            for i in range(start, start + count):
+                cell = (round(flat[2 * i] / NEIGHBOR_SNAP_DEG), round(flat[2 * i + 1] / NEIGHBOR_SNAP_DEG))
+                owners.setdefault(cell, set()).add(idx)
+
+    adjacent = {idx: set() for idx in range(len(keys))}
+    for (cx, cy), idxs in owners.items():
+        nearby = set(idxs)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nearby |= owners.get((cx + dx, cy + dy), set())
+        for idx in idxs:
+            adjacent[idx] |= nearby - {idx}
+
+    return [
+        {"sido": keys[idx][0], "sigungu": keys[idx][1],
+         "neighbors": sorted([list(keys[n]) for n in adjacent[idx]])}
+        for idx in range(len(keys))
+    ]
+
+
+def build(geojson_path: Path, out_dir: Path, sido_field: str, sigungu_field: str) -> int:
+    with open(geojson_path, "r", encoding="utf-8") as f:
+        collection = json.load(f)
+
+    flat = []
+    regions = {}
+    for feature in collection.get("features", []):
+        props = feature.get("properties") or {}
+        sido = props.get(sido_field)
+        sigungu = props.get(sigungu_field)
+        geometry = feature.get("geometry")
+        if not sido or not sigungu or not geometry:
+            continue
+        # 같은 시군구가 여러 feature로 나뉜 경우 하나로 합침
+        region = regions.setdefault((sido, sigungu), {"sido": sido, "sigungu": sigungu, "rings": [], "bbox": None})
+        for polygon in iter_polygons(geometry):
+            for ring in polygon:
+                if len(ring) < 3:
+                    continue
+                # 닫힌 링으로 정규화 (마지막 정점 = 첫 정점)
+                if ring[0] != ring[-1]:
+                    ring = ring + [ring[0]]
+                start = len(flat) // 2
+                for x, y in (pt[:2] for pt in ring):
+                    flat.extend((float(x), float(y)))
+                region["rings"].append([start, len(ring)])
+                xs = [pt[0] for pt in ring]
+                ys = [pt[1] for pt in ring]
+                box = [min(xs), min(ys), max(xs), max(ys)]
+                old = region["bbox"]
+                region["bbox"] = box if old is None else [
+                    min(old[0], box[0]), min(old[1], box[1]), max(old[2], box[2]), max(old[3], box[3])
+                ]
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / COORDS_FILE_NAME, "wb") as f:
+        f.write(struct.pack(f"<{len(flat)}d", *flat))
+    with open(out_dir / INDEX_FILE_NAME, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "regions": list(regions.values())}, f, ensure_ascii=False)
+    with open(out_dir / NEIGHBORS_FILE_NAME, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "regions": compute_neighbors(regions, flat)}, f, ensure_ascii=False)
+    return len(regions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시군구 경계 GeoJSON으로 오프라인 행정구역 인덱스 생성")
+    parser.add_argument("geojson", type=Path, help="WGS84 시군구 경계 GeoJSON 파일")
+    parser.add_argument("--sido-field", default="sido", help="시도명 속성 이름")
+    parser.add_argument("--sigungu-field", default="sigungu", help="시군구명 속성 이름")
+    parser.add_argument("--out-dir", type=Path, default=backend_dir / "data", help="출력 디렉토리")
+    args = parser.parse_args()
+
+    count = build(args.geojson, args.out_dir, args.sido_field, args.sigungu_field)
+    print(f"✅ 행정구역 {count}개 인덱스 생성 완료: {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
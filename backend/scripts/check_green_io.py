@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+eventlet 환경에서 느린 외부 API 호출이 허브(채팅 처리)를 막지 않는지 확인하는 스크립트
+
+app.py와 동일하게 모듈을 import한 뒤 eventlet.monkey_patch(socket=False)를 적용하고,
+- 응답에 SLOW_SEC초가 걸리는 로컬 HTTP 서버(별도 프로세스)를 띄워 data.go.kr 주소로 사용하고
+- 그린스레드 여러 개에서 utils.http.http_get으로 동시에 호출하는 동안 (일부는 헤지 요청)
+- 병원 캐시 예열(services.prefetch)도 함께 실행하며
+- 채팅 메시지 처리를 흉내 내는 그린스레드가 20ms마다 실행될 때의 지연을 측정합니다.
+서버 주소는 IP가 아닌 호스트 이름(localhost)으로 호출하여 DNS 캐시 해석 경로도 함께 확인합니다.
+
+OUTBOUND_IO_MODE=auto(tpool 위임)와 direct(위임 안 함)를 각각 별도 프로세스로 실행해 비교하며,
+auto 모드의 최대 지연이 기준(200ms)을 넘거나 헤지/예열/DNS 해석이 실행되지 않았으면 종료 코드 1을 반환합니다.
+
+사용법:
+    python scripts/check_green_io.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+
+SLOW_SEC = 1.5
+CONCURRENT_CALLS = 10
+HEDGED_CALLS = 3
+TICK_SEC = 0.02
+MAX_LAG_MS = 200.0
+PREFETCH_SIDO = "서울특별시"
+PREFETCH_WAIT_SEC = 60.0
+
+
+def run_slow_server():
+    # monkey patch되지 않은 별도 프로세스에서 실행 (요청마다 실제 OS 스레드)
+    import http.server
+    import time
+
+    class SlowHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(SLOW_SEC)
+            body = b"<response><item><hpid>A0000001</hpid></item></response>"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    print(server.server_port, flush=True)
+    server.serve_forever()
+
+
+def run_worker():
+    server = subprocess.Popen([sys.executable, __file__, "--server"], stdout=subprocess.PIPE, text=True)
+    port = int(server.stdout.readline())
+    url = f"http://localhost:{port}/slow"
+
+    # 로컬 서버만 호출하므로 설정 파일의 필수 키는 임시 값으로 채우고, 저장된 캐시는 쓰지 않음 (예열이 실제로 호출하도록)
+    for key in ("KAKAO_REST_API_KEY", "DATA_GO_KR_SERVICE_KEY", "OPENAI_API_KEY"):
+        os.environ.setdefault(key, "local-check")
+    state_dir = tempfile.mkdtemp(prefix="check_green_io_")
+    os.environ.update({
+        "DATA_GO_KR_BASE_URL": f"http://localhost:{port}",
+        "CACHE_SNAPSHOT_DIR": state_dir,
+        "BED_HISTORY_PATH": os.path.join(state_dir, "bed_history.npz"),
+        "REVERSE_GEOCODE_CACHE_PATH": os.path.join(state_dir, "reverse_geocode.pkl"),
+        # 헤지 요청이 첫 호출부터 발생하도록 표본 수와 예산 조건을 낮춤
+        "HTTP_HEDGE_MIN_SAMPLES": "1",
+        "HTTP_HEDGE_BUDGET_RATIO": "1",
+    })
+    sys.path.insert(0, str(backend_dir))
+
+    # app.py처럼 모듈 import 후 서버 시작 직전에 monkey patch
+    from utils.http import http_get, get_dns_stats, get_hedge_stats
+    from utils.hedge import HEDGE_POLICY
+    from utils.metrics import endpoint_label
+    from utils.concurrency import get_io_mode
+    from services.prefetch import schedule_prefetch, get_prefetch_stats
+
+    import eventlet
+    eventlet.monkey_patch(socket=False)
+    real_time = eventlet.patcher.original("time")
+
+    lags = []
+    stop = [False]
+
+    def chat_ticker():
+        # 채팅 메시지 처리 그린스레드: 예정 시각 대비 실제 실행 지연 측정
+        while not stop[0]:
+            expected = real_time.perf_counter() + TICK_SEC
+            eventlet.sleep(TICK_SEC)
+            lags.append(max(0.0, real_time.perf_counter() - expected) * 1000)
+
+    # 헤지 대기 시간(p90)을 짧게 만들어 느린 응답마다 헤지가 발생하게 함
+    HEDGE_POLICY.record_latency(endpoint_label(url), HEDGE_POLICY.min_delay_ms)
+
+    ticker = eventlet.spawn(chat_ticker)
+    eventlet.sleep(0.1)
+    started = real_time.perf_counter()
+    prefetch_scheduled = schedule_prefetch(PREFETCH_SIDO, reason="check")
+    pool = eventlet.GreenPool(CONCURRENT_CALLS)
+    for _ in pool.imap(lambda i: http_get(url, {}, max_retries=1, hedge=i < HEDGED_CALLS), range(CONCURRENT_CALLS)):
+        pass
+    elapsed = real_time.perf_counter() - started
+    while get_prefetch_stats()["inflight"] and real_time.perf_counter() - started < PREFETCH_WAIT_SEC:
+        eventlet.sleep(0.1)
+    prefetch_elapsed = real_time.perf_counter() - started
+    stop[0] = True
+    ticker.wait()
+    server.terminate()
+
+    lags.sort()
+    hedge_stats = get_hedge_stats().get(endpoint_label(url), {})
+    dns_stats = get_dns_stats().get("localhost", {})
+    print(json.dumps({
+        "io_mode": get_io_mode(),
+        "upstream_elapsed_sec": round(elapsed, 2),
+        "prefetch_scheduled": prefetch_scheduled,
+        "prefetch_done": not get_prefetch_stats()["inflight"],
+        "prefetch_elapsed_sec": round(prefetch_elapsed, 2),
+        "hedges_fired": hedge_stats.get("hedges_fired", 0),
+        "dns_resolutions": dns_stats.get("resolutions", 0),
+        "ticks": len(lags),
+        "lag_p50_ms": round(lags[len(lags) // 2], 1) if lags else None,
+        "lag_max_ms": round(lags[-1], 1) if lags else None,
+    }, ensure_ascii=False))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--server":
+        run_slow_server()
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        run_worker()
+        return
+
+    results = {}
+    for mode in ("auto", "direct"):
+        env = dict(os.environ, OUTBOUND_IO_MODE=mode)
+        out = subprocess.run([sys.executable, __file__, "--worker"], env=env,
+                             capture_output=True, text=True, timeout=120)
+        line = out.stdout.strip().splitlines()[-1] if out.stdout.strip() else "{}"
+        results[mode] = json.loads(line)
+        print(f"[{mode}] {results[mode]}")
+        if out.returncode != 0:
+            print(out.stderr)
+
+    auto = results.get("auto", {})
+    lag = auto.get("lag_max_ms")
+    if not (auto.get("prefetch_done") and auto.get("hedges_fired") and auto.get("dns_resolutions")):
+        print(f"❌ 헤지 요청·캐시 예열·DNS 해석 중 실행되지 않은 경로가 있습니다: {auto}")
+        sys.exit(1)
+    if lag is None or lag > MAX_LAG_MS:
+        print(f"❌ 느린 외부 호출 중 채팅 지연이 {MAX_LAG_MS}ms를 초과했습니다: {lag}ms")
+        sys.exit(1)
+    print(f"✅ 느린 외부 호출·헤지 요청·캐시 예열 중에도 채팅 지연이 일정하게 유지됩니다 (최대 {lag}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 ETA 룩업 테이블 학습 스크립트
+
+카카오 길찾기 기록(ETA_SAMPLE_LOG_PATH, JSON Lines)으로
+(지역 셀, 직선거리 구간, 요일·시간대)별 직선거리 1km당 소요 시간(분)의 중앙값을 계산하여
+ETA_MODEL_PATH(.npz)로 저장합니다.
+
+칸별 표본이 부족하면 다음 순서로 채웁니다.
+  지역·거리·시간대 → 지역·거리(전체 시간대) → 전역·거리·시간대 → 전역·거리 → 기존 고정식
+
+사용법:
+    python scripts/train_eta_model.py [--samples PATH] [--out PATH] [--min-samples 5]
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from config import ETA_MODEL_PATH, ETA_SAMPLE_LOG_PATH
+from utils.eta_model import DIST_EDGES, HOURS_PER_WEEK, DEFAULT_MIN_PER_KM, region_cell
+
+
+def load_samples(path: Path):
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            straight = row.get("straight_km") or 0
+            duration = row.get("duration_min")
+            # 너무 가까운 구간은 1km당 시간이 발산하므로 제외
+            if straight < 0.3 or duration is None or duration <= 0:
+                continue
+            samples.append(row)
+    return samples
+
+
+def train(samples, min_samples: int):
+    n_dist = len(DIST_EDGES)
+    edges = np.asarray(DIST_EDGES)
+    cell_ids = {}
+    groups = defaultdict(list)
+    for row in samples:
+        cell = region_cell(row["o_lat"], row["o_lon"])
+        r = cell_ids.setdefault(cell, len(cell_ids) + 1)
+        d = int(np.clip(np.searchsorted(edges, row["straight_km"], side="right") - 1, 0, n_dist - 1))
+        h = int(row["how"]) % HOURS_PER_WEEK
+        ratio = row["duration_min"] / row["straight_km"]
+        for key in ((r, d, h), (r, d, None), (0, d, h), (0, d, None)):
+            groups[key].append(ratio)
+
+    def median(key):
+        values = groups.get(key)
+        return float(np.median(values)) if values and len(values) >= min_samples else None
+
+    table = np.full((len(cell_ids) + 1, n_dist, HOURS_PER_WEEK), DEFAULT_MIN_PER_KM, dtype=np.float32)
+    for r in range(len(cell_ids) + 1):
+        for d in range(n_dist):
+            region_all = median((r, d, None))
+            global_all = median((0, d, None))
+            for h in range(HOURS_PER_WEEK):
+                for value in (median((r, d, h)), region_all, median((0, d, h)), global_all):
+                    if value is not None:
+                        table[r, d, h] = value
+                        break
+    cells = np.array(sorted(cell_ids, key=cell_ids.get), dtype=np.int32).reshape(-1, 2)
+    return table, cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카카오 길찾기 기록으로 로컬 ETA 룩업 테이블 학습")
+    parser.add_argument("--samples", type=Path, default=ETA_SAMPLE_LOG_PATH or None, required=not ETA_SAMPLE_LOG_PATH,
+                        help="학습 기록(JSON Lines, 기본: ETA_SAMPLE_LOG_PATH)")
+    parser.add_argument("--out", type=Path, default=ETA_MODEL_PATH, help="출력 모델 파일(.npz)")
+    parser.add_argument("--min-samples", type=int, default=5, help="칸별 최소 표본 수")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples)
+    if not samples:
+        print(f"❌ 학습 기록이 없습니다: {args.samples}")
+        sys.exit(1)
+    table, cells = train(samples, args.min_samples)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(args.out, table=table, cells=cells)
+    print(f"✅ 표본 {len(samples)}개, 지역 셀 {len(cells)}개로 ETA 모델 저장: {args.out} ({args.out.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
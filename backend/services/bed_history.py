@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""병상 이력 저장소 및 단기 가용 병상 예측
+
+hpid·항목(hvec, hvicc 등)별로 고정 크기 링 버퍼(numpy 배열)에 병상 값 변경 시각과 값을 기록한다.
+병상 스냅샷이 실제로 바뀔 때(services/hospital_service.py 리스너) 값이 달라진 병원만 기록하며,
+캐시 스냅샷 주기(utils/cache_snapshot.py, 요청 경로 밖)와 종료 시 파일에 저장하여 재시작 후에도 추세를 이어서 사용한다.
+
+예측: 값은 다음 변경 전까지 유지되는 계단 함수로 보고, 최근 BED_FORECAST_WINDOW_MIN분을
+일정 간격으로 샘플링해 선형 추세를 구한 뒤 구급차 도착 예정 시간(ETA)만큼 연장한다.
+numpy가 없으면 기록/예측을 하지 않는다(예측값 None).
+"""
+
+import atexit
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    BED_HISTORY_CAPACITY, BED_HISTORY_PATH, BED_HISTORY_SAVE_INTERVAL_SEC, BED_FORECAST_WINDOW_MIN
+)
+from services.hospital_service import add_bed_snapshot_listener
+from utils.cache_snapshot import register_snapshot_saver
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 기록 대상 항목 (숫자형 병상 수)
+BED_HISTORY_FIELDS = ("hvec", "hvoc", "hvicc", "hvgc", "hvcc", "hvncc", "hvccc")
+# 추세 계산 시 관찰 구간 샘플 수
+_FORECAST_GRID_POINTS = 13
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class BedHistory:
+    """hpid별 링 버퍼 (times: [병원, 용량], values: [병원, 항목, 용량])"""
+
+    def __init__(self, fields: Tuple[str, ...] = BED_HISTORY_FIELDS, capacity: int = BED_HISTORY_CAPACITY):
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._field_index = {field: i for i, field in enumerate(self.fields)}
+        self._index: Dict[str, int] = {}
+        self._times = np.zeros((0, capacity), dtype=np.float64)
+        self._values = np.zeros((0, len(self.fields), capacity), dtype=np.float32)
+        self._head = np.zeros(0, dtype=np.int32)
+        self._count = np.zeros(0, dtype=np.int32)
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _row(self, hpid: str) -> int:
+        row = self._index.get(hpid)
+        if row is not None:
+            return row
+        row = len(self._index)
+        if row >= self._times.shape[0]:
+            # 병원 수가 늘면 배열을 두 배로 확장
+            grow = max(64, self._times.shape[0])
+            self._times = np.concatenate([self._times, np.zeros((grow, self.capacity), dtype=np.float64)])
+            self._values = np.concatenate(
+                [self._values, np.zeros((grow, len(self.fields), self.capacity), dtype=np.float32)])
+            self._head = np.concatenate([self._head, np.zeros(grow, dtype=np.int32)])
+            self._count = np.concatenate([self._count, np.zeros(grow, dtype=np.int32)])
+        self._index[hpid] = row
+        return row
+
+    def record(self, beds: Dict[str, Dict[str, Any]], ts: Optional[float] = None) -> int:
+        """병상 스냅샷 기록 (직전 기록과 값이 같은 병원은 건너뜀) - 기록한 병원 수 반환"""
+        ts = time.time() if ts is None else ts
+        recorded = 0
+        with self._lock:
+            for hpid, bed in beds.items():
+                values = np.array([_to_float(bed.get(field)) for field in self.fields], dtype=np.float32)
+                row = self._row(hpid)
+                count = self._count[row]
+                if count:
+                    last = (self._head[row] - 1) % self.capacity
+                    if np.array_equal(self._values[row, :, last], values, equal_nan=True):
+                        continue
+                head = self._head[row]
+                self._times[row, head] = ts
+                self._values[row, :, head] = values
+                self._head[row] = (head + 1) % self.capacity
+                self._count[row] = min(count + 1, self.capacity)
+                recorded += 1
+            if recorded:
+                self._dirty = True
+        return recorded
+
+    def series(self, hpid: str, field: str) -> Tuple[Any, Any]:
+        """시간순 (times, values) 배열 (기록이 없으면 빈 배열)"""
+        with self._lock:
+            row = self._index.get(hpid)
+            if row is None or not self._count[row]:
+                return np.zeros(0), np.zeros(0, dtype=np.float32)
+            count, head = int(self._count[row]), int(self._head[row])
+            order = (np.arange(head - count, head) % self.capacity)
+            return self._times[row, order].copy(), self._values[row, self._field_index[field], order].copy()
+
+    def forecast(self, hpid: str, field: str, horizon_min: float,
+                 now: Optional[float] = None, window_min: float = BED_FORECAST_WINDOW_MIN) -> Optional[Tuple[float, float]]:
+        """horizon_min분 뒤 예상 값과 시간당 추세 (기록이 없으면 None)"""
+        times, values = self.series(hpid, field)
+        if not len(times) or math.isnan(values[-1]):
+            return None
+        now = time.time() if now is None else now
+        current = float(values[-1])
+
+        # 계단 함수로 보고 관찰 구간을 일정 간격으로 샘플링
+        grid = now - window_min * 60 + np.linspace(0.0, window_min * 60, _FORECAST_GRID_POINTS)
+        idx = np.searchsorted(times, grid, side="right") - 1
+        valid = idx >= 0
+        if valid.sum() < 2:
+            return current, 0.0
+        x = (grid[valid] - now) / 60.0
+        y = values[idx[valid]].astype(np.float64)
+        keep = ~np.isnan(y)
+        x, y = x[keep], y[keep]
+        if len(x) < 2 or np.ptp(x) == 0:
+            return current, 0.0
+        slope = float(np.sum((x - x.mean()) * (y - y.mean())) / np.sum((x - x.mean()) ** 2))
+        # 관찰 구간보다 먼 미래로는 연장하지 않고, 현재 값이 0 이상이면 음수로 예측하지 않음
+        predicted = current + slope * min(max(horizon_min, 0.0), window_min)
+        predicted = max(predicted, min(current, 0.0))
+        return predicted, slope * 60.0
+
+    def dump(self, path: Path) -> None:
+        """링 버퍼를 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            n = len(self._index)
+            hpids = np.array(sorted(self._index, key=self._index.get), dtype=object)
+            data = {
+                "fields": np.array(self.fields),
+                "hpids": hpids.astype(str),
+                "times": self._times[:n].copy(),
+                "values": self._values[:n].copy(),
+                "head": self._head[:n].copy(),
+                "count": self._count[:n].copy(),
+            }
+            self._dirty = False
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez_compressed(tmp, **data)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BedHistory":
+        """파일에서 복원 (항목 구성이나 용량이 다르면 빈 저장소)"""
+        history = cls()
+        path = Path(path)
+        if not path.exists():
+            return history
+        with np.load(path, allow_pickle=False) as data:
+            if tuple(data["fields"]) != history.fields or data["times"].shape[1] != history.capacity:
+                print(f"병상 이력 파일 형식이 현재 설정과 달라 무시합니다: {path}")
+                return history
+            n = len(data["hpids"])
+            history._index = {str(hpid): i for i, hpid in enumerate(data["hpids"])}
+            history._times = data["times"]
+            history._values = data["values"]
+            history._head = data["head"]
+            history._count = data["count"]
+        print(f"병상 이력 복원: {n}개 병원")
+        return history
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+
+BED_HISTORY: Optional[BedHistory] = None
+_last_saved = time.time()
+_save_lock = threading.Lock()
+
+
+def _save_bed_history(force: bool = False) -> None:
+    """바뀐 병상 이력을 파일로 저장 (force=False면 BED_HISTORY_SAVE_INTERVAL_SEC가 지났을 때만)"""
+    global _last_saved
+    if BED_HISTORY is None or not BED_HISTORY.dirty:
+        return
+    if not force and time.time() - _last_saved < BED_HISTORY_SAVE_INTERVAL_SEC:
+        return
+    with _save_lock:
+        try:
+            BED_HISTORY.dump(BED_HISTORY_PATH)
+        except Exception as e:
+            print(f"병상 이력 저장 오류: {e}")
+        _last_saved = time.time()
+
+
+def _record_snapshot(key, previous: Optional[Dict[str, Any]], snapshot: Dict[str, Any]) -> None:
+    """병상 스냅샷 변경 리스너 (기록만 하고 파일 저장은 캐시 스냅샷 주기에서)"""
+    BED_HISTORY.record(snapshot["beds"], snapshot["changed_at"])
+
+
+def forecast_beds(hpid: str, field: str, horizon_min: float) -> Optional[Tuple[float, float]]:
+    """horizon_min분 뒤 예상 병상 수와 시간당 추세 (이력이 없거나 numpy가 없으면 None)"""
+    if BED_HISTORY is None:
+        return None
+    return BED_HISTORY.forecast(hpid, field, horizon_min)
+
+
+def attach_bed_forecasts(records: List[Dict[str, Any]], field: str = "hvec") -> None:
+    """이동 시간(ETA) 기준 도착 시점 예상 병상 수를 _{field}_at_eta, 시간당 추세를 _{field}_trend_per_hour에 저장"""
+    for hospital in records:
+        eta = hospital.get("_route_eta_minutes")
+        if eta is None:
+            eta = hospital.get("_est_eta_minutes")
+        result = forecast_beds(hospital.get("hpid"), field, eta) if eta is not None and math.isfinite(eta) else None
+        if result is None:
+            hospital.pop(f"_{field}_at_eta", None)
+            hospital.pop(f"_{field}_trend_per_hour", None)
+            continue
+        hospital[f"_{field}_at_eta"] = round(result[0], 2)
+        hospital[f"_{field}_trend_per_hour"] = round(result[1], 2)
+
+
+if np is not None:
+    try:
+        BED_HISTORY = BedHistory.load(BED_HISTORY_PATH)
+    except Exception as e:
+        print(f"병상 이력 복원 오류: {e}")
+        BED_HISTORY = BedHistory()
+    add_bed_snapshot_listener(_record_snapshot)
+    register_snapshot_saver("bed_history", _save_bed_history)
+    atexit.register(_save_bed_history, True)
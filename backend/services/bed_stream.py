@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""실시간 병상 변경 스트림
+
+연속된 병상 스냅샷을 hpid 단위로 비교해 바뀐 필드만 담은 변경 이벤트를 만들고,
+Socket.IO "beds:{시도}" 방 구독자에게 전송한다.
+구독자가 있는 시도는 백그라운드 작업이 주기적으로 조회하므로 클라이언트는 top3를 다시 호출하지 않아도 된다.
+
+이벤트:
+- bed_snapshot: 구독 직후 현재 전체 상태 {sido, version, beds: {hpid: {필드: 값}}}
+- bed_delta   : 변경분 {sido, version, changes: [{hpid, op: add|update|remove, fields}]}
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from config import DATA_GO_KR_KEY, BED_STREAM_POLL_SEC
+from services.hospital_service import (
+    add_bed_snapshot_listener, fetch_er_beds, refresh_er_beds, get_bed_snapshot
+)
+
+# 비교/전송 대상 필드 (hvidate는 값이 같아도 매번 바뀌므로 변경 판단에서 제외하고 함께 전달만 함)
+BED_DIFF_FIELDS = (
+    "hvec", "hvoc", "hvicc", "hvgc", "hvcc", "hvncc", "hvccc",
+    "hvctayn", "hvmriayn", "hvangioayn", "hvventiayn",
+    "hv1", "hv2", "hv3", "hv4", "hv5", "hv6", "hv7", "hv8", "hv9", "hv10", "hv11", "hv12",
+)
+
+BED_ROOM_PREFIX = "beds:"
+# fetch_beds_for_sidos와 같은 조회 단위 (시도 전체, 500건)
+_STREAM_ROWS = 500
+
+
+def bed_room(sido: str) -> str:
+    return f"{BED_ROOM_PREFIX}{sido}"
+
+
+def _compact(bed: Dict[str, Any]) -> Dict[str, Any]:
+    fields = {key: bed.get(key) for key in BED_DIFF_FIELDS if bed.get(key) is not None}
+    if bed.get("hvidate"):
+        fields["hvidate"] = bed["hvidate"]
+    return fields
+
+
+def diff_bed_snapshots(previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """두 병상 스냅샷({hpid: 병상 정보})의 변경분 (바뀐 필드만 포함)"""
+    changes = []
+    for hpid, bed in current.items():
+        old = previous.get(hpid)
+        if old is None:
+            changes.append({"hpid": hpid, "op": "add", "fields": _compact(bed)})
+            continue
+        if old is bed:
+            continue
+        fields = {key: bed.get(key) for key in BED_DIFF_FIELDS if bed.get(key) != old.get(key)}
+        if fields:
+            if bed.get("hvidate"):
+                fields["hvidate"] = bed["hvidate"]
+            changes.append({"hpid": hpid, "op": "update", "fields": fields})
+    for hpid in previous:
+        if hpid not in current:
+            changes.append({"hpid": hpid, "op": "remove"})
+    return changes
+
+
+class BedStream:
+    """병상 스냅샷 변경을 Socket.IO 방으로 전송하고, 구독 중인 시도를 주기적으로 조회"""
+
+    def __init__(self, socketio, poll_sec: float = BED_STREAM_POLL_SEC):
+        self.socketio = socketio
+        self.poll_sec = poll_sec
+        self._sidos: set = set()
+        self._lock = threading.Lock()
+        self._poller_started = False
+        add_bed_snapshot_listener(self._on_snapshot_changed)
+
+    def _has_subscribers(self, sido: str) -> bool:
+        try:
+            return next(self.socketio.server.manager.get_participants("/", bed_room(sido)), None) is not None
+        except (AttributeError, KeyError):
+            return False
+
+    def _on_snapshot_changed(self, key, previous: Optional[Dict[str, Any]], snapshot: Dict[str, Any]) -> None:
+        sido, sigungu, rows = key
+        # 시도 전체 조회 결과만 전송 (시군구 단위 조회는 시도 스냅샷의 일부)
+        if sigungu or rows != _STREAM_ROWS or previous is None:
+            return
+        if sido not in self._sidos or not self._has_subscribers(sido):
+            return
+        changes = diff_bed_snapshots(previous["beds"], snapshot["beds"])
+        if not changes:
+            return
+        self.socketio.emit("bed_delta", {
+            "sido": sido,
+            "version": snapshot["version"],
+            "changes": changes,
+            "ts": int(snapshot["changed_at"]),
+        }, room=bed_room(sido))
+
+    def subscribe(self, sido: str) -> Dict[str, Any]:
+        """구독 시작 (현재 전체 상태 반환, 없으면 조회 후 반환)"""
+        with self._lock:
+            self._sidos.add(sido)
+            start_poller = not self._poller_started
+            self._poller_started = True
+        if start_poller:
+            self.socketio.start_background_task(self._poll_loop)
+
+        snapshot = get_bed_snapshot(sido, None, _STREAM_ROWS)
+        if snapshot is None:
+            fetch_er_beds(sido, None, DATA_GO_KR_KEY, rows=_STREAM_ROWS)
+            snapshot = get_bed_snapshot(sido, None, _STREAM_ROWS)
+        if snapshot is None:
+            return {"sido": sido, "version": 0, "beds": {}}
+        return {
+            "sido": sido,
+            "version": snapshot["version"],
+            "beds": {hpid: _compact(bed) for hpid, bed in snapshot["beds"].items()},
+        }
+
+    def _poll_loop(self) -> None:
+        while True:
+            self.socketio.sleep(self.poll_sec)
+            with self._lock:
+                sidos = list(self._sidos)
+            for sido in sidos:
+                if not self._has_subscribers(sido):
+                    with self._lock:
+                        self._sidos.discard(sido)
+                    continue
+                try:
+                    # 내용이 바뀌었으면 _on_snapshot_changed가 구독자에게 전송 (같은 응답이면 파싱도 생략)
+                    refresh_er_beds(sido, None, DATA_GO_KR_KEY, rows=_STREAM_ROWS)
+                except Exception as e:
+                    print(f"병상 스트림 조회 오류 ({sido}): {e}")
@@ -2,18 +2,51 @@
 # -*- coding: utf-8 -*-
 """병원 관련 비즈니스 로직 서비스"""
 
-from typing import Optional, Tuple, Dict, Any, List, Iterable
+import hashlib
+import threading
+import time
+from typing import Optional, Tuple, Dict, Any, List, Iterable, Callable
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from xml.etree import ElementTree as ET
 
 from config import (
     DATA_GO_KR_KEY, ER_BED_URL, EGET_BASE_URL, EGET_LIST_URL, STRM_LIST_URL,
-    METRO_FALLBACK_PROVINCE, PROVINCE_INCLUDE_METROS, SYMPTOM_RULES
+    METRO_FALLBACK_PROVINCE, PROVINCE_INCLUDE_METROS, SYMPTOM_RULES,
+    BASEINFO_CACHE_TTL_SEC, BASEINFO_CACHE_MAXSIZE, BED_CACHE_TTL_SEC,
+    SCOPE_NEIGHBOR_DEPTH, SCOPE_MIN_CANDIDATES, SCOPE_QUALIFY_RADIUS_KM
 )
 from models import db, Hospital
+from utils.cache import TTLCache
+from utils.cache_snapshot import register_cache_snapshot
+from utils.concurrency import new_executor
 from utils.http import http_get, safe_int
 from utils.geo import calculate_distance, guess_region_from_address
+from utils.region_index import get_sigungu_neighbors
+from utils.eta_model import estimate_eta_minutes_batch
+from utils.metrics import Counter, endpoint_label, record_upstream_cache, register_metric
+from utils.tracing import span, traced
+
+# 병원 기본정보 캐시 (hpid 단위, 재시작 후에도 파일에서 복원)
+BASEINFO_CACHE = TTLCache("hospital_baseinfo", maxsize=BASEINFO_CACHE_MAXSIZE, ttl=BASEINFO_CACHE_TTL_SEC)
+register_cache_snapshot(BASEINFO_CACHE)
+# 지역별 등급 목록 캐시 ((API URL, 시도) 단위, 기본정보와 같이 거의 바뀌지 않음)
+GRADE_CACHE = TTLCache("hospital_grade_list", maxsize=128, ttl=BASEINFO_CACHE_TTL_SEC)
+register_cache_snapshot(GRADE_CACHE)
+# 실시간 병상 정보 캐시 ((시도, 시군구, 조회 개수) 단위)
+BED_CACHE = TTLCache("er_beds", maxsize=64, ttl=BED_CACHE_TTL_SEC)
+
+# 마지막으로 파싱한 병상 응답 ((시도, 시군구, 조회 개수) 단위)
+# 응답 본문 해시가 같으면 XML을 다시 파싱하지 않고 이전 결과를 그대로(같은 객체) 재사용하며,
+# version은 내용이 실제로 바뀐 경우에만 증가
+_BED_SNAPSHOTS: Dict[Tuple[str, Optional[str], int], Dict[str, Any]] = {}
+_bed_snapshot_lock = threading.Lock()
+SCOPE_PLANS = register_metric(Counter(
+    "hospital_scope_plans_total", "Hospital list scope used per request (sigungu ring or whole sido)", ("scope",)))
+BED_PAYLOADS = register_metric(Counter(
+    "er_bed_payloads_total", "ER bed API payloads by change detection result", ("result",)))
+# 병상 스냅샷 변경 시 호출할 함수 목록 (services/bed_stream.py 등)
+_bed_snapshot_listeners: List[Callable[[Tuple[str, Optional[str], int], Optional[Dict[str, Any]], Dict[str, Any]], None]] = []
 
 
 def evaluate_requirements(hospital_data: Dict[str, Any], rule: Dict[str, Any]) -> Tuple[float, bool]:
@@ -45,27 +78,58 @@ def evaluate_requirements(hospital_data: Dict[str, Any], rule: Dict[str, Any]) -
 
 def _fetch_grade_info_for_region(region: str, hpids_to_find: set, url: str, service_key: str) -> Dict[str, Dict[str, Any]]:
     """특정 지역의 등급 정보 조회 (내부 헬퍼 함수) - 스레드 안전"""
-    grade_info = {}
+    region_grades = fetch_region_grade_list(region, url, service_key)
+    return {hpid: info for hpid, info in region_grades.items() if hpid in hpids_to_find}
+
+
+def fetch_region_grade_list(region: str, url: str, service_key: str) -> Dict[str, Dict[str, Any]]:
+    """지역 전체 등급 목록 {hpid: {dutyEmcls, dutyEmclsName}} (캐시 우선, 조회 실패·빈 결과는 캐시하지 않음)"""
+    cache_key = (url, region)
+    cached = GRADE_CACHE.get(cache_key)
+    record_upstream_cache(endpoint_label(url), cached is not None)
+    if cached is not None:
+        return cached
     try:
         r = http_get(url, {"STAGE1": region, "pageNo": 1, "numOfRows": 500, "serviceKey": service_key})
-        root = ET.fromstring(r.content)
-        for it in root.findall(".//item"):
-            hpid_elem = it.find("hpid")
-            if hpid_elem is not None and hpid_elem.text in hpids_to_find:
-                hpid = hpid_elem.text.strip()
-                def g(tag):
-                    el = it.find(tag)
-                    return el.text.strip() if el is not None and el.text is not None else None
-                
-                grade_info[hpid] = {
-                    "dutyEmcls": g("dutyEmcls"),
-                    "dutyEmclsName": g("dutyEmclsName")
-                }
+        grade_info = parse_grade_list_xml(r.content)
     except Exception as e:
-        pass
+        print(f"등급 목록 조회 실패 ({region}): {e}")
+        return {}
+    # 빈 목록은 캐시하지 않음 (일시적 오류일 수 있으므로 6시간 동안 등급 없이 추천하지 않도록 다음 요청에서 다시 조회)
+    if grade_info:
+        GRADE_CACHE.set(cache_key, grade_info)
+    return grade_info
+
+
+def _check_result_code(root: ET.Element) -> None:
+    """data.go.kr 오류 응답(HTTP 200 + 오류 코드: 트래픽 초과, 인증키 오류 등)이면 ValueError"""
+    code = root.findtext(".//resultCode") or root.findtext(".//returnReasonCode")
+    if code is not None and code.strip() not in ("00", "0"):
+        msg = root.findtext(".//resultMsg") or root.findtext(".//returnAuthMsg") or root.findtext(".//errMsg") or ""
+        raise ValueError(f"data.go.kr 오류 응답 {code.strip()}: {msg.strip()}")
+
+
+def parse_grade_list_xml(content: bytes) -> Dict[str, Dict[str, Any]]:
+    """응급의료기관/외상센터 목록 API 응답(XML) → {hpid: {dutyEmcls, dutyEmclsName}} (오류 응답이면 ValueError)"""
+    root = ET.fromstring(content)
+    _check_result_code(root)
+    grade_info = {}
+    for it in root.findall(".//item"):
+        hpid_elem = it.find("hpid")
+        if hpid_elem is not None and hpid_elem.text:
+            hpid = hpid_elem.text.strip()
+            def g(tag):
+                el = it.find(tag)
+                return el.text.strip() if el is not None and el.text is not None else None
+
+            grade_info[hpid] = {
+                "dutyEmcls": g("dutyEmcls"),
+                "dutyEmclsName": g("dutyEmclsName")
+            }
     return grade_info
 
 
+@traced("grades")
 def fetch_hospital_grade_info(hpids: List[str], service_key: str, target_regions: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
     """병원 등급 정보 조회 (getEgytListInfoInqire + getStrmListInfoInqire) - 병렬 처리로 최적화"""
     if not hpids:
@@ -82,7 +146,7 @@ def fetch_hospital_grade_info(hpids: List[str], service_key: str, target_regions
     # 1. getEgytListInfoInqire로 일반 응급의료기관 등급 정보 조회 (병렬 처리)
     remaining_hpids = hpid_set.copy()
     if remaining_hpids:
-        with ThreadPoolExecutor(max_workers=10) as executor:
+        with new_executor(10) as executor:
             futures = [
                 executor.submit(_fetch_grade_info_for_region, region, remaining_hpids, EGET_LIST_URL, service_key)
                 for region in target_regions
@@ -102,7 +166,7 @@ def fetch_hospital_grade_info(hpids: List[str], service_key: str, target_regions
     # 2. getStrmListInfoInqire로 권역외상센터 정보 조회 (권역외상센터는 우선 적용, 병렬 처리)
     remaining_hpids = hpid_set - set(grade_info.keys())
     if remaining_hpids:
-        with ThreadPoolExecutor(max_workers=10) as executor:
+        with new_executor(10) as executor:
             futures = [
                 executor.submit(_fetch_grade_info_for_region, region, remaining_hpids, STRM_LIST_URL, service_key)
                 for region in target_regions
@@ -123,35 +187,54 @@ def fetch_hospital_grade_info(hpids: List[str], service_key: str, target_regions
 
 
 def fetch_baseinfo_by_hpid(hpid: str, service_key: str) -> Optional[Dict[str, Any]]:
-    """병원 기본정보 조회"""
+    """병원 기본정보 조회 (캐시 우선)"""
+    cached = BASEINFO_CACHE.get(hpid)
+    record_upstream_cache(endpoint_label(EGET_BASE_URL), cached is not None)
+    if cached is not None:
+        return cached
+    info = _fetch_baseinfo_by_hpid(hpid, service_key)
+    if info is not None:
+        BASEINFO_CACHE.set(hpid, info)
+    return info
+
+
+def _fetch_baseinfo_by_hpid(hpid: str, service_key: str) -> Optional[Dict[str, Any]]:
+    """병원 기본정보 API 호출 (캐시 미사용)"""
     try:
-        r = http_get(EGET_BASE_URL, {"HPID": hpid, "pageNo": 1, "numOfRows": 1, "serviceKey": service_key})
-        root = ET.fromstring(r.content)
-        it = root.find(".//item")
-        if it is None:
-            return None
-        
-        def g(tag):
-            el = it.find(tag)
-            return el.text.strip() if el is not None and el.text is not None else None
-        
-        return {
-            "hpid": g("hpid"),
-            "dutyName": g("dutyName") or g("dutyname"),
-            "dutyAddr": g("dutyAddr"),
-            "dutytel3": g("dutyTel3"),
-            "wgs84Lat": float(g("wgs84Lat")) if g("wgs84Lat") else None,
-            "wgs84Lon": float(g("wgs84Lon")) if g("wgs84Lon") else None,
-            "dutyDiv": g("dutyDiv"),
-            "dutyDivNam": g("dutyDivNam"),
-            "dutyEmcls": g("dutyEmcls"),
-            "dutyEmclsName": g("dutyEmclsName"),
-        }
+        # 요청 하나의 응답 시간이 최대 150건 팬아웃 전체 지연을 결정하므로 헤지 요청 사용
+        r = http_get(EGET_BASE_URL, {"HPID": hpid, "pageNo": 1, "numOfRows": 1, "serviceKey": service_key},
+                     hedge=True)
+        return parse_baseinfo_xml(r.content)
     except Exception as e:
         print(f"병원 기본정보 조회 오류 ({hpid}): {e}")
         return None
 
 
+def parse_baseinfo_xml(content: bytes) -> Optional[Dict[str, Any]]:
+    """병원 기본정보 API 응답(XML) → 기본정보 딕셔너리 (항목이 없으면 None)"""
+    root = ET.fromstring(content)
+    it = root.find(".//item")
+    if it is None:
+        return None
+
+    def g(tag):
+        el = it.find(tag)
+        return el.text.strip() if el is not None and el.text is not None else None
+
+    return {
+        "hpid": g("hpid"),
+        "dutyName": g("dutyName") or g("dutyname"),
+        "dutyAddr": g("dutyAddr"),
+        "dutytel3": g("dutyTel3"),
+        "wgs84Lat": float(g("wgs84Lat")) if g("wgs84Lat") else None,
+        "wgs84Lon": float(g("wgs84Lon")) if g("wgs84Lon") else None,
+        "dutyDiv": g("dutyDiv"),
+        "dutyDivNam": g("dutyDivNam"),
+        "dutyEmcls": g("dutyEmcls"),
+        "dutyEmclsName": g("dutyEmclsName"),
+    }
+
+
 def save_or_update_hospital(hospital_data: Dict[str, Any]) -> Optional[Hospital]:
     """
     병원 정보를 DB에 저장하거나 업데이트
@@ -223,7 +306,7 @@ def fetch_emergency_hospitals_in_region(sido: str, sigungu: Optional[str], servi
         
         # 병렬 처리로 병원 정보 조회 (최대 20개 동시 실행)
         hospitals = []
-        with ThreadPoolExecutor(max_workers=20) as executor:
+        with new_executor(20) as executor:
             future_to_hpid = {executor.submit(fetch_baseinfo_by_hpid, hpid, service_key): hpid for hpid in hpids}
             for future in as_completed(future_to_hpid):
                 try:
@@ -241,61 +324,130 @@ def fetch_emergency_hospitals_in_region(sido: str, sigungu: Optional[str], servi
 
 
 def fetch_er_beds(sido: str, sigungu: Optional[str], service_key: str, rows: int = 500) -> Dict[str, Dict[str, Any]]:
-    """실시간 응급 병상/장비 정보 조회"""
+    """실시간 응급 병상/장비 정보 조회 (짧은 TTL 캐시 우선)"""
+    cache_key = (sido, sigungu, rows)
+    cached = BED_CACHE.get(cache_key)
+    record_upstream_cache(endpoint_label(ER_BED_URL), cached is not None)
+    if cached is not None:
+        return cached
+    return refresh_er_beds(sido, sigungu, service_key, rows)
+
+
+def refresh_er_beds(sido: str, sigungu: Optional[str], service_key: str, rows: int = 500) -> Dict[str, Dict[str, Any]]:
+    """캐시와 관계없이 병상 정보를 다시 조회하고 캐시 갱신"""
+    beds_dict = _fetch_er_beds(sido, sigungu, service_key, rows)
+    if beds_dict:
+        BED_CACHE.set((sido, sigungu, rows), beds_dict)
+    return beds_dict
+
+
+def _fetch_er_beds(sido: str, sigungu: Optional[str], service_key: str, rows: int = 500) -> Dict[str, Dict[str, Any]]:
+    """실시간 응급 병상/장비 정보 API 호출 (응답 내용이 이전과 같으면 파싱 결과 재사용)"""
     try:
         params = {"STAGE1": sido, "pageNo": 1, "numOfRows": rows, "serviceKey": service_key}
         if sigungu:
             params["STAGE2"] = sigungu
         resp = http_get(ER_BED_URL, params=params)
-        root = ET.fromstring(resp.content)
-        items = root.findall(".//item")
-        
-        beds_dict = {}
-        for it in items:
-            def g(tag):
-                el = it.find(tag)
-                return el.text.strip() if el is not None and el.text is not None else None
-            
-            hpid = g("hpid")
-            if not hpid:
-                continue
-            
-            beds_dict[hpid] = {
-                "hpid": hpid,
-                "dutyName": g("dutyname"),
-                "hvidate": g("hvidate"),
-                "hvec": g("hvec"),
-                "hvoc": g("hvoc"),
-                "hvicc": g("hvicc"),
-                "hvgc": g("hvgc"),
-                "hvcc": g("hvcc"),
-                "hvncc": g("hvncc"),
-                "hvccc": g("hvccc"),
-                "hvctayn": g("hvctayn"),
-                "hvmriayn": g("hvmriayn"),
-                "hvangioayn": g("hvangioayn"),
-                "hvventiayn": g("hvventiayn"),
-                "hv1": g("hv1"),
-                "hv2": g("hv2"),
-                "hv3": g("hv3"),
-                "hv4": g("hv4"),
-                "hv5": g("hv5"),
-                "hv6": g("hv6"),
-                "hv7": g("hv7"),
-                "hv8": g("hv8"),
-                "hv9": g("hv9"),
-                "hv10": g("hv10"),
-                "hv11": g("hv11"),
-                "hv12": g("hv12"),
-                "dutytel3": g("dutytel3") or g("hv1"),
-                "hvdnm": g("hvdnm"),
-            }
-        return beds_dict
+        return _update_bed_snapshot((sido, sigungu, rows), resp.content)
     except Exception as e:
         print(f"병상 정보 조회 오류: {e}")
         return {}
 
 
+def _update_bed_snapshot(key: Tuple[str, Optional[str], int], content: bytes) -> Dict[str, Dict[str, Any]]:
+    """응답 본문 지문(해시)으로 변경 여부를 판단해 스냅샷 갱신"""
+    fingerprint = hashlib.blake2b(content, digest_size=16).hexdigest()
+    with _bed_snapshot_lock:
+        previous = _BED_SNAPSHOTS.get(key)
+    if previous is not None and previous["fingerprint"] == fingerprint:
+        BED_PAYLOADS.inc("unchanged")
+        previous["checked_at"] = time.time()
+        return previous["beds"]
+
+    beds_dict = parse_er_beds_xml(content)
+    if not beds_dict:
+        return beds_dict
+    now = time.time()
+    with _bed_snapshot_lock:
+        previous = _BED_SNAPSHOTS.get(key)
+        if previous is not None and previous["fingerprint"] == fingerprint:
+            # 다른 스레드가 같은 응답을 먼저 반영한 경우
+            return previous["beds"]
+        snapshot = _BED_SNAPSHOTS[key] = {
+            "fingerprint": fingerprint,
+            "version": previous["version"] + 1 if previous else 1,
+            "beds": beds_dict,
+            "changed_at": now,
+            "checked_at": now,
+        }
+    BED_PAYLOADS.inc("changed")
+    for listener in list(_bed_snapshot_listeners):
+        try:
+            listener(key, previous, snapshot)
+        except Exception as e:
+            print(f"병상 변경 알림 오류: {e}")
+    return beds_dict
+
+
+def add_bed_snapshot_listener(listener: Callable[[Tuple[str, Optional[str], int], Optional[Dict[str, Any]], Dict[str, Any]], None]) -> None:
+    """병상 스냅샷 내용이 바뀔 때마다 listener(key, 이전 스냅샷 또는 None, 새 스냅샷) 호출"""
+    _bed_snapshot_listeners.append(listener)
+
+
+def get_bed_snapshot(sido: str, sigungu: Optional[str] = None, rows: int = 500) -> Optional[Dict[str, Any]]:
+    """마지막 병상 스냅샷 (fingerprint, version, beds, changed_at, checked_at) - 아직 조회 전이면 None"""
+    with _bed_snapshot_lock:
+        return _BED_SNAPSHOTS.get((sido, sigungu, rows))
+
+
+def parse_er_beds_xml(content: bytes) -> Dict[str, Dict[str, Any]]:
+    """실시간 응급 병상 API 응답(XML) → {hpid: 병상/장비 정보}"""
+    root = ET.fromstring(content)
+    items = root.findall(".//item")
+
+    beds_dict = {}
+    for it in items:
+        def g(tag):
+            el = it.find(tag)
+            return el.text.strip() if el is not None and el.text is not None else None
+
+        hpid = g("hpid")
+        if not hpid:
+            continue
+
+        beds_dict[hpid] = {
+            "hpid": hpid,
+            "dutyName": g("dutyname"),
+            "hvidate": g("hvidate"),
+            "hvec": g("hvec"),
+            "hvoc": g("hvoc"),
+            "hvicc": g("hvicc"),
+            "hvgc": g("hvgc"),
+            "hvcc": g("hvcc"),
+            "hvncc": g("hvncc"),
+            "hvccc": g("hvccc"),
+            "hvctayn": g("hvctayn"),
+            "hvmriayn": g("hvmriayn"),
+            "hvangioayn": g("hvangioayn"),
+            "hvventiayn": g("hvventiayn"),
+            "hv1": g("hv1"),
+            "hv2": g("hv2"),
+            "hv3": g("hv3"),
+            "hv4": g("hv4"),
+            "hv5": g("hv5"),
+            "hv6": g("hv6"),
+            "hv7": g("hv7"),
+            "hv8": g("hv8"),
+            "hv9": g("hv9"),
+            "hv10": g("hv10"),
+            "hv11": g("hv11"),
+            "hv12": g("hv12"),
+            "dutytel3": g("dutytel3") or g("hv1"),
+            "hvdnm": g("hvdnm"),
+        }
+    return beds_dict
+
+
 def is_metropolitan(sido: str) -> bool:
     """광역시/특별시 여부 확인"""
     return sido.endswith("광역시") or sido.endswith("특별시") or sido.endswith("특별자치시")
@@ -332,14 +484,15 @@ def fetch_trauma_centers_in_region(sido: str, sigungu: Optional[str], service_ke
         
         # 병렬 처리로 병원 기본정보 조회 (최대 20개 동시 실행)
         hospitals = []
-        with ThreadPoolExecutor(max_workers=20) as executor:
+        with new_executor(20) as executor:
             future_to_item = {executor.submit(fetch_baseinfo_by_hpid, item["hpid"], service_key): item for item in items_with_grade}
             for future in as_completed(future_to_item):
                 try:
                     info = future.result()
                     item = future_to_item[future]
                     if info and info.get("wgs84Lat") and info.get("wgs84Lon"):
-                        # 외상센터 등급 정보 추가
+                        # 캐시된 기본정보를 변경하지 않도록 복사 후 외상센터 등급 정보 추가
+                        info = dict(info)
                         info["dutyEmcls"] = item.get("dutyEmcls") or info.get("dutyEmcls")
                         info["dutyEmclsName"] = item.get("dutyEmclsName") or info.get("dutyEmclsName")
                         hospitals.append(info)
@@ -353,57 +506,127 @@ def fetch_trauma_centers_in_region(sido: str, sigungu: Optional[str], service_ke
         return []
 
 
-def fetch_scope_hospitals(primary_sido: str, extra_sidos: Optional[Iterable[str]] = None, hospital_type: str = "general") -> List[Dict[str, Any]]:
-    """지역 내 병원 조회 (일반 응급의료기관, 외상센터, 또는 소아 중증 전용) - 성능 최적화: 최대 150개로 제한"""
+def _fetch_hospitals_for_target(sido: str, sigungu: Optional[str], hospital_type: str) -> List[Dict[str, Any]]:
+    """조회 대상 하나(시도 전체 또는 시군구)의 병원 목록 조회"""
+    if hospital_type == "trauma":
+        # 외상센터 우선 조회 (최대 80개)
+        hospitals = fetch_trauma_centers_in_region(sido, sigungu, DATA_GO_KR_KEY, max_items=80)
+        # 외상센터와 함께 일반 응급의료기관도 항상 조회 (최대 70개)
+        general_hospitals = fetch_emergency_hospitals_in_region(sido, sigungu, DATA_GO_KR_KEY, max_items=70)
+        hospitals.extend(general_hospitals)
+    elif hospital_type == "pediatric":
+        # 소아 중증: 모든 응급의료기관 조회 (최대 120개)
+        hospitals = fetch_emergency_hospitals_in_region(sido, sigungu, DATA_GO_KR_KEY, max_items=120)
+        # 외상센터도 포함 (최대 30개)
+        trauma_hospitals = fetch_trauma_centers_in_region(sido, sigungu, DATA_GO_KR_KEY, max_items=30)
+        hospitals.extend(trauma_hospitals)
+    else:
+        # 일반 응급의료기관 조회 (최대 120개)
+        hospitals = fetch_emergency_hospitals_in_region(sido, sigungu, DATA_GO_KR_KEY, max_items=120)
+        # 외상센터도 포함하여 통합 검색 (최대 30개)
+        trauma_hospitals = fetch_trauma_centers_in_region(sido, sigungu, DATA_GO_KR_KEY, max_items=30)
+        hospitals.extend(trauma_hospitals)
+    return hospitals
+
+
+def plan_scope_stages(primary_sido: str, extra_sidos: Optional[Iterable[str]] = None,
+                      sigungu: Optional[str] = None) -> List[List[Tuple[str, Optional[str]]]]:
+    """병원 조회 범위 단계: [요청 시군구 + 인접 시군구(STAGE2)] → [시도 전체(+함께 조회하는 광역시)]
+
+    인접 시군구 데이터(data/sigungu_neighbors.json)가 없거나 해당 시군구가 없으면 처음부터 시도 전체 조회
+    (요청 시군구 하나만 먼저 조회하면 대부분 후보가 부족해 왕복만 한 번 늘어남)
+    """
+    full_scope = [(target, None) for target in [primary_sido] + list(extra_sidos or [])]
+    if not sigungu or SCOPE_NEIGHBOR_DEPTH < 0:
+        return [full_scope]
+    neighbors = get_sigungu_neighbors(primary_sido, sigungu, SCOPE_NEIGHBOR_DEPTH)
+    if SCOPE_NEIGHBOR_DEPTH > 0 and not neighbors:
+        return [full_scope]
+    return [[(primary_sido, sigungu)] + neighbors, full_scope]
+
+
+def _count_qualifying(hospitals: Iterable[Dict[str, Any]], hospital_type: str,
+                      origin: Optional[Tuple[float, float]], rule: Optional[Dict[str, Any]] = None,
+                      bed_source: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+    """범위 확장 여부 판단용: 출발지에서 SCOPE_QUALIFY_RADIUS_KM 이내이면서 증상 요건을 모두 충족하고
+    응급실 가용 병상(hvec)이 있는 후보 수 (bed_source가 없으면 병상·요건 확인 생략, 외상은 외상센터가 없으면 0)
+    """
+    candidates = []
+    for h in hospitals:
+        if not (h.get("wgs84Lat") and h.get("wgs84Lon")):
+            continue
+        if origin is not None and calculate_distance(origin[0], origin[1], h["wgs84Lat"], h["wgs84Lon"]) > SCOPE_QUALIFY_RADIUS_KM:
+            continue
+        if bed_source is not None:
+            beds = bed_source.get(h.get("hpid"))
+            if beds is None or safe_int(beds.get("hvec")) <= 0:
+                continue
+            if rule and not evaluate_requirements(beds, rule)[1]:
+                continue
+        candidates.append(h)
+    if hospital_type == "trauma" and not any("외상센터" in str(h.get("dutyEmclsName") or "") for h in candidates):
+        return 0
+    return len(candidates)
+
+
+@traced("scope")
+def fetch_scope_hospitals(primary_sido: str, extra_sidos: Optional[Iterable[str]] = None, hospital_type: str = "general",
+                          sigungu: Optional[str] = None, origin: Optional[Tuple[float, float]] = None,
+                          rule: Optional[Dict[str, Any]] = None,
+                          bed_source: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """지역 내 병원 조회 (일반 응급의료기관, 외상센터, 또는 소아 중증 전용) - 성능 최적화: 최대 150개로 제한
+
+    sigungu가 있으면 요청 시군구와 인접 시군구만 먼저 조회하고,
+    조건에 맞는 후보(bed_source가 있으면 병상이 있고 rule 요건을 충족하는 후보)가
+    SCOPE_MIN_CANDIDATES개 미만일 때만 시도 전체로 확장
+    """
     aggregated: Dict[str, Dict[str, Any]] = {}
-    targets = [primary_sido]
-    if extra_sidos:
-        targets.extend(extra_sidos)
-    
+    stages = plan_scope_stages(primary_sido, extra_sidos, sigungu)
+
     # 지역당 최대 조회 개수 제한 (성능 최적화)
     MAX_HOSPITALS_PER_REGION = 150
-    
-    for target in targets:
-        if hospital_type == "trauma":
-            # 외상센터 우선 조회 (최대 80개)
-            hospitals = fetch_trauma_centers_in_region(target, None, DATA_GO_KR_KEY, max_items=80)
-            # 외상센터와 함께 일반 응급의료기관도 항상 조회 (최대 70개)
-            general_hospitals = fetch_emergency_hospitals_in_region(target, None, DATA_GO_KR_KEY, max_items=70)
-            hospitals.extend(general_hospitals)
-        elif hospital_type == "pediatric":
-            # 소아 중증: 모든 응급의료기관 조회 (최대 120개)
-            hospitals = fetch_emergency_hospitals_in_region(target, None, DATA_GO_KR_KEY, max_items=120)
-            # 외상센터도 포함 (최대 30개)
-            trauma_hospitals = fetch_trauma_centers_in_region(target, None, DATA_GO_KR_KEY, max_items=30)
-            hospitals.extend(trauma_hospitals)
-        else:
-            # 일반 응급의료기관 조회 (최대 120개)
-            hospitals = fetch_emergency_hospitals_in_region(target, None, DATA_GO_KR_KEY, max_items=120)
-            # 외상센터도 포함하여 통합 검색 (최대 30개)
-            trauma_hospitals = fetch_trauma_centers_in_region(target, None, DATA_GO_KR_KEY, max_items=30)
-            hospitals.extend(trauma_hospitals)
-        
+
+    def merge(hospitals: List[Dict[str, Any]]) -> None:
         for hospital in hospitals:
             hpid = hospital.get("hpid")
             if not hpid:
                 continue
             if hpid not in aggregated:
                 aggregated[hpid] = hospital
-        
-        # 이미 충분한 병원을 찾았으면 조기 종료 (성능 최적화)
-        if len(aggregated) >= MAX_HOSPITALS_PER_REGION * len(targets):
-            break
-    
+
+    for stage_idx, targets in enumerate(stages):
+        is_last_stage = stage_idx == len(stages) - 1
+        if not is_last_stage:
+            # 시군구 단위 조회는 응답이 작으므로 병렬로 조회
+            with span("scope_ring"), new_executor(min(4, len(targets))) as executor:
+                for hospitals in executor.map(lambda t: _fetch_hospitals_for_target(t[0], t[1], hospital_type), targets):
+                    merge(hospitals)
+        else:
+            with span("scope_sido"):
+                for target, target_sigungu in targets:
+                    merge(_fetch_hospitals_for_target(target, target_sigungu, hospital_type))
+                    # 이미 충분한 병원을 찾았으면 조기 종료 (성능 최적화)
+                    if len(aggregated) >= MAX_HOSPITALS_PER_REGION * len(targets):
+                        break
+
+        if not is_last_stage:
+            qualifying = _count_qualifying(aggregated.values(), hospital_type, origin, rule, bed_source)
+            if qualifying >= SCOPE_MIN_CANDIDATES:
+                SCOPE_PLANS.inc("sigungu")
+                return list(aggregated.values())
+            print(f"ℹ️  {primary_sido} {sigungu} 인접 범위 후보 {qualifying}개 부족, 시도 전체로 확장")
+    SCOPE_PLANS.inc("sido")
     return list(aggregated.values())
 
 
+@traced("beds")
 def fetch_beds_for_sidos(sidos: Iterable[str]) -> Dict[str, Dict[str, Any]]:
     """병상 정보 조회 - 성능 최적화: 병렬 처리"""
     combined: Dict[str, Dict[str, Any]] = {}
     sidos_list = list(sidos)
     
     # 병렬 처리로 병상 정보 조회
-    with ThreadPoolExecutor(max_workers=min(5, len(sidos_list))) as executor:
+    with new_executor(min(5, len(sidos_list))) as executor:
         future_to_sido = {executor.submit(fetch_er_beds, target, None, DATA_GO_KR_KEY, rows=500): target for target in sidos_list}
         for future in as_completed(future_to_sido):
             try:
@@ -443,6 +666,90 @@ def prioritize_by_region(records: List[Dict[str, Any]], max_regions: Optional[in
     return flattened
 
 
+def grade_target_regions(sido: str, extra_sidos: Optional[Iterable[str]] = None) -> List[str]:
+    """등급 정보를 조회할 지역 (시도 + 함께 조회하는 광역시 + 광역시의 인접 도)"""
+    regions = [sido] + list(extra_sidos or [])
+    if is_metropolitan(sido) and METRO_FALLBACK_PROVINCE.get(sido):
+        regions.append(METRO_FALLBACK_PROVINCE[sido])
+    return list(set(regions))
+
+
+def attach_estimated_etas(records: List[Dict[str, Any]], origin_lat: float, origin_lon: float) -> None:
+    """직선거리 기반 추정 ETA(로컬 모델, 네트워크 호출 없음)를 일괄 계산하여 _est_eta_minutes에 저장"""
+    if not records:
+        return
+    estimates = estimate_eta_minutes_batch(
+        [h.get("distance_km", float('inf')) for h in records], origin_lat, origin_lon
+    )
+    for hospital, eta in zip(records, estimates):
+        hospital["_est_eta_minutes"] = eta
+
+
+@traced("enrich")
+def enrich_hospital_records(hospitals_raw: Iterable[Dict[str, Any]], bed_source: Dict[str, Dict[str, Any]],
+                            grade_info_dict: Dict[str, Dict[str, Any]], origin_lat: float, origin_lon: float,
+                            sigungu: Optional[str], rule: Dict[str, Any], hospital_type: str, symptom: str,
+                            is_local_region: Optional[bool] = None) -> List[Dict[str, Any]]:
+    """병원 기본정보에 병상·등급 정보를 병합하고 거리, 요건 충족 점수, 추정 ETA, 도착 시점 병상 예측을 계산 (150km 초과·좌표 없음 제외)"""
+    # services/bed_history.py가 이 모듈의 리스너 등록 함수를 사용하므로 호출 시점에 import
+    from services.bed_history import attach_bed_forecasts
+
+    enriched = []
+    for hospital in hospitals_raw:
+        hpid = hospital.get("hpid")
+        if not hpid:
+            continue
+        merged = dict(hospital)
+        if hpid in bed_source:
+            for key, value in bed_source[hpid].items():
+                if key in ("dutyName", "dutytel3"):
+                    continue
+                if value is not None:
+                    merged[key] = value
+        # 등급 정보 병합
+        if hpid in grade_info_dict:
+            grade_info = grade_info_dict[hpid]
+            if grade_info.get("dutyEmcls"):
+                merged["dutyEmcls"] = grade_info["dutyEmcls"]
+            if grade_info.get("dutyEmclsName"):
+                merged["dutyEmclsName"] = grade_info["dutyEmclsName"]
+        guess = guess_region_from_address(merged.get("dutyAddr"))
+        region_name = guess[1] if guess and len(guess) > 1 else (guess[0] if guess else None)
+        merged["region_name"] = region_name or sigungu or merged.get("region_name")
+
+        # 거리 계산
+        if merged.get("wgs84Lat") and merged.get("wgs84Lon"):
+            merged["distance_km"] = calculate_distance(origin_lat, origin_lon, merged["wgs84Lat"], merged["wgs84Lon"])
+            if merged["distance_km"] > 150.0:
+                continue
+        else:
+            merged["distance_km"] = float('inf')
+            continue
+
+        # 지역 내 병원 판단
+        if is_local_region is None:
+            is_local = (not sigungu) or (merged["region_name"] == sigungu)
+            merged["_is_local_region"] = is_local
+        else:
+            merged["_is_local_region"] = is_local_region
+
+        score, fully_met = evaluate_requirements(merged, rule)
+        merged["_requirement_score"] = score
+        merged["_meets_conditions"] = fully_met
+
+        # 소아 중증 환자의 경우: 소아중환자실(hvncc) 보유 병원에 가산점
+        if hospital_type == "pediatric" and symptom == "소아 중증(신생아/영아)":
+            hvncc = safe_int(merged.get("hvncc", 0))
+            if hvncc >= 1:
+                merged["_requirement_score"] = score + 10.0
+        enriched.append(merged)
+    # 모든 후보에 로컬 모델 추정 ETA 부여 (후보 사전 정렬 및 카카오 실패 시 대체값)
+    attach_estimated_etas(enriched, origin_lat, origin_lon)
+    # 병상 이력 추세로 도착 시점 예상 응급실 병상 수 계산 (정렬 특성으로 사용)
+    attach_bed_forecasts(enriched)
+    return enriched
+
+
 def serialize_hospital_payload(h: Dict[str, Any]) -> Dict[str, Any]:
     """프론트엔드로 전달할 병원 정보를 정규화"""
     return {
@@ -453,7 +760,7 @@ def serialize_hospital_payload(h: Dict[str, Any]) -> Dict[str, Any]:
         "wgs84Lat": h.get("wgs84Lat"),
         "wgs84Lon": h.get("wgs84Lon"),
         "distance_km": h.get("distance_km"),
-        "eta_minutes": h.get("eta_minutes"),
+        "eta_minutes": h.get("eta_minutes") if h.get("eta_minutes") is not None else h.get("_est_eta_minutes"),
         "_meets_conditions": h.get("_meets_conditions", False),
         "dutyDiv": h.get("dutyDiv"),
         "dutyDivNam": h.get("dutyDivNam"),
@@ -480,6 +787,8 @@ def serialize_hospital_payload(h: Dict[str, Any]) -> Dict[str, Any]:
         "hv12": h.get("hv12"),
         "hvdnm": h.get("hvdnm"),
         "hvidate": h.get("hvidate"),
+        "hvec_at_eta": h.get("_hvec_at_eta"),
+        "hvec_trend_per_hour": h.get("_hvec_trend_per_hour"),
         "hvctayn": h.get("hvctayn"),
         "hvmriayn": h.get("hvmriayn"),
         "hvangioayn": h.get("hvangioayn"),
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""병원 캐시 예열 스케줄러
+
+EMS 로그인(팀 담당 시도)과 위치 확인(coord2region/locate) 시점에
+해당 시도와 함께 조회하는 광역시 범위의 병원 기본정보·병상·등급 캐시를 백그라운드에서 채운다.
+같은 범위 작업은 진행 중이거나 PREFETCH_MIN_INTERVAL_SEC 안에 끝났으면 다시 실행하지 않는다
+(같은 지역 여러 팀이 동시에 로그인해도 한 번만 조회).
+"""
+
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Dict, Optional, Tuple
+
+from config import (
+    DATA_GO_KR_KEY, PROVINCE_INCLUDE_METROS, PREFETCH_MAX_WORKERS, PREFETCH_MIN_INTERVAL_SEC
+)
+from services.hospital_service import (
+    fetch_scope_hospitals, fetch_beds_for_sidos, fetch_hospital_grade_info, grade_target_regions
+)
+from utils.concurrency import new_executor
+from utils.metrics import Counter, register_metric
+
+PREFETCH_JOBS = register_metric(Counter(
+    "prefetch_jobs_total", "Hospital cache prefetch requests by trigger and result", ("reason", "result")))
+
+ScopeKey = Tuple[str, Optional[str]]
+
+
+class PrefetchScheduler:
+    """(시도, 시군구) 범위 단위로 중복을 제거하는 백그라운드 캐시 예열"""
+
+    def __init__(self, max_workers: int = PREFETCH_MAX_WORKERS, min_interval: float = PREFETCH_MIN_INTERVAL_SEC):
+        self.min_interval = min_interval
+        self.max_workers = max_workers
+        # 첫 예열 때 생성: app.py의 monkey patch 이후에 만들어야 그린스레드 executor가 선택됨
+        self._executor: Optional[Executor] = None
+        self._inflight: Dict[ScopeKey, Optional[Future]] = {}
+        self._finished_at: Dict[ScopeKey, float] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, sido: Optional[str], sigungu: Optional[str] = None, reason: str = "manual") -> bool:
+        """예열 작업 예약 (진행 중이거나 최근에 끝난 같은 범위면 건너뛰고 False)"""
+        if not sido:
+            return False
+        key = (sido, sigungu or None)
+        now = time.time()
+        with self._lock:
+            if key in self._inflight or now - self._finished_at.get(key, 0.0) < self.min_interval:
+                PREFETCH_JOBS.inc(reason, "deduped")
+                return False
+            # 자리만 확보하고 submit은 잠금 밖에서 (작업자 시작 시 허브로 양보하므로 잠금을 쥔 채 부르면 교착 위험)
+            self._inflight[key] = None
+            if self._executor is None:
+                self._executor = new_executor(self.max_workers, thread_name_prefix="prefetch")
+            executor = self._executor
+        future = executor.submit(self._warm, sido, sigungu or None)
+        with self._lock:
+            self._inflight[key] = future
+        PREFETCH_JOBS.inc(reason, "scheduled")
+        future.add_done_callback(lambda _: self._finish(key))
+        return True
+
+    def _finish(self, key: ScopeKey) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._finished_at[key] = time.time()
+
+    def _warm(self, sido: str, sigungu: Optional[str]) -> None:
+        started = time.time()
+        try:
+            extra_sidos = PROVINCE_INCLUDE_METROS.get(sido, [])
+            # 기본정보: top3와 같은 범위 계획 사용 (시군구를 알면 인접 시군구 먼저, 모르면 시도 전체)
+            hospitals = fetch_scope_hospitals(sido, extra_sidos, "general", sigungu=sigungu)
+            # 병상: 시도 단위 스냅샷 (top3/병상 스트림과 공유)
+            fetch_beds_for_sidos([sido] + extra_sidos)
+            # 등급: 지역별 등급 목록 캐시
+            hpids = [h["hpid"] for h in hospitals if h.get("hpid")]
+            fetch_hospital_grade_info(hpids, DATA_GO_KR_KEY, grade_target_regions(sido, extra_sidos))
+            print(f"🔥 병원 캐시 예열 완료 ({sido} {sigungu or ''}): 병원 {len(hpids)}개, {time.time() - started:.1f}초")
+        except Exception as e:
+            print(f"병원 캐시 예열 오류 ({sido} {sigungu or ''}): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """진행 중인 예열 범위와 최근 완료 시각"""
+        with self._lock:
+            return {
+                "inflight": [" ".join(filter(None, key)) for key in self._inflight],
+                "recent": {" ".join(filter(None, key)): int(ts) for key, ts in self._finished_at.items()},
+            }
+
+
+PREFETCH = PrefetchScheduler()
+
+
+def schedule_prefetch(sido: Optional[str], sigungu: Optional[str] = None, reason: str = "manual") -> bool:
+    """병원 기본정보·병상·등급 캐시 예열 예약 (중복 제거)"""
+    return PREFETCH.schedule(sido, sigungu, reason)
+
+
+def get_prefetch_stats() -> Dict[str, Any]:
+    return PREFETCH.stats()
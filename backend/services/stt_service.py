@@ -0,0 +1,745 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""STT 후처리 파이프라인 - 의학용어 번역, SBAR 구조화, ARS 문장 변환
+
+staged    : 번역 → SBAR → ARS 순서로 채팅 완성 3회 (이전 단계 출력이 다음 단계 입력)
+            stream_staged_pipeline()은 같은 경로에서 번역/SBAR 토큰을 생성되는 대로 넘겨줌 (SSE 라우트용)
+structured: 세 단계 규칙을 한 프롬프트에 담아 JSON 스키마 구조화 출력 1회로 text, sbar_summary, ars_narrative 생성
+            (호출 실패나 검증 실패 시 staged로 다시 처리)
+
+프롬프트는 음성 입력(/api/stt/transcribe)과 텍스트 입력(/api/stt/convert-to-sbar)이 번역 단계와 시스템 메시지를 공유하고
+SBAR/ARS 사용자 프롬프트만 다르다 (텍스트 입력은 축약 규칙).
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import STT_PIPELINE_MODE, STT_STAGED_MODEL, STT_STRUCTURED_MODEL
+from utils.concurrency import iterate_blocking_io, run_blocking_io
+from utils.metrics import Counter, register_metric
+from utils.tracing import span
+
+STT_PIPELINE_RUNS = register_metric(Counter(
+    "stt_pipeline_runs_total", "STT post-processing pipeline runs by mode and outcome", ("mode", "outcome")))
+STT_LLM_TOKENS = register_metric(Counter(
+    "stt_llm_tokens_total", "Chat completion tokens used by the STT pipeline", ("mode", "kind")))
+
+PIPELINE_MODES = ("staged", "structured")
+
+MEDICAL_KEYWORDS = """M/S, mental state, Alert, confusion, drowsy, stupor, semicoma, coma, V/S, vital sign, TPR, temperature, pulse, respiration, HR, heart rate, PR, pulse rate, BP, blood pressure, BT, body temperature, RR, respiratory rate, BST, blood sugar test, SpO2, sat, saturation of percutaneous oxygen, Abdomen, Abdominal pain, Abnormal, Abrasion, Abscess, Acetaminophen, Acidosis, Acute, Acute abdomen, Acute bronchitis, Acute coronary syndrome, Acute myocardial infarction, Acute renal failure, Acute respiratory distress syndrome, Acute stroke, Airway, Airway obstruction, Alcohol intoxication, Allergy, Allergic reaction, Amnesia, Anaphylactic shock, Anaphylaxis, Analgesic, Anemia, Aneurysm, Angina, Angina pectoris, Angiography, Arrhythmia, Arterial bleeding, Asphyxia, Aspiration, Asthma, Cardiac Arrest, Cardiac tamponade, Cardiogenic shock, Cardiopulmonary arrest, Cardiopulmonary resuscitation (CPR), Cerebral hemorrhage, Cerebral infarction, Cerebrovascular accident (CVA), Chest compression, Chest pain, Choking, Chronic obstructive pulmonary disease (COPD), Coma, Concussion, Confusion, Convulsion, Coronary artery disease (CAD), Cough, Cyanosis, Defibrillation, Dehydration, Dementia, Diabetes mellitus, Diabetic ketoacidosis, Diarrhea, Dizziness, Drowning, Drowsy, Dyspnea, ECG (Electrocardiogram), Edema, Electrocution, Embolism, Emphysema, Endotracheal intubation, Epilepsy, Epistaxis, Fever, Fracture, GCS (Glasgow Coma Scale), Headache, Head injury, Heart arrest, Heart failure, Heart rate, Hematoma, Hematuria, Hemoptysis, Hemorrhage, Hyperglycemia, Hypertension, Hyperthermia, Hyperventilation, Hypoglycemia, Hypotension, Hypothermia, Hypovolemic shock, Hypoxia, Intoxication, Intracranial pressure, Ischemia, Laceration, Myocardial infarction, Nausea, Oxygen therapy, Pneumonia, Pneumothorax, Respiratory arrest, Respiratory distress, Respiratory failure, Seizure, Sepsis, Septic shock, Shock, Stroke, Stupor, Syncope, Tachycardia, Trauma, Unconsciousness, Ventilation, Vertigo, Vomiting, Wound"""
+
+# 1단계 System 메시지
+TRANSLATION_SYSTEM = """너는 대한민국 응급의료 현장의 대화를 전문적으로 해석하는 의료용어 번역 전문가이다.
+
+- 한국 119 구급대원과 응급실 의료진 사이에서 오가는 보고 내용을 잘 이해한다.
+
+- 구어체, 비표준 표현, 약어, 오타, STT(음성 인식) 오류가 섞여 있어도 문맥을 기반으로 의미를 해석할 수 있어야 한다.
+
+- **모든 일반 문장은 반드시 자연스러운 한국어로 유지**합니다. 절대 영어로 변환하지 않습니다.
+
+- **의학 용어(증상, 상태, 생체징후, 진단명, 약어)만 영어로 변환**합니다.
+
+- 입력에 명시되지 않은 수치나 정보는 절대 임의로 생성하지 않는다.
+
+- 환자 이름, 주민등록번호, 전화번호, 정확한 집 주소 등 개인을 식별할 수 있는 정보가 있다면, 출력에서는 제거하거나 "환자", "보호자" 등으로 일반화한다."""
+
+# 2단계 System 메시지
+SBAR_SYSTEM = """너는 대한민국 응급의료 현장에서 구급대원 보고 내용을 **SBAR 형식**으로 정리하는 전문가이다.
+
+- 입력은 이미 1단계에서 전처리된 텍스트로, 일반 문장은 한국어, 의학 용어는 영어(또는 약어)로 표기되어 있다.
+
+- 너의 목표는 이 정보를 기반으로, **Pre-KTAS 등급을 문장 맨 앞에 두고**, SBAR(Situation, Background, Assessment, Recommendation) 요소를 모두 포함한 전문적인 한국어 요약 문장을 생성하는 것이다.
+
+- SBAR 문장은 병원 응급실 의료진에게 전달되는 것을 가정한다.
+
+- 입력에 없는 정보(Pre-KTAS, 시간, V/S 등)는 절대 임의로 생성하지 않는다."""
+
+# 3단계 System 메시지
+ARS_SYSTEM = """너는 응급의료 현장의 SBAR 형식 정보를, ARS(자동응답서비스) 음성 안내에 최적화된 자연스러운 문장으로 변환하는 전문가이다.
+
+- 입력은 이미 2단계에서 생성된 SBAR 기반 요약 문장이다.
+
+- 너의 목표는 이 문장을, 전화 ARS 음성으로 한 번 들었을 때 의료진이 핵심 내용을 빠르게 이해할 수 있도록 **길이·리듬·발음** 측면에서 다듬는 것이다.
+
+- "Pre-KTAS"는 음성에서 자연스럽게 읽히도록 "프리케이타스"로 한글 표기를 사용한다.
+
+- 숫자와 생체징후는 명확하게 들리도록, 필요시 단위나 설명을 덧붙인다.
+
+- 출력은 항상 정중하고 전문적인 한국어 존댓말 문장이어야 한다."""
+
+
+def translation_prompt(text: str) -> str:
+    """1단계 User 프롬프트 (음성/텍스트 입력 공통)"""
+    return f"""아래는 응급의료 상황에서 구급대원이 말한 대화/보고 텍스트입니다.
+
+역할과 목표:
+
+- 이 텍스트를 분석하여, **모든 일반 문장은 자연스러운 한국어로 유지**하세요.
+
+- **의학 용어(증상, 상태, 생체징후, 진단명, 약어)만 영어로 변환**하세요.
+
+- 예: "60대 남성, 숨이 안 쉬어짐" → "60대 남성, severe dyspnea" (일반 문장은 한국어 유지, 의학 용어만 영어)
+
+      "약 20분 전" → "약 20분 전" (일반 문장이므로 한국어 유지, 변환하지 않음)
+
+      "도로에서 발견" → "도로에서 발견" (일반 문장이므로 한국어 유지, 변환하지 않음)
+
+      "말이 꼬인다" → "dysarthria" (의학 용어만 영어로 변환)
+
+      "말이 잘 안 나온다" → "aphasia" (의학 용어만 영어로 변환)
+
+출력 형식:
+
+- 내가 전달한 모든 문장을 **하나도 빠뜨리지 말고** 정리하세요. (요약·축약 금지)
+
+- 출력에는 **정리된 문장만** 포함하세요.  
+
+  - 앞뒤에 "다음은 번역입니다" 같은 설명 문장은 절대 쓰지 마세요.
+
+- 오타나 STT 오류로 인해 의미를 완전히 알 수 없는 단어나 구는, 그대로 두거나 자연스럽게 정리하되, 새로운 의미를 임의로 만들지 마세요.
+
+변환 규칙:
+
+1. **일반 문장은 절대 영어로 변환하지 않고 반드시 한국어로 유지**합니다.
+   - 예: "60대 남성" → "60대 남성" (변환하지 않음)
+   - 예: "약 20분 전" → "약 20분 전" (변환하지 않음)
+   - 예: "도로에서 발견" → "도로에서 발견" (변환하지 않음)
+   - 예: "갑작스럽게 발생" → "갑작스럽게 발생" (변환하지 않음)
+
+2. **의학 용어만 영어로 변환**합니다.
+   - 증상: "숨이 안 쉬어짐" → "severe dyspnea" 또는 "respiratory arrest"
+   - 상태: "말이 꼬인다" → "dysarthria", "말이 잘 안 나온다" → "aphasia"
+   - 생체징후: "혈압" → "BP", "심박수" → "HR"
+   - 진단명: "뇌졸중" → "stroke", "심근경색" → "myocardial infarction"
+
+3. 구급대원이 사용하는 비표준 표현은 문맥을 보고 가능한 한 표준 의학 용어로 변환합니다.
+
+   - 예: "숨이 안 쉬어짐" → "severe dyspnea" 또는 "respiratory distress" (심정지 상황이면 "respiratory arrest")
+
+   - 예: "말이 어눌해짐" → "dysarthria"
+
+4. 오타·발음 착오 등으로 애매한 표현은, 가능한 경우 가장 안전하고 넓은 범위의 의학 표현으로 변환합니다.
+
+   - 예: "혈압 이백에 일백" → "BP 200/100"
+
+   - 예: "20분 전 추정" → "약 20분 전" (일반 문장이므로 한국어 유지)
+
+5. 명확하지 않은 진단을 확정적으로 쓰지 말고, "의심", "추정" 등을 사용해 **의심 수준**으로 표현합니다.
+   - 예: "뇌졸중 의심" (한국어 유지)
+
+6. Pre-KTAS 점수 또는 등급 정보는 반드시 정확히 보존하세요.
+   - "Pre-KTAS 1점", "Pre-KTAS 2점", "Pre-KTAS 3점", "Pre-KTAS 4점", "Pre-KTAS 5점" 형식으로 표기
+   - "프리케이타스", "프리 케이타스", "pre ktas", "pre-ktas" 등 다양한 변형 표현을 "Pre-KTAS"로 통일
+   - 점수 숫자(1-5)는 반드시 정확히 보존 (예: "2점" → "2점", "이점" → "2점"으로 수정)
+   - "Pre-KTAS 1단계", "Pre-KTAS 2단계" 같은 표현도 점수로 변환 (1단계→1점, 2단계→2점)
+   - Pre-KTAS 정보가 잘못 인식되거나 변형된 경우, 원래 의도된 점수를 복원하세요.
+
+참고 키워드(예시):
+
+- M/S, mental state, Alert, confusion, drowsy, stupor, semicoma, coma
+
+- V/S, vital sign, TPR, temperature, pulse, respiration
+
+- HR (heart rate), PR (pulse rate), BP (blood pressure), BT (body temperature), RR (respiratory rate)
+
+- BST (blood sugar test), SpO2 (saturation of percutaneous oxygen), sat, O2
+
+- GCS, KTAS, Pre-KTAS, FAST, CPR, ROSC 등
+
+- {MEDICAL_KEYWORDS}
+
+텍스트:
+
+{text}"""
+
+
+def voice_sbar_prompt(translated_text: str) -> str:
+    """2단계 User 프롬프트 (음성 입력)"""
+    return f"""아래는 응급의료 현장에서 구급대원이 보고한 환자 상태 정보입니다.
+
+이 정보는 1단계에서 한 번 정리된 상태로, 일반 문장은 한국어, 의학 용어는 영어로 표기되어 있습니다.
+
+이 정보를 바탕으로, SBAR(Situation, Background, Assessment, Recommendation) 형식의 요소들을 모두 포함하여,
+
+**병원 의료진에게 전달할 한 문장(또는 2~3문장)의 요약**으로 변환하세요.
+
+중요 규칙:
+
+1. Pre-KTAS 위치 및 존재 여부
+
+   - 입력에 Pre-KTAS 등급이 **명시되어 있는 경우**,  
+
+     문장은 반드시 `"Pre-KTAS X점 환자, ..."` 형태로 시작합니다.
+
+   - 입력에 Pre-KTAS 등급이 **명시되어 있지 않은 경우**,  
+
+     임의로 등급을 추론하지 말고  
+
+     `"Pre-KTAS 등급 미측정 환자, ..."` 또는 `"Pre-KTAS 등급 정보 없음, ..."`으로 시작합니다.
+
+   - 시스템 정책상 Pre-KTAS를 추론해야 한다면,  
+
+     `"Pre-KTAS 2점으로 추정되는 환자, ..."`처럼 **'추정'이라는 표현을 반드시 포함**하세요.
+
+2. 문장 길이 및 개수
+
+   - 기본적으로 **하나의 완전한 문장**으로 작성합니다.
+
+   - 포함해야 할 핵심 정보가 **7개 이상**이어서 문장이 지나치게 길어지는 경우에는 **최대 2~3문장**으로 나눌 수 있습니다.
+
+     - 1문장: S(상황) + A(평가)를 중심으로 기술
+
+     - 2문장: 첫 문장에 S+A, 두 번째 문장에 B(배경)+R(권고)
+
+3. SBAR 요소 연결
+
+   - SBAR 요소는 기본적으로 다음 순서로 자연스럽게 연결합니다.  
+
+     `Pre-KTAS + S → B → A → R`
+
+   - 접속어 예시:
+
+     - S 시작: "…환자로", "…환자이며"
+
+     - B 연결: "과거력으로", "V/S는", "현재 BP ~, HR ~, SpO2 ~로"
+
+     - A 연결: "이러한 소견으로", "현재 상태는 ~가 의심되는 상태이며"
+
+     - R 연결: "이에", "따라서", "이로 인해 ~~로의 (긴급) 이송이 필요합니다."
+
+   - 예시 패턴:
+
+     `"Pre-KTAS 2점 환자, 60대 남성으로 약 20분 전부터 갑작스러운 언어장애와 우측 편마비가 발생하였고, 과거력으로 당뇨병이 있으며 현재 BP 180/100, HR 110, SpO2 95%로, 급성 뇌졸중이 의심되는 상태로, 뇌혈관중재술이 가능한 3차 응급의료센터로의 긴급 이송이 필요합니다."`
+
+4. 의학 용어 표기
+
+   - SBAR 단계에서는 **의학 용어/약어는 영어(또는 국제 표준 약어)로 유지**합니다.  
+
+     (예: BP, HR, RR, SpO2, GCS, FAST, CPR, ROSC 등)
+
+   - 한글로 바꾸지 말고 그대로 사용하세요.
+
+5. 시간·생체징후·불확실성 처리
+
+   - 증상 발생 시점이나 경과 시간이 입력에 있는 경우, 반드시 포함합니다.
+
+     - 예: "about 20 minutes ago" → "약 20분 전부터"
+
+     - "추정" 정보는 "약/approximately" 등의 표현을 유지하여 불확실성을 표현합니다.
+
+   - 생체징후(V/S: BP, HR, RR, SpO2, BT 등)가 입력에 있는 경우, 가능한 한 포함합니다.
+
+     - 입력에 없는 V/S를 새로 만들지 마세요.
+
+     - V/S 정보가 전혀 없으면 생략하거나 "vital signs not reported" 같은 표현을 쓸 수 있습니다(정책에 따라).
+
+   - 불확실한 진단은 "의심되는 상태", "suspected" 등으로 표현합니다.
+
+     - 예: "acute stroke is suspected", "acute coronary syndrome is suspected"
+
+6. 환자 유형별 주의점 (선택적)
+
+   - 심정지/CPR:
+
+     - 심정지 발생 시각, CPR 시작 시각, ROSC 여부 등 핵심 정보 우선 포함.
+
+   - 뇌졸중 의심:
+
+     - 증상 발생(또는 마지막 정상) 시각, 편마비/언어장애, 혈압 등 우선 포함.
+
+   - 외상:
+
+     - 외상 기전, 주요 출혈 부위, 의식 상태(GCS), 혈압/맥박 등 우선 포함.
+
+   - 복합 상황(예: 외상 + 심정지)이면, **심정지/생명 위협 정보**를 가장 먼저 기술합니다.
+
+7. 문체
+
+   - 항상 정중하고 전문적인 **평서문**으로 작성합니다.
+
+   - "인 것 같습니다" 등 모호한 표현보다, "~~이 의심되는 상태입니다", "~~가 필요합니다"처럼 명확한 존댓말을 사용합니다.
+
+SBAR 요소 정의(요약):
+
+- S (Situation): 현재 상황 - 환자 기본 정보(나이, 성별), 주요 증상, 증상 발생 시점
+
+- B (Background): 배경 정보 - 기저질환, 복용 약물, 생체 징후(V/S), 과거력
+
+- A (Assessment): 평가 - 의식 상태, 주요 의심 질환, 생명 위협 여부
+
+- R (Recommendation): 권고 - 필요한 이송 병원 유형(예: 3차 응급의료센터, 권역외상센터 등), 긴급도(즉시/긴급/준응급), 필요 자원(예: stroke team, cath lab, trauma team 등)
+
+입력 텍스트:
+
+{translated_text}
+
+Pre-KTAS를 제일 앞에 놓고, 위 규칙에 따라 SBAR 요소를 포함한 자연스러운 문장으로 변환:"""
+
+
+def voice_ars_prompt(sbar_summary: str) -> str:
+    """3단계 User 프롬프트 (음성 입력)"""
+    return f"""아래는 SBAR 형식으로 정리된 응급환자 정보(2단계 출력)입니다.
+
+이 정보를 ARS(자동응답서비스)에서 의료진이 전화를 통해 들었을 때,
+
+한 번에 핵심 내용을 이해할 수 있도록 **자연스럽고 명확한 한국어 문장**으로 변환하세요.
+
+요구사항:
+
+1. SBAR 순서 유지 + 핵심 먼저
+
+   - 전체 정보는 기본적으로 S(상황) → B(배경) → A(평가) → R(권고) 순서로 전달되도록 유지합니다.
+
+   - 문장 앞부분에는 **프리케이타스 등급, 생명 위협 여부, 주요 의심 질환** 등 가장 중요한 정보를 먼저 배치합니다.
+
+2. Pre-KTAS 표기
+
+   - "Pre-KTAS"는 반드시 "프리케이타스"로 발음 기반 한글 표기를 사용합니다.
+
+     - 예: "Pre-KTAS 2점" → "프리케이타스 2점"
+
+   - SBAR 문장에 "Pre-KTAS"가 없다면 새로 생성하지 말고, 없는 상태대로 진행합니다.
+
+3. 의학 용어 처리
+
+   - BP, HR, RR, SpO2, GCS, FAST, CPR, ROSC 등 의학 약어는 **그대로 유지**합니다.
+
+   - 필요시 뒤에 간단한 설명을 덧붙일 수 있습니다.
+
+     - 예: "BP 180에 100", "HR 분당 120회", "SpO2 95퍼센트"
+
+   - 진단명/상태명(예: acute stroke, acute coronary syndrome 등)은 한국어 표현 + 영어 용어를 함께 쓰거나, 한국어만 사용해도 됩니다. (서비스 정책에 맞게 선택 가능)
+
+4. 숫자·시간 표현
+
+   - 숫자와 시간은 **의미가 명확하게 들리도록** 표현합니다.
+
+     - 예: "BP 180/100" → "혈압 비피 180에 100"
+
+     - "HR 120" → "심박수 120회"
+
+     - "20분 전" → "약 20분 전에"
+
+   - 혼동될 수 있는 숫자는 단위·맥락과 함께 말하게 구성합니다.
+
+     - 예: 그냥 "4" 보다는 "4회", "4센티미터" 등으로 표현.
+
+5. 문장 길이와 개수
+
+   - 한 문장은 대략 **8~12초 안에 읽을 수 있는 길이**를 목표로 합니다.
+
+   - 너무 길다고 판단되면 **최대 2~3문장**으로 나누세요.
+
+     - 1문장: 프리케이타스 등급 + 현재 상황 + 주요 평가
+
+     - 2문장: 첫 문장(S+A), 두 번째 문장(B+R)
+
+   - 같은 정보(시간, 수치)를 문장 안에서 **불필요하게 반복하지 않습니다.**
+
+6. 문체
+
+   - 항상 정중하고 전문적인 **존댓말**로 작성합니다. ("입니다", "합니다")
+
+   - "인 것 같습니다", "보이는 것 같습니다" 등 애매한 표현은 피하고,
+
+     "~로 의심되는 상태입니다", "~이 필요합니다"처럼 **단정적이되 진단은 '의심' 수준으로** 표현합니다.
+
+7. 오류·불완전 정보 처리
+
+   - SBAR 문장 안에 이미 "약", "추정", "의심" 등의 표현이 있다면, 해당 불확실성을 그대로 유지합니다.
+
+   - 정보가 모호하거나 부족하다고 해서 새로운 수치나 사실을 임의로 추가하지 마세요.
+
+8. 개인정보
+
+   - 환자 이름, 구체 주소 등 개인을 식별할 수 있는 정보가 있다면, ARS 문장에서는 "환자", "보호자", "가정", "현장" 등으로 일반화합니다.
+
+입력 (SBAR 형식 정보):
+
+{sbar_summary}
+
+위 요구사항을 반영하여, ARS 음성 안내용으로 자연스럽고 명확한 문장으로 변환:"""
+
+
+def text_sbar_prompt(translated_text: str) -> str:
+    """2단계 User 프롬프트 (텍스트 입력, 축약 규칙)"""
+    return f"""아래는 응급의료 현장에서 구급대원이 보고한 환자 상태 정보입니다.
+
+이 정보는 1단계에서 한 번 정리된 상태로, 일반 문장은 한국어, 의학 용어는 영어로 표기되어 있습니다.
+
+이 정보를 바탕으로, SBAR(Situation, Background, Assessment, Recommendation) 형식의 요소들을 모두 포함하여,
+
+**병원 의료진에게 전달할 한 문장(또는 2~3문장)의 요약**으로 변환하세요.
+
+중요 규칙:
+
+1. Pre-KTAS 위치 및 존재 여부
+
+   - 입력에 Pre-KTAS 등급이 **명시되어 있는 경우**,  
+
+     문장은 반드시 `"Pre-KTAS X점 환자, ..."` 형태로 시작합니다.
+
+   - 입력에 Pre-KTAS 등급이 **명시되어 있지 않은 경우**,  
+
+     임의로 등급을 추론하지 말고  
+
+     `"Pre-KTAS 등급 미측정 환자, ..."` 또는 `"Pre-KTAS 등급 정보 없음, ..."`으로 시작합니다.
+
+2. 문장 길이 및 개수
+
+   - 기본적으로 **하나의 완전한 문장**으로 작성합니다.
+
+   - 포함해야 할 핵심 정보가 **7개 이상**이어서 문장이 지나치게 길어지는 경우에는 **최대 2~3문장**으로 나눌 수 있습니다.
+
+3. SBAR 요소 연결
+
+   - SBAR 요소는 기본적으로 다음 순서로 자연스럽게 연결합니다.  
+
+     `Pre-KTAS + S → B → A → R`
+
+4. 의학 용어 표기
+
+   - SBAR 단계에서는 **의학 용어/약어는 영어(또는 국제 표준 약어)로 유지**합니다.
+
+5. 시간·생체징후·불확실성 처리
+
+   - 증상 발생 시점이나 경과 시간이 입력에 있는 경우, 반드시 포함합니다.
+
+   - 생체징후(V/S: BP, HR, RR, SpO2, BT 등)가 입력에 있는 경우, 가능한 한 포함합니다.
+
+   - 불확실한 진단은 "의심되는 상태", "suspected" 등으로 표현합니다.
+
+6. 문체
+
+   - 항상 정중하고 전문적인 **평서문**으로 작성합니다.
+
+SBAR 요소 정의(요약):
+
+- S (Situation): 현재 상황 - 환자 기본 정보(나이, 성별), 주요 증상, 증상 발생 시점
+
+- B (Background): 배경 정보 - 기저질환, 복용 약물, 생체 징후(V/S), 과거력
+
+- A (Assessment): 평가 - 의식 상태, 주요 의심 질환, 생명 위협 여부
+
+- R (Recommendation): 권고 - 필요한 이송 병원 유형(예: 3차 응급의료센터, 권역외상센터 등), 긴급도(즉시/긴급/준응급), 필요 자원(예: stroke team, cath lab, trauma team 등)
+
+입력 텍스트:
+
+{translated_text}
+
+Pre-KTAS를 제일 앞에 놓고, 위 규칙에 따라 SBAR 요소를 포함한 자연스러운 문장으로 변환:"""
+
+
+def text_ars_prompt(sbar_summary: str) -> str:
+    """3단계 User 프롬프트 (텍스트 입력, 축약 규칙)"""
+    return f"""아래는 SBAR 형식으로 정리된 응급환자 정보(2단계 출력)입니다.
+
+이 정보를 ARS(자동응답서비스)에서 의료진이 전화를 통해 들었을 때,
+
+한 번에 핵심 내용을 이해할 수 있도록 **자연스럽고 명확한 한국어 문장**으로 변환하세요.
+
+요구사항:
+
+1. SBAR 순서 유지 + 핵심 먼저
+
+   - 전체 정보는 기본적으로 S(상황) → B(배경) → A(평가) → R(권고) 순서로 전달되도록 유지합니다.
+
+   - 문장 앞부분에는 **프리케이타스 등급, 생명 위협 여부, 주요 의심 질환** 등 가장 중요한 정보를 먼저 배치합니다.
+
+2. Pre-KTAS 표기
+
+   - "Pre-KTAS"는 반드시 "프리케이타스"로 발음 기반 한글 표기를 사용합니다.
+
+3. 의학 용어 처리
+
+   - BP, HR, RR, SpO2, GCS, FAST, CPR, ROSC 등 의학 약어는 **그대로 유지**합니다.
+
+4. 숫자·시간 표현
+
+   - 숫자와 시간은 **의미가 명확하게 들리도록** 표현합니다.
+
+5. 문장 길이와 개수
+
+   - 한 문장은 대략 **8~12초 안에 읽을 수 있는 길이**를 목표로 합니다.
+
+   - 너무 길다고 판단되면 **최대 2~3문장**으로 나누세요.
+
+6. 문체
+
+   - 항상 정중하고 전문적인 **존댓말**로 작성합니다. ("입니다", "합니다")
+
+입력 (SBAR 형식 정보):
+
+{sbar_summary}
+
+위 요구사항을 반영하여, ARS 음성 안내용으로 자연스럽고 명확한 문장으로 변환:"""
+
+
+# 구조화 출력 1회 호출에서 앞 단계 결과 자리에 넣는 표시 (모델이 같은 응답 안에서 앞 필드를 이어 사용)
+_STRUCTURED_TEXT_REF = "(1단계 결과: 출력 JSON의 text 필드 내용)"
+_STRUCTURED_SBAR_REF = "(2단계 결과: 출력 JSON의 sbar_summary 필드 내용)"
+
+STRUCTURED_SYSTEM = f"""너는 아래 세 역할을 순서대로 수행하여 결과를 하나의 JSON 객체로 출력한다.
+
+[1단계 - text 필드]
+
+{TRANSLATION_SYSTEM}
+
+[2단계 - sbar_summary 필드]
+
+{SBAR_SYSTEM}
+
+[3단계 - ars_narrative 필드]
+
+{ARS_SYSTEM}
+
+- 각 단계는 바로 앞 단계의 결과만을 입력으로 사용한다.
+
+- 출력은 text, sbar_summary, ars_narrative 세 필드만 가진 JSON 객체이며, 각 필드에는 해당 단계의 결과 문장만 넣는다."""
+
+STRUCTURED_OUTPUT_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "stt_sbar_pipeline",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "text": {"type": "string", "description": "1단계: 의학 용어만 영어로 변환한 전체 보고 문장"},
+                "sbar_summary": {"type": "string", "description": "2단계: Pre-KTAS를 맨 앞에 둔 SBAR 요약 문장"},
+                "ars_narrative": {"type": "string", "description": "3단계: ARS 음성 안내용 문장"},
+            },
+            "required": ["text", "sbar_summary", "ars_narrative"],
+            "additionalProperties": False,
+        },
+    },
+}
+_OUTPUT_FIELDS = ("text", "sbar_summary", "ars_narrative")
+
+
+class SttPrompts:
+    """입력 종류별 단계 메시지 (음성 입력은 상세 규칙, 텍스트 입력은 축약 규칙)"""
+
+    def __init__(self, name: str, sbar_prompt: Callable[[str], str], ars_prompt: Callable[[str], str]):
+        self.name = name
+        self.sbar_prompt = sbar_prompt
+        self.ars_prompt = ars_prompt
+
+    def translation_messages(self, text: str) -> List[Dict[str, str]]:
+        return [{"role": "system", "content": TRANSLATION_SYSTEM}, {"role": "user", "content": translation_prompt(text)}]
+
+    def sbar_messages(self, translated_text: str) -> List[Dict[str, str]]:
+        return [{"role": "system", "content": SBAR_SYSTEM}, {"role": "user", "content": self.sbar_prompt(translated_text)}]
+
+    def ars_messages(self, sbar_summary: str) -> List[Dict[str, str]]:
+        return [{"role": "system", "content": ARS_SYSTEM}, {"role": "user", "content": self.ars_prompt(sbar_summary)}]
+
+    def structured_messages(self, text: str) -> List[Dict[str, str]]:
+        """세 단계 사용자 프롬프트를 이어 붙인 구조화 출력용 메시지 (앞 단계 결과 자리는 필드 참조로 대체)"""
+        user = "\n\n".join((
+            "[1단계 - text 필드]", translation_prompt(text),
+            "[2단계 - sbar_summary 필드]", self.sbar_prompt(_STRUCTURED_TEXT_REF),
+            "[3단계 - ars_narrative 필드]", self.ars_prompt(_STRUCTURED_SBAR_REF),
+            "위 세 단계를 순서대로 수행하여 text, sbar_summary, ars_narrative 필드를 가진 JSON 객체로 출력:",
+        ))
+        return [{"role": "system", "content": STRUCTURED_SYSTEM}, {"role": "user", "content": user}]
+
+
+VOICE_PROMPTS = SttPrompts("voice", voice_sbar_prompt, voice_ars_prompt)
+TEXT_PROMPTS = SttPrompts("text", text_sbar_prompt, text_ars_prompt)
+
+
+def _usage(completion: Any) -> Dict[str, int]:
+    usage = getattr(completion, "usage", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+
+
+def _add_usage(total: Dict[str, int], completion: Any) -> None:
+    for key, value in _usage(completion).items():
+        total[key] += value
+
+
+def _record_usage(mode: str, usage: Dict[str, int]) -> None:
+    STT_LLM_TOKENS.inc(mode, "prompt", amount=usage["prompt_tokens"])
+    STT_LLM_TOKENS.inc(mode, "completion", amount=usage["completion_tokens"])
+
+
+def run_staged_pipeline(openai_client, text: str, prompts: SttPrompts) -> Dict[str, Any]:
+    """번역 → SBAR → ARS 3회 호출 (번역/SBAR 오류는 예외 전파, ARS 오류 시 SBAR 원본 사용)"""
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+
+    print(f"[STT] {STT_STAGED_MODEL} 의학용어 번역 시작...")
+    with span("stt_translate"):
+        completion = run_blocking_io(openai_client.chat.completions.create,
+            model=STT_STAGED_MODEL,
+            messages=prompts.translation_messages(text),
+            temperature=0.2
+        )
+    _add_usage(usage, completion)
+    translated_text = completion.choices[0].message.content
+    print(f"[STT] 의학용어 번역 완료: {translated_text[:50]}...")
+
+    print("[STT] SBAR 형식 변환 시작...")
+    with span("stt_sbar"):
+        sbar_completion = run_blocking_io(openai_client.chat.completions.create,
+            model=STT_STAGED_MODEL,
+            messages=prompts.sbar_messages(translated_text),
+            temperature=0.3
+        )
+    _add_usage(usage, sbar_completion)
+    sbar_summary = sbar_completion.choices[0].message.content
+    print(f"[STT] SBAR 구조화 완료: {sbar_summary[:100]}...")
+
+    print("[STT] SBAR → 자연스러운 문장 변환 시작...")
+    try:
+        with span("stt_ars"):
+            ars_narrative_completion = run_blocking_io(openai_client.chat.completions.create,
+                model=STT_STAGED_MODEL,
+                messages=prompts.ars_messages(sbar_summary),
+                temperature=0.4
+            )
+        _add_usage(usage, ars_narrative_completion)
+        ars_narrative = ars_narrative_completion.choices[0].message.content
+        print(f"[STT] ARS 문장 변환 완료: {ars_narrative[:100]}...")
+    except Exception as narrative_error:
+        print(f"[STT] ARS 문장 변환 오류: {type(narrative_error).__name__}: {str(narrative_error)}")
+        # 에러 발생 시 SBAR 원본 사용
+        ars_narrative = sbar_summary
+
+    _record_usage("staged", usage)
+    return {"text": translated_text, "sbar_summary": sbar_summary, "ars_narrative": ars_narrative,
+            "mode": "staged", "usage": usage}
+
+
+def parse_structured_output(completion: Any) -> Optional[Dict[str, str]]:
+    """구조화 출력 검증: 정상 종료, 거부 없음, 세 필드 모두 비어 있지 않은 문자열 (실패 시 None)"""
+    choice = completion.choices[0]
+    if getattr(choice, "finish_reason", "stop") != "stop" or getattr(choice.message, "refusal", None):
+        return None
+    try:
+        data = json.loads(choice.message.content or "")
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    result = {}
+    for field in _OUTPUT_FIELDS:
+        value = data.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        result[field] = value.strip()
+    return result
+
+
+def run_structured_pipeline(openai_client, text: str, prompts: SttPrompts) -> Optional[Dict[str, Any]]:
+    """구조화 출력 1회 호출 (호출 오류나 검증 실패 시 None)"""
+    print(f"[STT] {STT_STRUCTURED_MODEL} 구조화 출력 변환 시작...")
+    try:
+        with span("stt_structured"):
+            completion = run_blocking_io(openai_client.chat.completions.create,
+                model=STT_STRUCTURED_MODEL,
+                messages=prompts.structured_messages(text),
+                response_format=STRUCTURED_OUTPUT_FORMAT,
+                temperature=0.2
+            )
+    except Exception as e:
+        print(f"[STT] 구조화 출력 호출 오류: {type(e).__name__}: {str(e)}")
+        return None
+    usage = _usage(completion)
+    _record_usage("structured", usage)
+    result = parse_structured_output(completion)
+    if result is None:
+        print("[STT] 구조화 출력 검증 실패")
+        return None
+    print(f"[STT] 구조화 출력 변환 완료: {result['sbar_summary'][:100]}...")
+    result.update(mode="structured", usage=usage)
+    return result
+
+
+def run_stt_pipeline(openai_client, text: str, prompts: SttPrompts, mode: Optional[str] = None) -> Dict[str, Any]:
+    """설정(STT_PIPELINE_MODE) 또는 요청별 모드로 후처리 실행, structured 실패 시 staged로 대체"""
+    mode = mode if mode in PIPELINE_MODES else STT_PIPELINE_MODE
+    if mode == "structured":
+        result = run_structured_pipeline(openai_client, text, prompts)
+        if result is not None:
+            STT_PIPELINE_RUNS.inc("structured", "ok")
+            return result
+        STT_PIPELINE_RUNS.inc("structured", "fallback")
+        print("[STT] 단계별 변환으로 대체")
+    result = run_staged_pipeline(openai_client, text, prompts)
+    STT_PIPELINE_RUNS.inc("staged", "ok")
+    return result
+
+
+def _stream_completion(openai_client, messages: List[Dict[str, str]], temperature: float,
+                       usage: Dict[str, int]) -> Iterator[str]:
+    """채팅 완성 스트리밍: 생성된 토큰 조각을 순서대로 반환 (중단 시 업스트림 스트림도 닫음)"""
+    stream = run_blocking_io(openai_client.chat.completions.create,
+        model=STT_STAGED_MODEL,
+        messages=messages,
+        temperature=temperature,
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    try:
+        for chunk in iterate_blocking_io(stream):
+            if getattr(chunk, "usage", None) is not None:
+                _add_usage(usage, chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            run_blocking_io(close)
+
+
+def stream_staged_pipeline(openai_client, text: str, prompts: SttPrompts) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """staged 경로 스트리밍 (이벤트, 데이터) 반복
+
+    - ("delta", {"stage": "text" | "sbar_summary", "content": 토큰 조각})
+    - ("stage", {"stage": "text" | "sbar_summary" | "ars_narrative", "content": 단계 전체 결과})
+    - ("done", run_staged_pipeline과 같은 결과)
+    번역/SBAR 오류는 예외 전파, ARS는 스트리밍하지 않고 완성 후 한 번에 전달 (오류 시 SBAR 원본)
+    """
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+
+    parts = []
+    with span("stt_translate"):
+        for content in _stream_completion(openai_client, prompts.translation_messages(text), 0.2, usage):
+            parts.append(content)
+            yield "delta", {"stage": "text", "content": content}
+    translated_text = "".join(parts)
+    print(f"[STT] 의학용어 번역 완료: {translated_text[:50]}...")
+    yield "stage", {"stage": "text", "content": translated_text}
+
+    parts = []
+    with span("stt_sbar"):
+        for content in _stream_completion(openai_client, prompts.sbar_messages(translated_text), 0.3, usage):
+            parts.append(content)
+            yield "delta", {"stage": "sbar_summary", "content": content}
+    sbar_summary = "".join(parts)
+    print(f"[STT] SBAR 구조화 완료: {sbar_summary[:100]}...")
+    yield "stage", {"stage": "sbar_summary", "content": sbar_summary}
+
+    try:
+        with span("stt_ars"):
+            ars_narrative_completion = run_blocking_io(openai_client.chat.completions.create,
+                model=STT_STAGED_MODEL,
+                messages=prompts.ars_messages(sbar_summary),
+                temperature=0.4
+            )
+        _add_usage(usage, ars_narrative_completion)
+        ars_narrative = ars_narrative_completion.choices[0].message.content
+    except Exception as narrative_error:
+        print(f"[STT] ARS 문장 변환 오류: {type(narrative_error).__name__}: {str(narrative_error)}")
+        # 에러 발생 시 SBAR 원본 사용
+        ars_narrative = sbar_summary
+    yield "stage", {"stage": "ars_narrative", "content": ars_narrative}
+
+    _record_usage("staged", usage)
+    STT_PIPELINE_RUNS.inc("staged_stream", "ok")
+    yield "done", {"text": translated_text, "sbar_summary": sbar_summary, "ars_narrative": ars_narrative,
+                   "mode": "staged", "usage": usage}
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""인메모리 캐시 유틸리티 (TTL + LRU)"""
+
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+# 생성된 모든 캐시 (지표 수집용)
+_CACHES: List["TTLCache"] = []
+
+# 스냅샷 파일 형식: 헤더 + zlib 압축한 pickle (헤더가 없으면 이전 형식의 pickle 그대로)
+_SNAPSHOT_MAGIC = b"TTLCACHE1\n"
+
+
+class TTLCache:
+    """만료 시간(TTL)과 최대 크기(LRU 제거)를 가진 스레드 안전 캐시"""
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 60.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # 변경 횟수 (스냅샷 저장 시 바뀐 캐시만 저장하기 위해 사용)
+        self.writes = 0
+        _CACHES.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 조회 (만료된 항목은 제거 후 miss 처리)"""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """캐시 저장 (최대 크기 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            self.writes += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.writes += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.writes += 1
+
+    def dump(self, path: Union[str, Path], compress: bool = True) -> int:
+        """만료되지 않은 항목을 파일로 저장 (임시 파일에 쓴 뒤 교체하여 원자적으로 저장)"""
+        now = time.time()
+        with self._lock:
+            items = [(k, v, exp) for k, (v, exp) in self._data.items() if exp > now]
+        payload = pickle.dumps({"name": self.name, "saved_at": now, "items": items}, protocol=pickle.HIGHEST_PROTOCOL)
+        if compress:
+            payload = _SNAPSHOT_MAGIC + zlib.compress(payload, 1)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return len(items)
+
+    def load(self, path: Union[str, Path], max_age: Optional[float] = None) -> int:
+        """dump()로 저장한 파일에서 항목 복원 (만료된 항목은 건너뛰고, 저장 후 max_age초가 지난 파일은 무시)"""
+        path = Path(path)
+        if not path.exists():
+            return 0
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+            if payload.startswith(_SNAPSHOT_MAGIC):
+                payload = zlib.decompress(payload[len(_SNAPSHOT_MAGIC):])
+            snapshot = pickle.loads(payload)
+        except Exception as e:
+            print(f"캐시 파일 로드 실패 ({self.name}): {e}")
+            return 0
+        if snapshot.get("name", self.name) != self.name:
+            print(f"캐시 파일 이름이 달라 무시합니다 ({self.name}): {snapshot.get('name')}")
+            return 0
+        now = time.time()
+        if max_age is not None and now - snapshot.get("saved_at", 0.0) > max_age:
+            print(f"캐시 파일이 오래되어 무시합니다 ({self.name}): {int(now - snapshot.get('saved_at', 0.0))}초 전 저장")
+            return 0
+        loaded = 0
+        with self._lock:
+            for key, value, expires_at in snapshot.get("items", []):
+                if expires_at <= now or key in self._data:
+                    continue
+                self._data[key] = (value, expires_at)
+                loaded += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return loaded
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """히트율 등 캐시 지표"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_sec": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def all_cache_stats() -> List[Dict[str, Any]]:
+    """생성된 모든 캐시의 지표"""
+    return [cache.stats() for cache in _CACHES]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""캐시 스냅샷 저장/복원
+
+재시작(배포, 장애) 직후 빈 캐시로 시작하면 처음 몇 분 동안 모든 요청이 외부 API를 호출하므로
+병원 기본정보·등급 목록·역지오코딩·경로 캐시를 파일로 저장했다가 시작 시 복원한다.
+
+- 등록(register_cache_snapshot) 시 파일이 있으면 바로 복원
+  (CACHE_SNAPSHOT_MAX_AGE_SEC 또는 등록 시 지정한 max_age보다 오래된 파일은 무시하고,
+  항목별 TTL이 지난 항목도 건너뜀)
+- CACHE_SNAPSHOT_INTERVAL_SEC마다 지난 저장 이후 바뀐 캐시만 저장 (run_cache_snapshot_loop)
+- 프로세스 종료 시(atexit, SIGTERM 포함) 한 번 더 저장
+- 캐시가 아닌 파일 저장(ETA 학습 기록 등)도 register_snapshot_saver로 등록하면 같은 주기에 요청 경로 밖에서 저장
+
+파일 형식은 TTLCache.dump() 참고 (zlib 압축한 pickle, 임시 파일에 쓴 뒤 교체).
+"""
+
+import atexit
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from config import CACHE_SNAPSHOT_DIR, CACHE_SNAPSHOT_INTERVAL_SEC, CACHE_SNAPSHOT_MAX_AGE_SEC
+from utils.cache import TTLCache
+from utils.concurrency import run_blocking_io
+
+
+class _SnapshotEntry:
+    def __init__(self, cache: TTLCache, path: Path, max_age: float):
+        self.cache = cache
+        self.path = path
+        self.max_age = max_age
+        self.saved_writes = cache.writes
+        self.loaded = 0
+        self.saved = 0
+        self.saved_at: Optional[float] = None
+
+
+class CacheSnapshotRegistry:
+    """파일로 저장/복원할 캐시 목록"""
+
+    def __init__(self, directory: Path = CACHE_SNAPSHOT_DIR, max_age: float = CACHE_SNAPSHOT_MAX_AGE_SEC):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self._entries: List[_SnapshotEntry] = []
+        self._savers: List[Tuple[str, Callable[[], Any]]] = []
+        self._lock = threading.Lock()
+        # 주기 저장과 종료 시 저장이 같은 임시 파일에 동시에 쓰지 않도록 직렬화
+        self._save_lock = threading.Lock()
+
+    def register(self, cache: TTLCache, path: Optional[Union[str, Path]] = None,
+                 max_age: Optional[float] = None) -> int:
+        """캐시 등록 후 저장된 파일에서 복원 - 복원한 항목 수 반환 (max_age: 이보다 오래된 파일은 무시)"""
+        entry = _SnapshotEntry(cache, Path(path) if path else self.directory / f"{cache.name}.cache",
+                               self.max_age if max_age is None else max_age)
+        try:
+            entry.loaded = cache.load(entry.path, max_age=entry.max_age)
+        except Exception as e:
+            print(f"캐시 스냅샷 복원 오류 ({cache.name}): {e}")
+        # 복원한 항목은 이미 파일에 있으므로 다음 저장 대상에서 제외
+        entry.saved_writes = cache.writes
+        with self._lock:
+            self._entries.append(entry)
+        if entry.loaded:
+            print(f"♻️ 캐시 스냅샷 복원 ({cache.name}): {entry.loaded}개")
+        return entry.loaded
+
+    def register_saver(self, name: str, fn: Callable[[], Any]) -> None:
+        """캐시 저장 주기마다(종료 시 포함) 함께 호출할 저장 함수 등록"""
+        with self._lock:
+            self._savers.append((name, fn))
+
+    def save(self, force: bool = False) -> int:
+        """지난 저장 이후 바뀐 캐시 저장 (force=True면 전부) 후 등록된 저장 함수 호출 - 저장한 캐시 수 반환"""
+        with self._lock:
+            entries = list(self._entries)
+            savers = list(self._savers)
+        saved = 0
+        with self._save_lock:
+            for entry in entries:
+                writes = entry.cache.writes
+                if not force and writes == entry.saved_writes:
+                    continue
+                try:
+                    entry.saved = entry.cache.dump(entry.path)
+                    entry.saved_writes = writes
+                    entry.saved_at = time.time()
+                    saved += 1
+                except Exception as e:
+                    print(f"캐시 스냅샷 저장 오류 ({entry.cache.name}): {e}")
+            for name, fn in savers:
+                try:
+                    fn()
+                except Exception as e:
+                    print(f"주기 저장 오류 ({name}): {e}")
+        return saved
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{
+                "name": entry.cache.name,
+                "path": str(entry.path),
+                "loaded": entry.loaded,
+                "saved": entry.saved,
+                "saved_at": int(entry.saved_at) if entry.saved_at else None,
+                "dirty": entry.cache.writes != entry.saved_writes,
+            } for entry in self._entries]
+
+
+CACHE_SNAPSHOTS = CacheSnapshotRegistry()
+
+
+def register_cache_snapshot(cache: TTLCache, path: Optional[Union[str, Path]] = None,
+                            max_age: Optional[float] = None) -> int:
+    """캐시를 스냅샷 대상으로 등록하고 저장된 파일에서 복원"""
+    return CACHE_SNAPSHOTS.register(cache, path, max_age)
+
+
+def register_snapshot_saver(name: str, fn: Callable[[], Any]) -> None:
+    """캐시 스냅샷 주기(run_cache_snapshot_loop, 종료 시)에 함께 실행할 파일 저장 함수 등록"""
+    CACHE_SNAPSHOTS.register_saver(name, fn)
+
+
+def save_cache_snapshots(force: bool = False) -> int:
+    """바뀐 캐시를 파일로 저장"""
+    return CACHE_SNAPSHOTS.save(force)
+
+
+def run_cache_snapshot_loop(sleep: Callable[[float], Any] = time.sleep,
+                            interval: float = CACHE_SNAPSHOT_INTERVAL_SEC) -> None:
+    """주기적으로 바뀐 캐시 저장 (socketio.start_background_task로 실행, 직렬화는 허브 밖에서 수행)"""
+    if interval <= 0:
+        return
+    while True:
+        sleep(interval)
+        try:
+            run_blocking_io(save_cache_snapshots)
+        except Exception as e:
+            print(f"캐시 스냅샷 저장 오류: {e}")
+
+
+def get_cache_snapshot_stats() -> List[Dict[str, Any]]:
+    return CACHE_SNAPSHOTS.stats()
+
+
+atexit.register(save_cache_snapshots)
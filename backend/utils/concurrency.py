@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""외부 I/O 실행 방식 관리 (eventlet/gevent 환경에서 허브 블로킹 방지)
+
+app.py는 eventlet.monkey_patch(socket=False)로 실행되므로
+requests/OpenAI/Twilio 호출은 실제(블로킹) 소켓을 사용한다.
+이 호출을 그대로 실행하면 응답을 기다리는 동안 eventlet 허브 전체가 멈춰
+Socket.IO 채팅 등 모든 그린스레드가 함께 멈춘다.
+
+run_blocking_io()는 현재 실행 환경에 맞게 블로킹 호출을 실행한다 (스트리밍 응답은 iterate_blocking_io()로 항목마다 위임).
+- green   : 소켓이 monkey patch된 환경 (호출 자체가 협력적이므로 그대로 실행)
+- tpool   : eventlet + 소켓 미패치 → eventlet.tpool(실제 OS 스레드 풀)로 위임
+- gevent  : gevent + 소켓 미패치 → gevent 허브 스레드 풀로 위임
+- direct  : threading 모드 (그대로 실행)
+
+병렬 조회용 executor는 new_executor()로 만든다. monkey patch 환경에서는 ThreadPoolExecutor 대신
+작업마다 그린스레드를 시작하는 GreenThreadExecutor를 돌려준다.
+"""
+
+import itertools
+import sys
+import threading
+from concurrent import futures
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, Set
+
+from config import OUTBOUND_IO_MODE
+
+IO_MODE_GREEN = "green"
+IO_MODE_TPOOL = "tpool"
+IO_MODE_GEVENT = "gevent"
+IO_MODE_DIRECT = "direct"
+
+
+def _patched_runtime() -> Optional[str]:
+    """threading을 monkey patch한 라이브러리 ("eventlet"/"gevent", 패치되지 않았으면 None)"""
+    if "eventlet" in sys.modules:
+        from eventlet import patcher
+        if patcher.is_monkey_patched("thread"):
+            return "eventlet"
+
+    gevent_monkey = sys.modules.get("gevent.monkey")
+    if gevent_monkey is not None and gevent_monkey.is_module_patched("threading"):
+        return "gevent"
+
+    return None
+
+
+def _socket_patched(runtime: str) -> bool:
+    if runtime == "eventlet":
+        from eventlet import patcher
+        return patcher.is_monkey_patched("socket")
+    return sys.modules["gevent.monkey"].is_module_patched("socket")
+
+
+def get_io_mode() -> str:
+    """현재 외부 I/O 실행 방식 (OUTBOUND_IO_MODE=auto이면 monkey patch 상태로 판단, direct이면 위임 안 함)"""
+    if OUTBOUND_IO_MODE == IO_MODE_DIRECT:
+        return IO_MODE_DIRECT
+
+    runtime = _patched_runtime()
+    if runtime is None:
+        return IO_MODE_DIRECT
+    if _socket_patched(runtime):
+        return IO_MODE_GREEN
+    return IO_MODE_TPOOL if runtime == "eventlet" else IO_MODE_GEVENT
+
+
+def run_blocking_io(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """블로킹 외부 호출 실행 (필요하면 실제 OS 스레드로 위임하여 허브를 막지 않음)"""
+    mode = get_io_mode()
+    if mode == IO_MODE_TPOOL:
+        from eventlet import tpool
+        return tpool.execute(fn, *args, **kwargs)
+    if mode == IO_MODE_GEVENT:
+        import gevent
+        return gevent.get_hub().threadpool.apply(fn, args, kwargs)
+    return fn(*args, **kwargs)
+
+
+_END = object()
+
+
+def iterate_blocking_io(iterable: Iterable[Any]) -> Iterator[Any]:
+    """블로킹 반복자(스트리밍 응답 등)의 다음 항목을 하나씩 run_blocking_io로 가져옴 (항목 사이에 허브를 막지 않음)"""
+    iterator = iter(iterable)
+    while True:
+        item = run_blocking_io(next, iterator, _END)
+        if item is _END:
+            return
+        yield item
+
+
+class GreenThreadExecutor(Executor):
+    """monkey patch 환경용 executor: 작업마다 그린스레드를 시작하고 세마포어로 동시 실행 수를 제한
+
+    ThreadPoolExecutor.submit()은 import 시점에 만들어진 모듈 전역 잠금(실제 OS 잠금)을 쥔 채 작업자를 시작한다.
+    패치 후에는 작업자 시작이 허브로 양보하므로, 그 사이 다른 그린스레드가 submit()하면 그 잠금에서 허브 전체가 멈춘다.
+    이 executor는 호출 시점의 (그린) 동기화 객체만 사용한다.
+    """
+
+    _counter = itertools.count()
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = ""):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._thread_name_prefix = thread_name_prefix or "green-executor"
+        self._pending: Set[Future] = set()
+        self._shutdown = False
+
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        future: Future = Future()
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        name = f"{self._thread_name_prefix}_{next(self._counter)}"
+        threading.Thread(target=self._run, args=(future, fn, args, kwargs), name=name, daemon=True).start()
+        return future
+
+    def _run(self, future: Future, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        with self._slots:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._shutdown = True
+        pending = list(self._pending)
+        if cancel_futures:
+            for future in pending:
+                future.cancel()
+        if wait:
+            futures.wait(pending)
+
+
+def new_executor(max_workers: int, thread_name_prefix: str = "") -> Executor:
+    """병렬 조회용 executor (monkey patch 환경이면 GreenThreadExecutor, 아니면 ThreadPoolExecutor)
+
+    작업 안의 블로킹 외부 호출은 run_blocking_io로 위임되므로 그린스레드에서 실행해도 허브를 막지 않는다.
+    monkey patch 이후(요청 처리 중 또는 첫 사용 시점)에 만들어야 한다.
+    """
+    if _patched_runtime() is not None:
+        return GreenThreadExecutor(max_workers, thread_name_prefix)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
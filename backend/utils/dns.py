@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""DNS 캐시 - 업스트림 호스트 주소를 TTL 동안 재사용하고 만료 시 한 호출자만 다시 해석
+
+전역 소켓 설정(socket.setdefaulttimeout 등)을 변경하지 않으며,
+utils/http.py의 연결 풀이 새 연결을 만들 때 이 캐시의 주소로 접속한다.
+조회는 연결을 만드는 스레드(eventlet 환경에서는 tpool의 실제 OS 스레드)에서 getaddrinfo를 바로 호출하므로
+별도 executor를 두지 않는다 (패치 전에 만든 executor에 OS 스레드에서 작업을 넘기면 그린 작업자와 엇갈려 멈춤).
+"""
+
+import ipaddress
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import DNS_CACHE_TTL_SEC
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
+
+
+class DNSCache:
+    """호스트 → IP 주소 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL_SEC):
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _host_stats(self, host: str) -> Dict[str, float]:
+        stats = self._stats.get(host)
+        if stats is None:
+            stats = self._stats[host] = {
+                "lookups": 0, "hits": 0, "stale_hits": 0, "resolutions": 0, "failures": 0,
+                "latency_ms_total": 0.0, "latency_ms_max": 0.0, "latency_ms_last": 0.0,
+            }
+        return stats
+
+    def _resolve(self, host: str) -> Optional[List[str]]:
+        """getaddrinfo로 주소 조회 후 캐시에 저장 (지연 시간 지표 기록)"""
+        started = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            addrs = list(dict.fromkeys(info[4][0] for info in infos))
+        except OSError:
+            addrs = []
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self._host_stats(host)
+            stats["resolutions"] += 1
+            stats["latency_ms_total"] += elapsed_ms
+            stats["latency_ms_last"] = elapsed_ms
+            stats["latency_ms_max"] = max(stats["latency_ms_max"], elapsed_ms)
+            if not addrs:
+                stats["failures"] += 1
+                return None
+            self._entries[host] = {"addrs": addrs, "expires_at": time.time() + self.ttl}
+        return addrs
+
+    def _claim_refresh(self, host: str) -> bool:
+        """만료된 호스트의 재해석을 맡을 호출자인지 (이미 다른 호출자가 해석 중이면 False)"""
+        with self._lock:
+            if host in self._refreshing:
+                return False
+            self._refreshing.add(host)
+            return True
+
+    def _refresh(self, host: str) -> Optional[List[str]]:
+        try:
+            return self._resolve(host)
+        finally:
+            with self._lock:
+                self._refreshing.discard(host)
+
+    def lookup(self, host: str) -> Optional[str]:
+        """호스트의 IP 주소 (만료된 항목은 한 호출자만 다시 해석하고 나머지는 기존 주소 사용, 실패 시 None)"""
+        if not host or _is_ip_literal(host):
+            return host
+        now = time.time()
+        with self._lock:
+            stats = self._host_stats(host)
+            stats["lookups"] += 1
+            entry = self._entries.get(host)
+            if entry is not None:
+                if entry["expires_at"] > now:
+                    stats["hits"] += 1
+                    return entry["addrs"][0]
+                stats["stale_hits"] += 1
+        if entry is not None and not self._claim_refresh(host):
+            return entry["addrs"][0]
+        addrs = self._refresh(host) if entry is not None else self._resolve(host)
+        if addrs:
+            return addrs[0]
+        # 재해석 실패 시 기존 주소로 접속 시도 (연결까지 실패하면 http.py에서 invalidate 후 기본 해석)
+        return entry["addrs"][0] if entry is not None else None
+
+    def invalidate(self, host: str) -> None:
+        """연결 실패한 주소 제거 (다음 요청 시 다시 해석)"""
+        with self._lock:
+            self._entries.pop(host, None)
+
+    def prime(self, hosts: Iterable[str]) -> None:
+        """업스트림 호스트를 데몬 스레드 하나에서 미리 해석 (app.py import 시점, monkey patch 전에 호출)"""
+        targets = [host for host in hosts if host and not _is_ip_literal(host)]
+        if not targets:
+            return
+
+        def _task():
+            for host in targets:
+                if self._claim_refresh(host):
+                    self._refresh(host)
+
+        threading.Thread(target=_task, name="dns-prime", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        """호스트별 조회/해석 횟수 및 해석 지연 시간(ms) 지표"""
+        now = time.time()
+        with self._lock:
+            result = {}
+            for host, stats in self._stats.items():
+                entry = self._entries.get(host)
+                resolutions = stats["resolutions"]
+                result[host] = dict(
+                    stats,
+                    latency_ms_avg=round(stats["latency_ms_total"] / resolutions, 3) if resolutions else 0.0,
+                    cached_addrs=entry["addrs"] if entry else [],
+                    ttl_remaining_sec=max(0, int(entry["expires_at"] - now)) if entry else 0,
+                )
+            return result
+
+
+DNS_CACHE = DNSCache()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""로컬 ETA 추정기 - 카카오 길찾기 기록으로 학습한 룩업 테이블
+
+특징: (직선거리 구간, 출발지 지역 셀, 요일·시간대) → 직선거리 1km당 소요 시간(분)
+- 학습: scripts/train_eta_model.py 가 ETA_SAMPLE_LOG_PATH의 기록으로 ETA_MODEL_PATH(.npz) 생성
+  (기록은 ETA_SAMPLE_LOG_PATH를 지정한 경우에만, 좌표를 지역 셀 단위로 낮춰 메모리에 모았다가 캐시 스냅샷 주기에 저장)
+- 모델 파일이나 numpy가 없으면 기존 고정식(도로 계수 1.3, 평균 40km/h)으로 추정
+"""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from config import ETA_MODEL_PATH, ETA_SAMPLE_LOG_PATH
+from utils.cache_snapshot import register_snapshot_saver
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 직선거리 구간 경계 (km) - 마지막 구간은 상한 없음
+DIST_EDGES = (0.0, 2.0, 5.0, 10.0, 20.0, 40.0, 80.0)
+# 지역 셀 크기 (도) - 약 25km 격자
+REGION_CELL_DEG = 0.25
+HOURS_PER_WEEK = 168
+# 기존 고정식: 도로 계수 1.3, 평균 40km/h → 직선거리 1km당 1.95분
+DEFAULT_MIN_PER_KM = 1.3 / 40 * 60
+
+
+def region_cell(lat: float, lon: float) -> Tuple[int, int]:
+    """출발지 좌표 → 지역 셀 인덱스"""
+    return int(math.floor(lat / REGION_CELL_DEG)), int(math.floor(lon / REGION_CELL_DEG))
+
+
+def hour_of_week(ts: Optional[float] = None) -> int:
+    """요일·시간대 인덱스 (월요일 0시 = 0, 서버 로컬 시간 기준)"""
+    t = time.localtime(ts if ts is not None else time.time())
+    return t.tm_wday * 24 + t.tm_hour
+
+
+def fallback_eta_minutes(distance_km: float) -> int:
+    """기존 고정식 ETA (분)"""
+    return int(distance_km * DEFAULT_MIN_PER_KM)
+
+
+class EtaModel:
+    """(지역 셀 + 전역) × 거리 구간 × 요일·시간대 룩업 테이블"""
+
+    def __init__(self, table, cells: Sequence[Sequence[int]]):
+        # table[0]은 전역 테이블, table[i + 1]은 cells[i] 지역 테이블
+        self.table = table
+        self.cell_index: Dict[Tuple[int, int], int] = {
+            (int(c[0]), int(c[1])): i + 1 for i, c in enumerate(cells)
+        }
+        self.dist_edges = np.asarray(DIST_EDGES, dtype=np.float64)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["EtaModel"]:
+        if np is None or not Path(path).exists():
+            return None
+        with np.load(path) as data:
+            return cls(data["table"], data["cells"].tolist())
+
+    def estimate(self, distances_km: Sequence[float], origin_lat: float, origin_lon: float,
+                 ts: Optional[float] = None) -> List[int]:
+        """출발지 1곳 → 여러 목적지의 ETA(분) 벡터 계산"""
+        dists = np.asarray(distances_km, dtype=np.float64)
+        finite = np.isfinite(dists)
+        safe = np.where(finite, dists, 0.0)
+        d_idx = np.clip(np.searchsorted(self.dist_edges, safe, side="right") - 1, 0, len(DIST_EDGES) - 1)
+        r_idx = self.cell_index.get(region_cell(origin_lat, origin_lon), 0)
+        minutes = self.table[r_idx, d_idx, hour_of_week(ts)] * safe
+        return [int(m) if ok else None for m, ok in zip(minutes.tolist(), finite.tolist())]
+
+
+_model: Optional[EtaModel] = None
+_model_loaded = False
+_model_lock = threading.Lock()
+# 저장 전 학습 기록 (요청 경로에서는 메모리에만 추가, 파일 쓰기는 flush_eta_samples가 캐시 스냅샷 주기에 수행)
+# 저장이 밀려도 메모리가 늘지 않도록 최근 ETA_SAMPLE_BUFFER_MAX개만 보관
+ETA_SAMPLE_BUFFER_MAX = 10000
+_pending_samples: Deque[str] = deque(maxlen=ETA_SAMPLE_BUFFER_MAX)
+
+
+def get_eta_model() -> Optional[EtaModel]:
+    """학습된 ETA 모델 싱글톤 (없으면 None)"""
+    global _model, _model_loaded
+    if _model_loaded:
+        return _model
+    with _model_lock:
+        if not _model_loaded:
+            try:
+                _model = EtaModel.load(ETA_MODEL_PATH)
+            except Exception as e:
+                print(f"ETA 모델 로드 오류: {e}")
+                _model = None
+            _model_loaded = True
+    return _model
+
+
+def estimate_eta_minutes_batch(distances_km: Sequence[float], origin_lat: float, origin_lon: float) -> List[Optional[int]]:
+    """직선거리 목록 → ETA(분) 목록 (거리가 무한대/NaN이면 None)"""
+    model = get_eta_model()
+    if model is not None:
+        return model.estimate(distances_km, origin_lat, origin_lon)
+    return [fallback_eta_minutes(d) if math.isfinite(d) else None for d in distances_km]
+
+
+def estimate_eta_minutes(distance_km: float, origin_lat: float, origin_lon: float) -> Optional[int]:
+    """직선거리 → ETA(분)"""
+    return estimate_eta_minutes_batch([distance_km], origin_lat, origin_lon)[0]
+
+
+def snap_to_cell(value: float) -> float:
+    """좌표를 지역 셀 경계(REGION_CELL_DEG 단위)로 내림 - 학습에 쓰는 셀은 그대로이고 정확한 위치는 남기지 않음"""
+    return math.floor(value / REGION_CELL_DEG) * REGION_CELL_DEG
+
+
+def record_eta_sample(origin_lat: float, origin_lon: float, dest_lat: float, dest_lon: float,
+                      straight_km: float, route_km: float, duration_min: float) -> None:
+    """카카오 길찾기 결과를 학습용 기록 대기열에 추가 (ETA_SAMPLE_LOG_PATH가 빈 값이면 기록 안 함)"""
+    if not ETA_SAMPLE_LOG_PATH:
+        return
+    row = {
+        "ts": int(time.time()),
+        "how": hour_of_week(),
+        "o_lat": snap_to_cell(origin_lat),
+        "o_lon": snap_to_cell(origin_lon),
+        "d_lat": snap_to_cell(dest_lat),
+        "d_lon": snap_to_cell(dest_lon),
+        "straight_km": round(straight_km, 3),
+        "route_km": round(route_km, 3),
+        "duration_min": round(duration_min, 2),
+    }
+    _pending_samples.append(json.dumps(row))
+
+
+def flush_eta_samples() -> int:
+    """대기 중인 학습 기록을 ETA_SAMPLE_LOG_PATH(JSON Lines)에 추가 - 저장한 줄 수 반환"""
+    lines = []
+    while _pending_samples:
+        try:
+            lines.append(_pending_samples.popleft())
+        except IndexError:
+            break
+    if not lines:
+        return 0
+    path = Path(ETA_SAMPLE_LOG_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return len(lines)
+
+
+if ETA_SAMPLE_LOG_PATH:
+    register_snapshot_saver("eta_samples", flush_eta_samples)
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""업스트림 지연/장애 주입 (시험 환경 전용, 기본 꺼짐)
+
+FAULT_INJECTION(JSON 문자열) 또는 FAULT_INJECTION_PATH(JSON 파일)에 호스트별 규칙을 지정하면
+utils.http 공유 세션(data.go.kr, 카카오)과 OpenAI 클라이언트의 외부 호출에 장애를 주입한다.
+
+    {
+      "apis.data.go.kr": {
+        "latency_ms": {"dist": "lognormal", "p50": 400, "p95": 2500},
+        "error_rate": 0.05, "error_status": [500, 503],
+        "connect_error_rate": 0.01, "timeout_rate": 0.01,
+        "truncate_rate": 0.05,
+        "drip_rate": 0.1, "drip_bytes_per_sec": 2048
+      },
+      "api.openai.com": {"latency_ms": {"dist": "uniform", "min": 500, "max": 3000}, "error_rate": 0.02},
+      "*": {"latency_ms": 50}
+    }
+
+- latency_ms: 숫자(고정) 또는 {"dist": fixed(ms) | uniform(min, max) | lognormal(p50, p95) | exponential(mean)}
+  첫 바이트까지의 지연이 읽기 타임아웃보다 길면 타임아웃 예외
+- error_rate / error_status: 업스트림을 호출하지 않고 오류 상태 코드 응답 (목록이면 무작위 선택, 기본 503)
+- connect_error_rate: 연결 실패 예외, timeout_rate: 읽기 타임아웃만큼 기다린 뒤 타임아웃 예외
+- truncate_rate: 실제 응답 본문을 10~90% 지점에서 잘라 반환 (깨진 XML/JSON)
+- drip_rate / drip_bytes_per_sec: 본문을 느리게 전송 (읽기 타임아웃은 바이트 사이 간격에만 적용되므로
+  타임아웃 없이 전체 응답 시간만 늘어남, 최대 drip_max_ms)
+
+주입 단계는 requests 어댑터 바깥이므로 urllib3 자동 재시도는 주입된 장애를 보지 못하고,
+http_get의 수동 재시도와 OpenAI 클라이언트 자체 재시도만 동작한다.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from config import FAULT_INJECTION, FAULT_INJECTION_PATH, FAULT_INJECTION_SEED
+from utils.metrics import Counter, register_metric
+
+try:
+    import httpx
+except ImportError:  # OpenAI 패키지(httpx 사용)가 없으면 requests 세션에만 주입
+    httpx = None
+
+FAULT_INJECTIONS = register_metric(Counter(
+    "fault_injections_total", "Injected upstream faults by host and kind", ("host", "kind")))
+
+FAULT_CONNECT_ERROR = "connect_error"
+FAULT_TIMEOUT = "timeout"
+FAULT_ERROR = "error"
+FAULT_TRUNCATE = "truncate"
+FAULT_DRIP = "drip"
+
+# 한 번의 난수로 장애 종류를 고르는 순서 (비율 합이 1을 넘으면 뒤쪽이 잘림)
+_FAULT_ORDER = (
+    (FAULT_CONNECT_ERROR, "connect_error_rate"),
+    (FAULT_TIMEOUT, "timeout_rate"),
+    (FAULT_ERROR, "error_rate"),
+    (FAULT_TRUNCATE, "truncate_rate"),
+    (FAULT_DRIP, "drip_rate"),
+)
+
+# 타임아웃이 지정되지 않은 호출에서 timeout 장애가 기다리는 시간(초)
+_DEFAULT_HANG_SEC = 30.0
+
+
+class FaultRule:
+    """호스트 하나의 장애 주입 규칙"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.latency = spec.get("latency_ms", 0)
+        self.rates = {kind: float(spec.get(key, 0.0)) for kind, key in _FAULT_ORDER}
+        status = spec.get("error_status", 503)
+        self.error_statuses = [int(s) for s in (status if isinstance(status, list) else [status])]
+        self.drip_bytes_per_sec = max(1.0, float(spec.get("drip_bytes_per_sec", 1024)))
+        self.drip_max_sec = float(spec.get("drip_max_ms", 60000)) / 1000.0
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """첫 바이트까지 추가 지연(초)"""
+        spec = self.latency
+        if not spec:
+            return 0.0
+        if isinstance(spec, (int, float)):
+            return float(spec) / 1000.0
+        dist = spec.get("dist", "fixed")
+        if dist == "uniform":
+            ms = rng.uniform(float(spec.get("min", 0)), float(spec.get("max", 0)))
+        elif dist == "lognormal":
+            p50 = max(float(spec.get("p50", 1)), 1e-3)
+            p95 = max(float(spec.get("p95", p50)), p50)
+            ms = rng.lognormvariate(math.log(p50), (math.log(p95) - math.log(p50)) / 1.6449)
+        elif dist == "exponential":
+            ms = rng.expovariate(1.0 / max(float(spec.get("mean", 1)), 1e-3))
+        else:
+            ms = float(spec.get("ms", 0))
+        return max(0.0, ms) / 1000.0
+
+
+class FaultDecision:
+    """요청 1건에 주입할 장애 (kind가 None이면 지연만)"""
+
+    def __init__(self, host: str, rule: FaultRule, kind: Optional[str], latency: float, rng: random.Random):
+        self.host = host
+        self.rule = rule
+        self.kind = kind
+        self.latency = latency
+        self.error_status = rng.choice(rule.error_statuses)
+        self.truncate_ratio = rng.uniform(0.1, 0.9)
+
+    def drip_seconds(self, nbytes: int) -> float:
+        return min(nbytes / self.rule.drip_bytes_per_sec, self.rule.drip_max_sec)
+
+
+class FaultPlan:
+    """호스트별 장애 주입 규칙 모음 ("*"는 나머지 모든 호스트)"""
+
+    def __init__(self, spec: Dict[str, Dict[str, Any]], seed: Optional[int] = None):
+        self.rules = {host: FaultRule(rule) for host, rule in spec.items()}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts: Dict[Tuple[str, str], int] = {}
+
+    def rule_for(self, url: str) -> Tuple[str, Optional[FaultRule]]:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        rule = self.rules.get(parts.netloc) or self.rules.get(host) or self.rules.get("*")
+        return host, rule
+
+    def decide(self, url: str) -> Optional[FaultDecision]:
+        """요청 1건의 장애 결정 (규칙이 없는 호스트면 None)"""
+        host, rule = self.rule_for(url)
+        if rule is None:
+            return None
+        with self._lock:
+            r = self._rng.random()
+            kind = None
+            acc = 0.0
+            for name, _ in _FAULT_ORDER:
+                acc += rule.rates[name]
+                if r < acc:
+                    kind = name
+                    break
+            decision = FaultDecision(host, rule, kind, rule.sample_latency(self._rng), self._rng)
+        if kind is not None:
+            self.record(host, kind)
+        if decision.latency:
+            self.record(host, "latency")
+        return decision
+
+    def record(self, host: str, kind: str) -> None:
+        FAULT_INJECTIONS.inc(host, kind)
+        with self._lock:
+            self._counts[(host, kind)] = self._counts.get((host, kind), 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """호스트별 주입 횟수 {host: {kind: 횟수}}"""
+        with self._lock:
+            result: Dict[str, Dict[str, int]] = {}
+            for (host, kind), count in sorted(self._counts.items()):
+                result.setdefault(host, {})[kind] = count
+            return result
+
+
+def _read_timeout(timeout: Any) -> Optional[float]:
+    if isinstance(timeout, tuple):
+        return timeout[1]
+    return timeout
+
+
+def _wait_first_byte(decision: FaultDecision, read_timeout: Optional[float]) -> bool:
+    """첫 바이트 지연 적용 (읽기 타임아웃을 넘으면 타임아웃만큼만 기다리고 False)"""
+    if decision.kind == FAULT_TIMEOUT:
+        time.sleep(read_timeout if read_timeout is not None else _DEFAULT_HANG_SEC)
+        return False
+    if read_timeout is not None and decision.latency > read_timeout:
+        time.sleep(read_timeout)
+        decision.kind = FAULT_TIMEOUT
+        return False
+    if decision.latency:
+        time.sleep(decision.latency)
+    return True
+
+
+class FaultInjectionAdapter(BaseAdapter):
+    """requests 세션 어댑터 래퍼: 규칙에 맞는 호스트 요청에 지연/장애를 주입하고 나머지는 원래 어댑터로 전달"""
+
+    def __init__(self, inner: BaseAdapter, plan: FaultPlan):
+        super().__init__()
+        self.inner = inner
+        self.plan = plan
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        decision = self.plan.decide(request.url)
+        kwargs = dict(stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        if decision is None:
+            return self.inner.send(request, **kwargs)
+        if decision.kind == FAULT_CONNECT_ERROR:
+            raise requests.exceptions.ConnectionError(f"injected fault: connection refused ({decision.host})",
+                                                      request=request)
+        if not _wait_first_byte(decision, _read_timeout(timeout)):
+            raise requests.exceptions.ReadTimeout(f"injected fault: read timed out ({decision.host})", request=request)
+        if decision.kind == FAULT_ERROR:
+            resp = requests.Response()
+            resp.status_code = decision.error_status
+            resp._content = b"injected fault"
+            resp.headers["Content-Type"] = "text/plain"
+            resp.url = request.url
+            resp.request = request
+            resp.reason = "Injected Fault"
+            return resp
+        resp = self.inner.send(request, **kwargs)
+        if decision.kind == FAULT_TRUNCATE:
+            body = resp.content
+            resp._content = body[:int(len(body) * decision.truncate_ratio)]
+        elif decision.kind == FAULT_DRIP:
+            time.sleep(decision.drip_seconds(len(resp.content)))
+        return resp
+
+    def close(self):
+        self.inner.close()
+
+
+if httpx is not None:
+    class FaultInjectionTransport(httpx.BaseTransport):
+        """httpx 전송 계층 래퍼 (OpenAI 클라이언트용): FaultInjectionAdapter와 같은 규칙으로 장애 주입"""
+
+        def __init__(self, inner: "httpx.BaseTransport", plan: FaultPlan):
+            self.inner = inner
+            self.plan = plan
+
+        def handle_request(self, request):
+            decision = self.plan.decide(str(request.url))
+            if decision is None:
+                return self.inner.handle_request(request)
+            if decision.kind == FAULT_CONNECT_ERROR:
+                raise httpx.ConnectError(f"injected fault: connection refused ({decision.host})", request=request)
+            read_timeout = (request.extensions.get("timeout") or {}).get("read")
+            if not _wait_first_byte(decision, read_timeout):
+                raise httpx.ReadTimeout(f"injected fault: read timed out ({decision.host})", request=request)
+            if decision.kind == FAULT_ERROR:
+                return httpx.Response(decision.error_status, request=request, json={
+                    "error": {"message": "injected fault", "type": "server_error", "code": None}})
+            response = self.inner.handle_request(request)
+            if decision.kind not in (FAULT_TRUNCATE, FAULT_DRIP):
+                return response
+            body = response.read()
+            response.close()
+            if decision.kind == FAULT_TRUNCATE:
+                body = body[:int(len(body) * decision.truncate_ratio)]
+            else:
+                time.sleep(decision.drip_seconds(len(body)))
+            headers = [(k, v) for k, v in response.headers.items()
+                       if k.lower() not in ("content-length", "content-encoding", "transfer-encoding")]
+            return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+        def close(self):
+            self.inner.close()
+
+
+_plan: Optional[FaultPlan] = None
+_plan_loaded = False
+_plan_lock = threading.Lock()
+
+
+def get_fault_plan() -> Optional[FaultPlan]:
+    """설정(FAULT_INJECTION / FAULT_INJECTION_PATH)의 장애 주입 규칙 (없으면 None)"""
+    global _plan, _plan_loaded
+    with _plan_lock:
+        if not _plan_loaded:
+            _plan_loaded = True
+            spec = None
+            try:
+                if FAULT_INJECTION_PATH:
+                    spec = json.loads(Path(FAULT_INJECTION_PATH).read_text(encoding="utf-8"))
+                elif FAULT_INJECTION:
+                    spec = json.loads(FAULT_INJECTION)
+            except Exception as e:
+                print(f"⚠️ 장애 주입 설정 오류 (장애 주입 꺼짐): {e}")
+            if spec:
+                _plan = FaultPlan(spec, seed=FAULT_INJECTION_SEED)
+                print(f"⚠️ 업스트림 장애 주입 활성화: {', '.join(sorted(spec))}")
+        return _plan
+
+
+def install_fault_injection(session: requests.Session, plan: Optional[FaultPlan] = None) -> bool:
+    """세션에 연결된 어댑터를 장애 주입 래퍼로 감쌈 (규칙이 없으면 아무것도 하지 않음)"""
+    plan = plan or get_fault_plan()
+    if plan is None:
+        return False
+    for prefix, adapter in list(session.adapters.items()):
+        if not isinstance(adapter, FaultInjectionAdapter):
+            session.mount(prefix, FaultInjectionAdapter(adapter, plan))
+    return True
+
+
+def openai_http_client(host: str = "api.openai.com"):
+    """OpenAI 클라이언트용 httpx 클라이언트 (해당 호스트 규칙이 없으면 None → OpenAI 기본 클라이언트 사용)"""
+    plan = get_fault_plan()
+    if plan is None or httpx is None or plan.rule_for(f"https://{host}/")[1] is None:
+        return None
+    try:
+        from openai import DefaultHttpxClient as client_cls
+    except ImportError:
+        client_cls = httpx.Client
+    return client_cls(transport=FaultInjectionTransport(httpx.HTTPTransport(), plan))
+
+
+def get_fault_stats() -> Dict[str, Any]:
+    """장애 주입 활성 여부와 호스트별 주입 횟수"""
+    plan = get_fault_plan()
+    return {"enabled": plan is not None, "injected": plan.stats() if plan else {}}
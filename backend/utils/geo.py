@@ -3,16 +3,48 @@
 """지오코딩 유틸리티 함수"""
 
 import math
-from typing import Optional, Tuple, List
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait, as_completed
+from typing import Optional, Tuple, List, Dict, Any, Callable, Set
 from pathlib import Path
 
 from config import (
     KAKAO_KEY, KAKAO_COORD2REGION_URL, KAKAO_COORD2ADDR_URL,
-    KAKAO_ADDRESS_URL, KAKAO_DIRECTIONS_URL
+    KAKAO_ADDRESS_URL, KAKAO_DIRECTIONS_URL,
+    ROUTE_CACHE_TTL_SEC, ROUTE_CACHE_MAXSIZE, ROUTE_CACHE_GRID_M, ROUTE_CACHE_TIME_BUCKET_MIN,
+    REVERSE_GEOCODE_GRID_M, REVERSE_GEOCODE_CACHE_TTL_SEC, REVERSE_GEOCODE_CACHE_MAXSIZE,
+    REVERSE_GEOCODE_CACHE_PATH,
+    ETA_MATRIX_PROVIDER, ETA_MATRIX_MAX_WORKERS, ETA_MATRIX_TIMEOUT_SEC,
+    GEOCODE_CACHE_TTL_SEC, GEOCODE_CACHE_MAXSIZE, GEOCODE_BATCH_MAX_WORKERS
 )
-from utils.http import http_get
+from utils.http import http_get, get_session
+from utils.concurrency import new_executor, run_blocking_io
+from utils.cache import TTLCache
+from utils.cache_snapshot import register_cache_snapshot
+from utils.region_index import lookup_region_offline
+from utils.eta_model import estimate_eta_minutes, record_eta_sample
+from utils.metrics import endpoint_label, record_upstream_call, record_upstream_cache
 import requests
 
+# 카카오 길찾기 결과 캐시 (/api/hospitals/top3 와 /api/geo/route 가 공유, 재시작 후에도 파일에서 복원)
+ROUTE_CACHE = TTLCache("kakao_route", maxsize=ROUTE_CACHE_MAXSIZE, ttl=ROUTE_CACHE_TTL_SEC)
+register_cache_snapshot(ROUTE_CACHE)
+# 진행 중인 길찾기 호출 (같은 캐시 키의 동시·후속 호출은 새로 요청하지 않고 이 결과를 기다림)
+_ROUTE_INFLIGHT: Dict[tuple, Future] = {}
+_route_inflight_lock = threading.Lock()
+
+# 역지오코딩 결과 캐시 (격자 셀 단위, 재시작 후에도 파일에서 복원)
+GEOCODE_CACHE = TTLCache("reverse_geocode", maxsize=REVERSE_GEOCODE_CACHE_MAXSIZE, ttl=REVERSE_GEOCODE_CACHE_TTL_SEC)
+register_cache_snapshot(GEOCODE_CACHE, REVERSE_GEOCODE_CACHE_PATH, max_age=REVERSE_GEOCODE_CACHE_TTL_SEC)
+
+# 주소 → 좌표 결과 캐시 (정규화한 주소 문자열 단위)
+ADDRESS_CACHE = TTLCache("address2coord", maxsize=GEOCODE_CACHE_MAXSIZE, ttl=GEOCODE_CACHE_TTL_SEC)
+
+_METERS_PER_DEG_LAT = 111320.0
+
+KAKAO_DIRECTIONS_ENDPOINT = endpoint_label(KAKAO_DIRECTIONS_URL)
+
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """두 좌표 간 거리 계산 (km)"""
@@ -30,10 +62,43 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
         return R * c
 
 
+def snap_to_grid(lat: float, lon: float, cell_m: float) -> Tuple[int, int]:
+    """좌표를 약 cell_m 미터 크기의 격자 셀 인덱스로 변환"""
+    lat_step = cell_m / _METERS_PER_DEG_LAT
+    # 경도 간격은 위도에 따라 달라지므로 1도 단위로 반올림한 위도 기준으로 계산 (셀 경계 안정화)
+    lon_step = cell_m / (_METERS_PER_DEG_LAT * max(math.cos(math.radians(round(lat))), 0.01))
+    return int(math.floor(lat / lat_step)), int(math.floor(lon / lon_step))
+
+
+def _route_cache_key(origin_lat: float, origin_lon: float, dest_lat: float, dest_lon: float,
+                     dest_id: Optional[str], now: Optional[float] = None) -> tuple:
+    """경로 캐시 키: (출발지 격자 셀, 목적지 hpid, 교통 시간대 버킷)"""
+    origin_cell = snap_to_grid(origin_lat, origin_lon, ROUTE_CACHE_GRID_M)
+    # hpid가 없으면 목적지 좌표(약 10m 격자)로 대체
+    dest_key = dest_id or snap_to_grid(dest_lat, dest_lon, 10.0)
+    bucket_sec = max(ROUTE_CACHE_TIME_BUCKET_MIN, 1) * 60
+    time_bucket = int((now if now is not None else time.time()) // bucket_sec)
+    return origin_cell, dest_key, time_bucket
+
+
+def get_route_cache_stats() -> Dict[str, Any]:
+    """경로 캐시 히트율 지표"""
+    return ROUTE_CACHE.stats()
+
+
+def get_geocode_cache_stats() -> Dict[str, Any]:
+    """역지오코딩 캐시 히트율 지표"""
+    return GEOCODE_CACHE.stats()
+
+
 def kakao_coord2region(lon: float, lat: float, kakao_key: str) -> Optional[Tuple[str, str]]:
-    """좌표 → 행정구역 변환"""
+    """좌표 → 행정구역 변환 (격자 셀 단위 캐시 사용)"""
     if not kakao_key:
         return None
+    cache_key = ("region", snap_to_grid(lat, lon, REVERSE_GEOCODE_GRID_M))
+    cached = GEOCODE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     headers = {"Authorization": f"KakaoAK {kakao_key}"}
     params = {"x": lon, "y": lat}
     try:
@@ -45,7 +110,9 @@ def kakao_coord2region(lon: float, lat: float, kakao_key: str) -> Optional[Tuple
                       == "B"), docs[0] if docs else None)
         if not target:
             return None
-        return target.get("region_1depth_name"), target.get("region_2depth_name")
+        result = (target.get("region_1depth_name"), target.get("region_2depth_name"))
+        GEOCODE_CACHE.set(cache_key, result)
+        return result
     except Exception as e:
         print(f"카카오 coord2region 오류: {e}")
         import traceback
@@ -53,10 +120,26 @@ def kakao_coord2region(lon: float, lat: float, kakao_key: str) -> Optional[Tuple
         return None
 
 
+def lookup_region(lon: float, lat: float, kakao_key: str) -> Optional[Tuple[str, str]]:
+    """좌표 → 행정구역 변환 (오프라인 경계 데이터 우선, 경계 근처/범위 밖이면 카카오 API)"""
+    try:
+        offline = lookup_region_offline(lon, lat)
+    except Exception as e:
+        print(f"오프라인 행정구역 조회 오류: {e}")
+        offline = None
+    if offline:
+        return offline
+    return kakao_coord2region(lon, lat, kakao_key)
+
+
 def kakao_coord2address(lon: float, lat: float, kakao_key: str) -> Optional[str]:
-    """좌표 → 주소 변환"""
+    """좌표 → 주소 변환 (격자 셀 단위 캐시 사용)"""
     if not kakao_key:
         return None
+    cache_key = ("address", snap_to_grid(lat, lon, REVERSE_GEOCODE_GRID_M))
+    cached = GEOCODE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     headers = {"Authorization": f"KakaoAK {kakao_key}"}
     params = {"x": lon, "y": lat}
     try:
@@ -67,11 +150,14 @@ def kakao_coord2address(lon: float, lat: float, kakao_key: str) -> Optional[str]
         if not docs:
             return None
         d0 = docs[0]
+        address = None
         if d0.get("road_address") and d0["road_address"].get("address_name"):
-            return d0["road_address"]["address_name"]
-        if d0.get("address") and d0["address"].get("address_name"):
-            return d0["address"]["address_name"]
-        return None
+            address = d0["road_address"]["address_name"]
+        elif d0.get("address") and d0["address"].get("address_name"):
+            address = d0["address"]["address_name"]
+        if address:
+            GEOCODE_CACHE.set(cache_key, address)
+        return address
     except Exception as e:
         print(f"카카오 coord2address 오류: {e}")
         import traceback
@@ -79,43 +165,150 @@ def kakao_coord2address(lon: float, lat: float, kakao_key: str) -> Optional[str]
         return None
 
 
+def _normalize_address(address: str) -> str:
+    """캐시 키용 주소 정규화 (앞뒤 공백 제거, 연속 공백 축약)"""
+    return " ".join(str(address).split())
+
+
+def _kakao_address2coord(address: str, kakao_key: str) -> Optional[Tuple[float, float, Optional[str], Optional[str]]]:
+    """주소 → 좌표 API 호출 (캐시 미사용). 결과가 없으면 None, 네트워크 오류는 예외 발생"""
+    headers = {"Authorization": f"KakaoAK {kakao_key}"}
+    params = {"query": address}
+    r = http_get(KAKAO_ADDRESS_URL, params=params, headers=headers)
+    data = r.json()
+    docs = data.get("documents", [])
+    if not docs:
+        return None
+    first = docs[0]
+    lon = float(first["x"])
+    lat = float(first["y"])
+
+    # 행정구역 정보 추출 (주소에서)
+    sido = None
+    sigungu = None
+    if first.get("road_address"):
+        sido = first["road_address"].get("region_1depth_name")
+        sigungu = first["road_address"].get("region_2depth_name")
+    elif first.get("address"):
+        sido = first["address"].get("region_1depth_name")
+        sigungu = first["address"].get("region_2depth_name")
+
+    return (lat, lon, sido, sigungu)
+
+
 def kakao_address2coord(address: str, kakao_key: str) -> Optional[Tuple[float, float, Optional[str], Optional[str]]]:
-    """주소 → 좌표 변환"""
+    """주소 → 좌표 변환 (캐시 우선)"""
     if not kakao_key:
         return None
-    headers = {"Authorization": f"KakaoAK {kakao_key}"}
-    params = {"query": address}
+    cache_key = _normalize_address(address)
+    cached = ADDRESS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        r = http_get(KAKAO_ADDRESS_URL, params=params, headers=headers)
-        data = r.json()
-        docs = data.get("documents", [])
-        if not docs:
-            return None
-        first = docs[0]
-        lon = float(first["x"])
-        lat = float(first["y"])
-
-        # 행정구역 정보 추출 (주소에서)
-        sido = None
-        sigungu = None
-        if first.get("road_address"):
-            sido = first["road_address"].get("region_1depth_name")
-            sigungu = first["road_address"].get("region_2depth_name")
-        elif first.get("address"):
-            sido = first["address"].get("region_1depth_name")
-            sigungu = first["address"].get("region_2depth_name")
-
-        return (lat, lon, sido, sigungu)
+        result = _kakao_address2coord(cache_key, kakao_key)
     except Exception as e:
         print(f"카카오 address2coord 오류: {e}")
         return None
+    if result is not None:
+        ADDRESS_CACHE.set(cache_key, result)
+    return result
+
+
+def batch_address2coord(addresses: List[str], kakao_key: str,
+                        max_workers: int = GEOCODE_BATCH_MAX_WORKERS) -> List[Dict[str, Any]]:
+    """주소 목록 일괄 좌표 변환
 
+    중복 주소는 한 번만 조회하고, 캐시에 없는 주소만 동시 호출 수를 제한하여 카카오 API로 조회한다.
+    결과는 입력 순서대로 반환하며, 항목별로 성공 시 lat/lon/sido/sigungu, 실패 시 error를 담는다.
+    """
+    unique = list(dict.fromkeys(_normalize_address(a) for a in addresses if a and str(a).strip()))
+    resolved: Dict[str, Dict[str, Any]] = {}
+    misses: List[str] = []
+    for address in unique:
+        cached = ADDRESS_CACHE.get(address)
+        if cached is not None:
+            resolved[address] = {"result": cached}
+        else:
+            misses.append(address)
 
-def get_driving_info_kakao(origin_lat: float, origin_lon: float, dest_lat: float, dest_lon: float, kakao_key: str) -> Tuple[Optional[float], Optional[int], Optional[List[List[float]]]]:
-    """카카오 길찾기 API - 경로 및 소요 시간"""
+    if misses and kakao_key:
+        with new_executor(max(1, min(max_workers, len(misses)))) as executor:
+            future_to_address = {executor.submit(_kakao_address2coord, a, kakao_key): a for a in misses}
+            for future in as_completed(future_to_address):
+                address = future_to_address[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    resolved[address] = {"error": f"조회 실패: {e}"}
+                    continue
+                if result is None:
+                    resolved[address] = {"error": "주소를 찾을 수 없습니다."}
+                else:
+                    ADDRESS_CACHE.set(address, result)
+                    resolved[address] = {"result": result}
+
+    results: List[Dict[str, Any]] = []
+    for address in addresses:
+        item: Dict[str, Any] = {"query": address}
+        key = _normalize_address(address) if address and str(address).strip() else None
+        entry = resolved.get(key) if key else {"error": "빈 주소입니다."}
+        if entry is None:
+            entry = {"error": "카카오 API 키가 설정되지 않았습니다."}
+        if "result" in entry:
+            lat, lon, sido, sigungu = entry["result"]
+            item.update({"lat": lat, "lon": lon, "sido": sido, "sigungu": sigungu})
+        else:
+            item["error"] = entry["error"]
+        results.append(item)
+    return results
+
+
+def get_address_cache_stats() -> Dict[str, Any]:
+    """주소 → 좌표 캐시 히트율 지표"""
+    return ADDRESS_CACHE.stats()
+
+
+def get_driving_info_kakao(origin_lat: float, origin_lon: float, dest_lat: float, dest_lon: float, kakao_key: str,
+                           dest_id: Optional[str] = None) -> Tuple[Optional[float], Optional[int], Optional[List[List[float]]]]:
+    """카카오 길찾기 API - 경로 및 소요 시간 (격자/시간대 기반 캐시 사용)
+
+    dest_id: 목적지 병원 hpid (캐시 키로 사용, 없으면 목적지 좌표로 대체)
+    """
     if not kakao_key:
         return None, None, None
 
+    cache_key = _route_cache_key(origin_lat, origin_lon, dest_lat, dest_lon, dest_id)
+    cached = ROUTE_CACHE.get(cache_key)
+    record_upstream_cache(KAKAO_DIRECTIONS_ENDPOINT, cached is not None)
+    if cached is not None:
+        return cached
+
+    # 같은 키를 이미 조회 중이면 (예: ETA 행렬이 시작한 호출) 그 결과를 기다림
+    with _route_inflight_lock:
+        pending = _ROUTE_INFLIGHT.get(cache_key)
+        if pending is None:
+            owned = _ROUTE_INFLIGHT[cache_key] = Future()
+    if pending is not None:
+        return pending.result()
+
+    try:
+        result = _fetch_driving_info_kakao(origin_lat, origin_lon, dest_lat, dest_lon, kakao_key)
+        # 실패 결과는 캐시하지 않음 (다음 요청에서 재시도)
+        if result[0] is not None:
+            ROUTE_CACHE.set(cache_key, result)
+        owned.set_result(result)
+        return result
+    except BaseException as e:
+        owned.set_exception(e)
+        raise
+    finally:
+        with _route_inflight_lock:
+            _ROUTE_INFLIGHT.pop(cache_key, None)
+
+
+def _fetch_driving_info_kakao(origin_lat: float, origin_lon: float, dest_lat: float, dest_lon: float, kakao_key: str) -> Tuple[Optional[float], Optional[int], Optional[List[List[float]]]]:
+    """카카오 길찾기 API 호출 (캐시 미사용)"""
+
     url = KAKAO_DIRECTIONS_URL
     headers = {"Authorization": f"KakaoAK {kakao_key}"}
     params = {
@@ -125,7 +318,15 @@ def get_driving_info_kakao(origin_lat: float, origin_lon: float, dest_lat: float
     }
 
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=5)
+        # 연결 풀/DNS 캐시 공유, 짧은 타임아웃이므로 어댑터 자동 재시도는 사용하지 않음
+        started = time.perf_counter()
+        try:
+            resp = run_blocking_io(get_session(retries=False).get, url, headers=headers, params=params, timeout=5)
+        except requests.exceptions.RequestException as e:
+            record_upstream_call(KAKAO_DIRECTIONS_ENDPOINT, type(e).__name__, time.perf_counter() - started)
+            raise
+        record_upstream_call(KAKAO_DIRECTIONS_ENDPOINT, resp.status_code, time.perf_counter() - started,
+                             nbytes=len(resp.content))
         if resp.status_code == 200:
             data = resp.json()
             routes = data.get("routes", [])
@@ -137,6 +338,10 @@ def get_driving_info_kakao(origin_lat: float, origin_lon: float, dest_lat: float
 
                 distance_km = distance_m / 1000
                 duration_min = int(duration_sec / 60)
+                # 로컬 ETA 추정 모델 학습용 기록
+                record_eta_sample(origin_lat, origin_lon, dest_lat, dest_lon,
+                                  calculate_distance(origin_lat, origin_lon, dest_lat, dest_lon),
+                                  distance_km, duration_sec / 60)
 
                 # 11/29 수정: 폴리라인 안정화
                 # 경로 좌표 추출: roads.vertexes가 실제 도로를 따라가므로 우선 사용
@@ -177,6 +382,65 @@ def get_driving_info_kakao(origin_lat: float, origin_lon: float, dest_lat: float
     return None, None, None
 
 
+def local_driving_info(origin_lat: float, origin_lon: float, dest_lat: float, dest_lon: float) -> Tuple[float, int]:
+    """네트워크 없이 주행 거리/시간 추정 (거리: 도로 계수 1.3, 시간: 로컬 ETA 모델)"""
+    straight = calculate_distance(origin_lat, origin_lon, dest_lat, dest_lon)
+    return straight * 1.3, estimate_eta_minutes(straight, origin_lat, origin_lon)
+
+
+def get_eta_matrix(origin_lat: float, origin_lon: float, destinations: List[Tuple[str, float, float]],
+                   kakao_key: str, provider: Optional[str] = None,
+                   max_workers: int = ETA_MATRIX_MAX_WORKERS,
+                   timeout: float = ETA_MATRIX_TIMEOUT_SEC,
+                   settled: Optional[Callable[[Dict[str, Tuple[float, int]], Set[str]], bool]] = None
+                   ) -> Dict[str, Tuple[float, int]]:
+    """ETA 행렬 조회: 출발지 1곳 → 목적지 여러 곳의 (주행 거리 km, 소요 시간 분)
+
+    destinations: [(목적지 ID(hpid), 위도, 경도), ...]
+    provider: "kakao" (동시 호출 수 제한 병렬 조회, 경로 캐시 공유) | "local" (로컬 추정)
+    settled(지금까지의 결과, 응답 대기 중인 목적지 ID): True를 반환하면 남은 목적지를 기다리지 않고 반환
+    timeout 안에 응답하지 않은 목적지는 결과에서 제외된다 (호출자가 추정값으로 대체).
+    제외된 목적지의 호출은 계속 진행되며, 같은 경로를 get_driving_info_kakao로 조회하면 새로 요청하지 않고 그 결과를 기다린다.
+    """
+    provider = provider or ETA_MATRIX_PROVIDER
+    matrix: Dict[str, Tuple[float, int]] = {}
+    if not destinations:
+        return matrix
+
+    if provider == "local" or not kakao_key:
+        for dest_id, dest_lat, dest_lon in destinations:
+            matrix[dest_id] = local_driving_info(origin_lat, origin_lon, dest_lat, dest_lon)
+        return matrix
+
+    executor = new_executor(max(1, min(max_workers, len(destinations))))
+    try:
+        future_to_dest = {
+            executor.submit(get_driving_info_kakao, origin_lat, origin_lon, dest_lat, dest_lon, kakao_key, dest_id): dest_id
+            for dest_id, dest_lat, dest_lon in destinations
+        }
+        deadline = time.monotonic() + timeout
+        pending = set(future_to_dest)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    real_dist, real_eta, _path = future.result()
+                except Exception as e:
+                    print(f"ETA 행렬 조회 오류 ({future_to_dest[future]}): {e}")
+                    continue
+                if real_dist is not None and real_eta is not None:
+                    matrix[future_to_dest[future]] = (real_dist, real_eta)
+            if pending and settled is not None and settled(matrix, {future_to_dest[f] for f in pending}):
+                break
+    finally:
+        # 시작된 호출은 기다리지 않고 계속 진행 (완료되면 경로 캐시에 반영, 진행 중에는 같은 경로 조회가 결과를 공유), 시작 전 호출은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+    return matrix
+
+
 def guess_region_from_address(addr: Optional[str]) -> Optional[Tuple[str, str]]:
     """주소에서 행정구역 추측"""
     if not addr:
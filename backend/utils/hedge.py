@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""헤지 요청 (tail latency 완화)
+
+엔드포인트별 최근 응답 시간의 p90을 넘도록 응답이 없으면 같은 요청을 한 번 더 보내고
+먼저 도착한 응답을 사용한다. 추가 호출은 전역 예산(기본: 전체 호출의 5%) 안에서만 발생한다.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Deque, Dict, Optional
+
+from config import (
+    HTTP_HEDGE_PERCENTILE, HTTP_HEDGE_WINDOW, HTTP_HEDGE_MIN_SAMPLES,
+    HTTP_HEDGE_MIN_DELAY_MS, HTTP_HEDGE_BUDGET_RATIO, HTTP_HEDGE_BUDGET_BURST,
+    HTTP_HEDGE_MAX_WORKERS
+)
+from utils.concurrency import new_executor
+
+
+def _succeeded(result: Any) -> bool:
+    """헤지 승자로 인정할 결과인지 (requests.Response는 2xx만, 그 외 값은 항상 성공)"""
+    status = getattr(result, "status_code", None)
+    return status is None or 200 <= status < 300
+
+
+class HedgeBudget:
+    """토큰 버킷 방식 헤지 예산 (호출 1회당 ratio 토큰 적립, 헤지 1회당 1 토큰 사용)"""
+
+    def __init__(self, ratio: float = HTTP_HEDGE_BUDGET_RATIO, burst: float = HTTP_HEDGE_BUDGET_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def on_call(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class HedgePolicy:
+    """엔드포인트별 지연 시간 기록 및 헤지 실행"""
+
+    def __init__(self, percentile: float = HTTP_HEDGE_PERCENTILE, window: int = HTTP_HEDGE_WINDOW,
+                 min_samples: int = HTTP_HEDGE_MIN_SAMPLES, min_delay_ms: float = HTTP_HEDGE_MIN_DELAY_MS,
+                 budget: Optional[HedgeBudget] = None, max_workers: int = HTTP_HEDGE_MAX_WORKERS):
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay_ms = min_delay_ms
+        self.budget = budget or HedgeBudget()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        # 첫 헤지 때 생성: app.py의 monkey patch 이후에 만들어야 그린스레드 executor가 선택됨
+        with self._lock:
+            if self._executor is None:
+                self._executor = new_executor(self.max_workers, thread_name_prefix="hedge")
+            return self._executor
+
+    def _endpoint_stats(self, endpoint: str) -> Dict[str, int]:
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = {
+                "calls": 0, "hedges_fired": 0, "hedges_won": 0, "hedges_denied": 0,
+            }
+        return stats
+
+    def record_latency(self, endpoint: str, latency_ms: float) -> None:
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None:
+                samples = self._latencies[endpoint] = deque(maxlen=self.window)
+            samples.append(latency_ms)
+
+    def hedge_delay_ms(self, endpoint: str) -> Optional[float]:
+        """헤지 대기 시간 (표본이 부족하면 None → 헤지 안 함)"""
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100.0))
+        return max(self.min_delay_ms, ordered[idx])
+
+    def call(self, endpoint: str, fn: Callable[[], Any]) -> Any:
+        """fn()을 실행하고 p90까지 응답이 없으면 예산 안에서 한 번 더 실행 (먼저 성공한 결과 반환, 2xx가 아닌 응답은 실패로 봄)"""
+        self.budget.on_call()
+        with self._lock:
+            self._endpoint_stats(endpoint)["calls"] += 1
+
+        def _timed(started_event: Optional[threading.Event] = None):
+            if started_event is not None:
+                started_event.set()
+            started = time.perf_counter()
+            result = fn()
+            self.record_latency(endpoint, (time.perf_counter() - started) * 1000)
+            return result
+
+        delay_ms = self.hedge_delay_ms(endpoint)
+        if delay_ms is None:
+            return _timed()
+
+        # 실행 대기열에서 기다린 시간은 제외하고, 실제로 호출이 시작된 시점부터 p90을 잰다
+        executor = self._get_executor()
+        started_event = threading.Event()
+        primary = executor.submit(_timed, started_event)
+        started_event.wait()
+        done, _ = wait([primary], timeout=delay_ms / 1000.0)
+        if done:
+            return primary.result()
+
+        if not self.budget.try_acquire():
+            with self._lock:
+                self._endpoint_stats(endpoint)["hedges_denied"] += 1
+            return primary.result()
+
+        with self._lock:
+            self._endpoint_stats(endpoint)["hedges_fired"] += 1
+        hedge = executor.submit(_timed)
+
+        # 먼저 끝난 쪽이 예외나 2xx가 아닌 응답이면 다른 쪽을 더 기다림 (둘 다 실패하면 마지막 응답/예외)
+        pending = {primary, hedge}
+        last_error = None
+        failed_result = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if not _succeeded(result):
+                    failed_result = result
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._endpoint_stats(endpoint)["hedges_won"] += 1
+                for other in pending:
+                    other.cancel()
+                return result
+        if failed_result is not None:
+            return failed_result
+        raise last_error
+
+    def stats(self) -> Dict[str, Any]:
+        """엔드포인트별 호출/헤지 발생/헤지 승리 횟수 및 현재 헤지 대기 시간(ms)"""
+        with self._lock:
+            endpoints = {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+        for endpoint, stats in endpoints.items():
+            delay_ms = self.hedge_delay_ms(endpoint)
+            stats["hedge_delay_ms"] = round(delay_ms, 1) if delay_ms is not None else None
+            stats["hedge_rate"] = round(stats["hedges_fired"] / stats["calls"], 4) if stats["calls"] else 0.0
+        return endpoints
+
+
+HEDGE_POLICY = HedgePolicy()
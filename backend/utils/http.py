@@ -2,20 +2,96 @@
 # -*- coding: utf-8 -*-
 """HTTP 유틸리티 함수"""
 
+import time
 import requests
 from urllib.parse import urlparse
 from typing import Optional, Dict, Any
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from urllib3.util.retry import Retry
 
-from config import DATA_GO_KR_KEY
+from config import (
+    DATA_GO_KR_KEY, DATA_GO_KR_BASE_URL, ER_BED_URL, KAKAO_DIRECTIONS_URL, KAKAO_COORD2REGION_URL
+)
+from utils.dns import DNS_CACHE
+from utils.faults import install_fault_injection
+from utils.concurrency import run_blocking_io
+from utils.hedge import HEDGE_POLICY
+from utils.metrics import endpoint_label, record_upstream_call
+
+
+# DATA_GO_KR_BASE_URL을 로컬 대역 서버로 바꾼 경우에도 serviceKey를 붙이기 위한 호스트
+_DATA_GO_KR_NETLOC = urlparse(DATA_GO_KR_BASE_URL).netloc
+
+
+class _CachedDNSConnectionMixin:
+    """새 연결을 만들 때 DNS 캐시의 주소로 접속 (SNI/인증서 검증은 원래 호스트명 사용)"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        address = DNS_CACHE.lookup(host)
+        if not address or address == host:
+            return super()._new_conn()
+        self._dns_host = address
+        try:
+            return super()._new_conn()
+        except Exception as e:
+            # 캐시된 주소로 연결 실패 시 캐시를 비우고 기본 해석으로 한 번 더 시도
+            print(f"캐시된 주소 연결 실패 ({host} -> {address}), 기본 해석으로 재시도: {e}")
+            DNS_CACHE.invalidate(host)
+            self._dns_host = host
+            return super()._new_conn()
+        finally:
+            self._dns_host = host
+
+
+class _CachedDNSHTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class CachedDNSAdapter(HTTPAdapter):
+    """DNS 캐시를 사용하는 연결 풀 어댑터"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # 모듈 전역 dict를 변경하지 않도록 새 dict로 교체
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CachedDNSHTTPConnectionPool,
+            "https": _CachedDNSHTTPSConnectionPool,
+        }
+
 
 # 세션 생성 (연결 풀 재사용 및 재시도 설정)
 _session = None
+_session_no_retry = None
 
-def get_session():
-    """재사용 가능한 requests 세션 생성"""
-    global _session
+def get_session(retries: bool = True):
+    """재사용 가능한 requests 세션 생성
+
+    retries=False: 어댑터 자동 재시도 없이 연결 풀/DNS 캐시만 사용 (짧은 타임아웃 호출용)
+    """
+    global _session, _session_no_retry
+    if not retries:
+        if _session_no_retry is None:
+            _session_no_retry = requests.Session()
+            adapter = CachedDNSAdapter(max_retries=0, pool_connections=10, pool_maxsize=10)
+            _session_no_retry.mount("http://", adapter)
+            _session_no_retry.mount("https://", adapter)
+            install_fault_injection(_session_no_retry)
+        return _session_no_retry
     if _session is None:
         _session = requests.Session()
         # 재시도 전략 설정
@@ -25,20 +101,47 @@ def get_session():
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=10)
+        adapter = CachedDNSAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=10)
         _session.mount("http://", adapter)
         _session.mount("https://", adapter)
+        install_fault_injection(_session)
     return _session
 
 
-def http_get(url: str, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None, max_retries: int = 3) -> requests.Response:
-    """HTTP GET 요청 헬퍼 함수 (재시도 로직 포함)"""
+def prime_upstream_dns() -> None:
+    """주요 업스트림 호스트(data.go.kr, 카카오) DNS를 백그라운드에서 미리 해석"""
+    DNS_CACHE.prime(urlparse(u).hostname for u in (ER_BED_URL, KAKAO_DIRECTIONS_URL, KAKAO_COORD2REGION_URL))
+
+
+def get_dns_stats() -> Dict[str, Any]:
+    """DNS 캐시 조회/해석 지연 시간 지표"""
+    return DNS_CACHE.stats()
+
+
+def get_hedge_stats() -> Dict[str, Any]:
+    """헤지 요청 발생/승리 지표"""
+    return HEDGE_POLICY.stats()
+
+
+def _adapter_retries(resp: requests.Response) -> int:
+    """urllib3 Retry 어댑터가 이 응답을 받기 전까지 재시도한 횟수"""
+    retries = getattr(resp.raw, "retries", None)
+    history = getattr(retries, "history", None)
+    return len(history) if history else 0
+
+
+def http_get(url: str, params: Dict[str, Any], headers: Optional[Dict[str, str]] = None, max_retries: int = 3,
+             hedge: bool = False) -> requests.Response:
+    """HTTP GET 요청 헬퍼 함수 (재시도 로직 포함)
+
+    hedge=True: 엔드포인트 p90 응답 시간까지 응답이 없으면 한 번 더 요청 (utils/hedge.py)
+    """
     timeout = (10, 30)  # 연결 타임아웃 10초, 읽기 타임아웃 30초로 증가
     params = dict(params) if params else {}
     if url.startswith("http://apis.data.go.kr/"):
         url = url.replace("http://", "https://", 1)
     netloc = urlparse(url).netloc
-    if "apis.data.go.kr" in netloc:
+    if "apis.data.go.kr" in netloc or netloc == _DATA_GO_KR_NETLOC:
         svc_key = params.pop("serviceKey", DATA_GO_KR_KEY)
         if svc_key:
             if "%" in svc_key:
@@ -49,37 +152,31 @@ def http_get(url: str, params: Dict[str, Any], headers: Optional[Dict[str, str]]
     
     # 세션 사용 (연결 풀 재사용 및 자동 재시도)
     session = get_session()
-    
-    # DNS 해석을 먼저 수행하여 DNS 타임아웃 문제 방지
-    try:
-        parsed = urlparse(url)
-        hostname = parsed.hostname
-        if hostname:
-            import socket
-            # DNS 해석을 먼저 수행 (타임아웃 5초)
-            try:
-                socket.setdefaulttimeout(5)
-                ip_address = socket.gethostbyname(hostname)
-                print(f"DNS 해석 성공: {hostname} -> {ip_address}")
-            except socket.gaierror as dns_error:
-                print(f"DNS 해석 실패: {hostname} - {dns_error}")
-                # DNS 해석 실패해도 요청은 시도 (requests가 자체 DNS 해석 시도)
-            finally:
-                socket.setdefaulttimeout(None)  # 타임아웃 초기화
-    except Exception as dns_check_error:
-        print(f"DNS 사전 해석 중 오류 (무시하고 계속): {dns_check_error}")
+    endpoint = endpoint_label(url)
+
+    def _get():
+        # 호출 1건마다 업스트림 장부(utils/metrics.py)에 기록 (헤지 중복 호출 포함)
+        manual_retries = 1 if attempt else 0
+        started = time.perf_counter()
+        try:
+            resp = run_blocking_io(session.get, url, params=params, headers=headers, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            record_upstream_call(endpoint, type(e).__name__, time.perf_counter() - started, retries=manual_retries)
+            raise
+        record_upstream_call(endpoint, resp.status_code, time.perf_counter() - started,
+                             retries=_adapter_retries(resp) + manual_retries, nbytes=len(resp.content))
+        return resp
     
     # 재시도 로직 (추가 수동 재시도)
     last_error = None
     for attempt in range(max_retries):
         try:
-            resp = session.get(url, params=params, headers=headers, timeout=timeout)
+            resp = HEDGE_POLICY.call(endpoint, _get) if hedge else _get()
             resp.raise_for_status()
             return resp
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.RequestException) as e:
             last_error = e
             if attempt < max_retries - 1:
-                import time
                 wait_time = (attempt + 1) * 2  # 2초, 4초, 6초 대기
                 print(f"HTTP 요청 실패 (시도 {attempt + 1}/{max_retries}), {wait_time}초 후 재시도: {e}")
                 time.sleep(wait_time)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""운영 지표 수집 (Prometheus 텍스트 형식으로 /metrics에 노출)
+
+- 업스트림 호출 장부: http_get / 카카오 길찾기 호출별 엔드포인트, 상태, 지연 시간, 재시도, 응답 크기, 캐시 히트/미스
+- API 라우트별 응답 시간 (routes/metrics.py의 before/after_request 훅에서 기록)
+
+외부 의존성 없이 카운터/히스토그램만 직접 구현한다.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+LATENCY_BUCKETS_SEC = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """레이블별 누적 카운터"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    """레이블별 누적 버킷 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS_SEC):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # 레이블 값 → [버킷별 개수, 합계, 개수]
+        self._values: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, label_values, ("le", _format_number(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_number(round(total, 6))}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests_total", "Upstream API calls by endpoint and status", ("endpoint", "status"))
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds", "Upstream API call latency in seconds", ("endpoint",))
+UPSTREAM_RETRIES = Counter(
+    "upstream_retries_total", "Upstream API retries (adapter + manual)", ("endpoint",))
+UPSTREAM_BYTES = Counter(
+    "upstream_response_bytes_total", "Upstream API response body bytes", ("endpoint",))
+UPSTREAM_CACHE = Counter(
+    "upstream_cache_lookups_total", "Cache lookups in front of upstream API calls", ("endpoint", "result"))
+ROUTE_LATENCY = Histogram(
+    "http_request_duration_seconds", "API route latency in seconds", ("route", "method", "status"))
+
+_METRICS = [UPSTREAM_REQUESTS, UPSTREAM_LATENCY, UPSTREAM_RETRIES, UPSTREAM_BYTES, UPSTREAM_CACHE, ROUTE_LATENCY]
+
+
+def register_metric(metric):
+    """다른 모듈에서 정의한 Counter/Histogram을 /metrics 출력에 추가"""
+    _METRICS.append(metric)
+    return metric
+
+
+def endpoint_label(url: str) -> str:
+    """지표 레이블용 엔드포인트 이름 (호스트 + 경로, 쿼리 제외)"""
+    parsed = urlparse(url)
+    return f"{parsed.netloc}{parsed.path}"
+
+
+def record_upstream_call(endpoint: str, status, latency_sec: float, retries: int = 0, nbytes: int = 0) -> None:
+    """업스트림 호출 1건 기록 (status: HTTP 상태 코드 또는 예외 이름)"""
+    UPSTREAM_REQUESTS.inc(endpoint, str(status))
+    UPSTREAM_LATENCY.observe(latency_sec, endpoint)
+    if retries:
+        UPSTREAM_RETRIES.inc(endpoint, amount=retries)
+    if nbytes:
+        UPSTREAM_BYTES.inc(endpoint, amount=nbytes)
+
+
+def record_upstream_cache(endpoint: str, hit: bool) -> None:
+    """업스트림 호출 앞단 캐시 조회 결과 기록"""
+    UPSTREAM_CACHE.inc(endpoint, "hit" if hit else "miss")
+
+
+def record_route_latency(route: str, method: str, status: int, latency_sec: float) -> None:
+    """API 라우트 응답 시간 기록"""
+    ROUTE_LATENCY.observe(latency_sec, route, method, str(status))
+
+
+def render_snapshot(name: str, help_text: str, metric_type: str, labels: Tuple[str, ...],
+                    values: Iterable[Tuple[LabelValues, float]]) -> List[str]:
+    """다른 모듈이 관리하는 누적 값(캐시/헤지 지표 등)을 Prometheus 텍스트로 변환"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for label_values, value in values:
+        lines.append(f"{name}{_format_labels(labels, label_values)} {_format_number(value)}")
+    return lines
+
+
+def render_prometheus(extra_lines: Iterable[str] = ()) -> str:
+    """모든 지표를 Prometheus 텍스트 형식으로 출력"""
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""경로 좌표(폴리라인) 단순화 및 압축 인코딩 유틸리티
+
+좌표는 카카오 길찾기 응답과 동일하게 [x(경도), y(위도)] 순서의 리스트를 사용한다.
+"""
+
+import base64
+import math
+import struct
+from typing import Any, Dict, List, Optional, Union
+
+from config import ROUTE_SIMPLIFY_TOLERANCE_M, ROUTE_SIMPLIFY_MAX_TOLERANCE_M
+
+# 지원하는 응답 포맷
+ROUTE_FORMAT_COORDS = "coords"      # [[x, y], ...] (기본값, 기존 응답과 동일)
+ROUTE_FORMAT_POLYLINE = "polyline"  # Google Encoded Polyline (위도, 경도 순서)
+ROUTE_FORMAT_F32 = "f32"            # little-endian Float32 [x0, y0, x1, y1, ...] → base64
+ROUTE_FORMATS = (ROUTE_FORMAT_COORDS, ROUTE_FORMAT_POLYLINE, ROUTE_FORMAT_F32)
+
+_METERS_PER_DEG = 111320.0
+
+
+def simplify_path(coords: List[List[float]], tolerance_m: float) -> List[List[float]]:
+    """Douglas–Peucker 알고리즘으로 경로 단순화 (허용 오차: 미터)"""
+    n = len(coords)
+    if tolerance_m <= 0 or n <= 2:
+        return coords
+
+    # 경로 중앙 위도 기준 등장방형 투영으로 미터 단위 평면 좌표 계산
+    ref_lat = math.radians(coords[n // 2][1])
+    kx = _METERS_PER_DEG * math.cos(ref_lat)
+    ky = _METERS_PER_DEG
+    xs = [p[0] * kx for p in coords]
+    ys = [p[1] * ky for p in coords]
+    tol_sq = tolerance_m * tolerance_m
+
+    keep = bytearray(n)
+    keep[0] = keep[n - 1] = 1
+    # 재귀 대신 스택 사용 (경로 좌표가 수천 개여도 재귀 한도 문제 없음)
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        ax, ay = xs[start], ys[start]
+        dx, dy = xs[end] - ax, ys[end] - ay
+        seg_len_sq = dx * dx + dy * dy
+        max_dist_sq = -1.0
+        index = start
+        for i in range(start + 1, end):
+            px, py = xs[i] - ax, ys[i] - ay
+            if seg_len_sq == 0:
+                dist_sq = px * px + py * py
+            else:
+                t = (px * dx + py * dy) / seg_len_sq
+                if t < 0:
+                    t = 0.0
+                elif t > 1:
+                    t = 1.0
+                ex, ey = px - t * dx, py - t * dy
+                dist_sq = ex * ex + ey * ey
+            if dist_sq > max_dist_sq:
+                max_dist_sq = dist_sq
+                index = i
+        if max_dist_sq > tol_sq:
+            keep[index] = 1
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return [coords[i] for i in range(n) if keep[i]]
+
+
+def _encode_value(value: int, out: List[str]) -> None:
+    value = ~(value << 1) if value < 0 else (value << 1)
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode_polyline(coords: List[List[float]], precision: int = 5) -> str:
+    """Google Encoded Polyline 인코딩 (표준 디코더와 호환되도록 위도, 경도 순서로 인코딩)"""
+    factor = 10 ** precision
+    out: List[str] = []
+    prev_lat = prev_lon = 0
+    for x, y in coords:
+        lat = int(round(y * factor))
+        lon = int(round(x * factor))
+        _encode_value(lat - prev_lat, out)
+        _encode_value(lon - prev_lon, out)
+        prev_lat, prev_lon = lat, lon
+    return "".join(out)
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> List[List[float]]:
+    """encode_polyline 결과를 [x(경도), y(위도)] 리스트로 복원"""
+    factor = float(10 ** precision)
+    coords: List[List[float]] = []
+    index = lat = lon = 0
+    length = len(encoded)
+    while index < length:
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                b = ord(encoded[index]) - 63
+                index += 1
+                result |= (b & 0x1F) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else (result >> 1))
+        lat += deltas[0]
+        lon += deltas[1]
+        coords.append([lon / factor, lat / factor])
+    return coords
+
+
+def pack_float32_base64(coords: List[List[float]]) -> str:
+    """좌표를 little-endian Float32 배열로 패킹 후 base64 인코딩"""
+    flat = [v for pt in coords for v in pt[:2]]
+    return base64.b64encode(struct.pack(f"<{len(flat)}f", *flat)).decode("ascii")
+
+
+def parse_route_format(value: Optional[str]) -> str:
+    """요청 파라미터의 경로 포맷 값을 정규화 (알 수 없는 값은 기본 포맷)"""
+    fmt = (value or ROUTE_FORMAT_COORDS).strip().lower()
+    return fmt if fmt in ROUTE_FORMATS else ROUTE_FORMAT_COORDS
+
+
+def parse_tolerance(value: Any) -> float:
+    """요청 파라미터의 단순화 허용 오차(m)를 정규화 (없거나 잘못된 값·nan/inf는 설정 기본값, 0~ROUTE_SIMPLIFY_MAX_TOLERANCE_M으로 제한)"""
+    if value is None or value == "" or isinstance(value, bool):
+        return ROUTE_SIMPLIFY_TOLERANCE_M
+    try:
+        tolerance = float(value)
+    except (TypeError, ValueError):
+        return ROUTE_SIMPLIFY_TOLERANCE_M
+    if not math.isfinite(tolerance):
+        return ROUTE_SIMPLIFY_TOLERANCE_M
+    return min(max(tolerance, 0.0), ROUTE_SIMPLIFY_MAX_TOLERANCE_M)
+
+
+def format_route_path(coords: Optional[List[List[float]]], fmt: str = ROUTE_FORMAT_COORDS,
+                      tolerance_m: Optional[float] = None) -> Union[None, List[List[float]], Dict[str, Any]]:
+    """경로 좌표 단순화 후 요청된 포맷으로 변환
+
+    - coords: 단순화된 [[x, y], ...] 리스트 (기존 응답과 호환)
+    - polyline: {"format": "polyline", "precision": 5, "points": "..."}
+    - f32: {"format": "f32", "data": "<base64>"} (x, y 교차 배열)
+    """
+    if not coords:
+        return coords
+    tol = ROUTE_SIMPLIFY_TOLERANCE_M if tolerance_m is None else tolerance_m
+    simplified = simplify_path(coords, tol)
+    if fmt == ROUTE_FORMAT_POLYLINE:
+        return {"format": ROUTE_FORMAT_POLYLINE, "precision": 5, "points": encode_polyline(simplified)}
+    if fmt == ROUTE_FORMAT_F32:
+        return {"format": ROUTE_FORMAT_F32, "count": len(simplified), "data": pack_float32_base64(simplified)}
+    return simplified
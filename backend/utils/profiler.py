@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""요청 시에만 동작하는 샘플링 프로파일러
+
+실행 중인 서버 프로세스의 모든 OS 스레드(sys._current_frames)와, wall 모드에서는
+대기 중인 그린스레드(greenlet.gr_frame)의 호출 스택을 일정 간격으로 수집하여
+flamegraph.pl / speedscope에서 바로 쓸 수 있는 collapsed stack 형식으로 집계한다.
+
+- 수집은 실제 OS 스레드에서 실행 (eventlet/gevent monkey patch 이전의 원본 _thread/time 사용)
+  → CPU를 오래 점유하는 그린스레드가 허브를 막고 있어도 표본을 얻을 수 있음
+- 프로파일 요청이 없으면 스레드도 훅도 없으므로 평상시 비용 없음
+- 동시에 하나의 프로파일만 실행
+"""
+
+import gc
+import os
+import sys
+import threading
+from collections import Counter as _Counter
+from typing import Any, Callable, Dict, Optional
+
+PROFILE_MODE_CPU = "cpu"
+PROFILE_MODE_WALL = "wall"
+
+# 그린스레드 목록은 gc 전체 탐색이 필요하므로 이 간격(초)마다만 갱신
+_GREENLET_REFRESH_SEC = 1.0
+
+
+def _original(module: str, name: str) -> Any:
+    """monkey patch 이전의 원본 함수 (패치되지 않았으면 현재 함수)"""
+    if "eventlet" in sys.modules:
+        from eventlet import patcher
+        return getattr(patcher.original(module), name)
+    gevent_monkey = sys.modules.get("gevent.monkey")
+    if gevent_monkey is not None:
+        return gevent_monkey.get_original(module, name)
+    return getattr(__import__(module), name)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame, root: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(root)
+    return ";".join(reversed(labels))
+
+
+def _live_greenlets() -> list:
+    greenlet_mod = sys.modules.get("greenlet")
+    if greenlet_mod is None:
+        return []
+    return [obj for obj in gc.get_objects() if isinstance(obj, greenlet_mod.greenlet) and not obj.dead]
+
+
+class SamplingProfiler:
+    """일정 시간 동안 스택 표본을 수집하는 프로파일러 (한 번에 하나만 실행)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def profile(self, seconds: float, interval: float, mode: str = PROFILE_MODE_CPU,
+                wait: Optional[Callable[[float], Any]] = None) -> Optional[Dict[str, Any]]:
+        """seconds초 동안 interval초 간격으로 표본 수집 (이미 실행 중이면 None)
+
+        wait: 요청 처리 스레드가 수집 완료를 기다리는 방법 (기본 time.sleep - monkey patch 환경에서는 협력적으로 대기)
+        """
+        with self._lock:
+            if self._running:
+                return None
+            self._running = True
+        try:
+            result: Dict[str, Any] = {}
+            done = _original("threading", "Event")()
+            _original("_thread", "start_new_thread")(self._sample, (seconds, interval, mode, result, done))
+            waiter = wait or __import__("time").sleep
+            # 수집 스레드가 끝날 때까지 짧게 나눠 대기 (허브/다른 요청을 막지 않음)
+            while not done.is_set():
+                waiter(min(interval * 5, 0.1))
+            return result
+        finally:
+            with self._lock:
+                self._running = False
+
+    def _sample(self, seconds: float, interval: float, mode: str, result: Dict[str, Any], done) -> None:
+        sleep = _original("time", "sleep")
+        perf_counter = _original("time", "perf_counter")
+        stacks: "_Counter[str]" = _Counter()
+        samples = 0
+        overhead = 0.0
+        own_ident = _original("_thread", "get_ident")()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        greenlets: list = []
+        greenlets_at = -_GREENLET_REFRESH_SEC
+        started = perf_counter()
+        try:
+            while perf_counter() - started < seconds:
+                tick = perf_counter()
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_ident:
+                        continue
+                    stacks[_collapse(frame, f"thread:{names.get(ident, ident)}")] += 1
+                if mode == PROFILE_MODE_WALL:
+                    if tick - greenlets_at >= _GREENLET_REFRESH_SEC:
+                        greenlets = _live_greenlets()
+                        greenlets_at = tick
+                    for glet in greenlets:
+                        # 실행 중인 그린스레드는 gr_frame이 None (위 OS 스레드 스택에 포함됨)
+                        frame = getattr(glet, "gr_frame", None)
+                        if frame is not None:
+                            stacks[_collapse(frame, "greenlet")] += 1
+                samples += 1
+                elapsed = perf_counter() - tick
+                overhead += elapsed
+                sleep(max(interval - elapsed, 0.0))
+            result.update({
+                "mode": mode,
+                "seconds": round(perf_counter() - started, 3),
+                "interval_ms": round(interval * 1000.0, 3),
+                "samples": samples,
+                "sampler_overhead_ms": round(overhead * 1000.0, 1),
+                "stacks": stacks,
+            })
+        except Exception as e:
+            result["error"] = str(e)
+        finally:
+            done.set()
+
+
+def render_collapsed(stacks: Dict[str, int]) -> str:
+    """collapsed stack 텍스트 ("프레임;프레임;... 횟수" 한 줄씩, 많은 순)"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items(), key=lambda kv: -kv[1]))
+
+
+PROFILER = SamplingProfiler()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""오프라인 행정구역(시도/시군구) 경계 조회 - STR 패킹 R-tree + point-in-polygon
+
+경계 데이터는 scripts/build_region_index.py 로 GeoJSON에서 생성한 두 파일을 사용한다.
+- sigungu_index.json : 행정구역 목록, bbox, 링(ring) 정점 오프셋
+- sigungu_coords.bin : 모든 링 정점을 [x0, y0, x1, y1, ...] float64(little-endian)로 이어 붙인 배열
+- sigungu_neighbors.json : 경계를 공유하는 인접 시군구 목록 (병원 조회 범위 계획에 사용, 선택)
+"""
+
+import json
+import math
+import mmap
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config import REGION_INDEX_DIR, REGION_INDEX_MMAP, REGION_BORDER_EPS_M
+
+INDEX_FILE_NAME = "sigungu_index.json"
+COORDS_FILE_NAME = "sigungu_coords.bin"
+# 인접 시군구 목록 (경계를 공유하는 시군구, scripts/build_region_index.py로 생성)
+NEIGHBORS_FILE_NAME = "sigungu_neighbors.json"
+
+# 링을 일정 개수의 정점 단위 조각(chunk)으로 나누어 bbox로 빠르게 건너뜀
+CHUNK_SIZE = 32
+# R-tree 노드 최대 자식 수
+NODE_CAPACITY = 8
+
+_METERS_PER_DEG = 111320.0
+
+BBox = Tuple[float, float, float, float]
+
+
+def _bbox_contains(b: BBox, x: float, y: float, pad_x: float = 0.0, pad_y: float = 0.0) -> bool:
+    return b[0] - pad_x <= x <= b[2] + pad_x and b[1] - pad_y <= y <= b[3] + pad_y
+
+
+def _merge_bbox(boxes: Sequence[BBox]) -> BBox:
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+class STRTree:
+    """Sort-Tile-Recursive 방식으로 일괄 패킹한 정적 R-tree (포인트 질의 전용)"""
+
+    def __init__(self, boxes: Sequence[BBox], capacity: int = NODE_CAPACITY):
+        self.capacity = capacity
+        # 각 레벨의 노드: (bbox, 자식 인덱스 리스트). 최하위 레벨의 자식은 입력 항목 인덱스
+        self.levels: List[List[Tuple[BBox, List[int]]]] = []
+        entries = [(box, i) for i, box in enumerate(boxes)]
+        while entries:
+            nodes = self._pack(entries)
+            self.levels.append(nodes)
+            if len(nodes) <= 1:
+                break
+            entries = [(bbox, i) for i, (bbox, _) in enumerate(nodes)]
+
+    def _pack(self, entries: List[Tuple[BBox, int]]) -> List[Tuple[BBox, List[int]]]:
+        cap = self.capacity
+        n_nodes = math.ceil(len(entries) / cap)
+        n_slices = max(1, math.ceil(math.sqrt(n_nodes)))
+        slice_size = n_slices * cap
+        by_x = sorted(entries, key=lambda e: (e[0][0] + e[0][2]) / 2)
+        nodes: List[Tuple[BBox, List[int]]] = []
+        for s in range(0, len(by_x), slice_size):
+            by_y = sorted(by_x[s:s + slice_size], key=lambda e: (e[0][1] + e[0][3]) / 2)
+            for k in range(0, len(by_y), cap):
+                group = by_y[k:k + cap]
+                nodes.append((_merge_bbox([g[0] for g in group]), [g[1] for g in group]))
+        return nodes
+
+    def query_point(self, x: float, y: float, pad_x: float = 0.0, pad_y: float = 0.0) -> List[int]:
+        """(x, y)를 포함하는(패딩 적용) bbox를 가진 항목 인덱스 목록"""
+        if not self.levels:
+            return []
+        top = len(self.levels) - 1
+        stack = [(top, i) for i, (bbox, _) in enumerate(self.levels[top]) if _bbox_contains(bbox, x, y, pad_x, pad_y)]
+        result: List[int] = []
+        while stack:
+            level, idx = stack.pop()
+            _, children = self.levels[level][idx]
+            if level == 0:
+                result.extend(children)
+                continue
+            below = self.levels[level - 1]
+            for child in children:
+                if _bbox_contains(below[child][0], x, y, pad_x, pad_y):
+                    stack.append((level - 1, child))
+        return result
+
+
+class RegionIndex:
+    """시군구 경계 point-in-polygon 조회 엔진"""
+
+    def __init__(self, meta: Dict[str, Any], coords: Sequence[float]):
+        self.coords = coords
+        self.regions: List[Tuple[str, str]] = []
+        region_boxes: List[BBox] = []
+        # 행정구역별 조각 목록: (bbox, 시작 정점, 끝 정점(포함))
+        self.region_chunks: List[List[Tuple[BBox, int, int]]] = []
+        for region in meta.get("regions", []):
+            self.regions.append((region["sido"], region["sigungu"]))
+            region_boxes.append(tuple(region["bbox"]))
+            chunks = []
+            for start, count in region["rings"]:
+                # 조각 경계 정점을 공유하도록 겹쳐서 분할 (모든 변이 정확히 한 조각에 포함됨)
+                last = start + count - 1
+                for c in range(start, last, CHUNK_SIZE):
+                    end = min(c + CHUNK_SIZE, last)
+                    xs = [coords[2 * v] for v in range(c, end + 1)]
+                    ys = [coords[2 * v + 1] for v in range(c, end + 1)]
+                    chunks.append(((min(xs), min(ys), max(xs), max(ys)), c, end))
+            self.region_chunks.append(chunks)
+        self.tree = STRTree(region_boxes)
+
+    @classmethod
+    def load(cls, directory: Path, use_mmap: bool = True) -> Optional["RegionIndex"]:
+        """인덱스 파일 로드 (파일이 없으면 None)"""
+        meta_path = directory / INDEX_FILE_NAME
+        coords_path = directory / COORDS_FILE_NAME
+        if not meta_path.exists() or not coords_path.exists():
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if use_mmap:
+            with open(coords_path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            coords = memoryview(mapped).cast("d")
+        else:
+            coords = array("d")
+            with open(coords_path, "rb") as f:
+                coords.frombytes(f.read())
+        return cls(meta, coords)
+
+    def _crossings_and_distance(self, region_idx: int, x: float, y: float,
+                                pad_x: float, pad_y: float, kx: float) -> Tuple[int, float]:
+        """반직선(+x 방향) 교차 횟수와 경계까지 최소 거리(m, 패딩 범위 내 변만 계산)"""
+        coords = self.coords
+        crossings = 0
+        min_dist_sq = math.inf
+        for (bx0, by0, bx1, by1), start, end in self.region_chunks[region_idx]:
+            near = bx0 - pad_x <= x <= bx1 + pad_x and by0 - pad_y <= y <= by1 + pad_y
+            ray = by0 <= y <= by1 and bx1 >= x
+            if not near and not ray:
+                continue
+            for v in range(start, end):
+                x1, y1 = coords[2 * v], coords[2 * v + 1]
+                x2, y2 = coords[2 * v + 2], coords[2 * v + 3]
+                if ray and ((y1 > y) != (y2 > y)):
+                    if x < (x2 - x1) * (y - y1) / (y2 - y1) + x1:
+                        crossings += 1
+                if near:
+                    # 미터 단위 평면 근사로 점-선분 거리 계산
+                    ax, ay = (x1 - x) * kx, (y1 - y) * _METERS_PER_DEG
+                    dx, dy = (x2 - x1) * kx, (y2 - y1) * _METERS_PER_DEG
+                    seg_sq = dx * dx + dy * dy
+                    t = 0.0 if seg_sq == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / seg_sq))
+                    ex, ey = ax + t * dx, ay + t * dy
+                    d = ex * ex + ey * ey
+                    if d < min_dist_sq:
+                        min_dist_sq = d
+        return crossings, math.sqrt(min_dist_sq)
+
+    def lookup(self, lon: float, lat: float, border_eps_m: float = REGION_BORDER_EPS_M) -> Optional[Tuple[str, str]]:
+        """좌표 → (시도, 시군구). 경계 근처이거나 데이터 범위 밖이면 None"""
+        kx = _METERS_PER_DEG * math.cos(math.radians(lat))
+        pad_y = border_eps_m / _METERS_PER_DEG
+        pad_x = border_eps_m / kx if kx > 0 else pad_y
+        inside: List[int] = []
+        for region_idx in self.tree.query_point(lon, lat, pad_x, pad_y):
+            crossings, dist_m = self._crossings_and_distance(region_idx, lon, lat, pad_x, pad_y, kx)
+            if dist_m < border_eps_m:
+                # 경계선 근처는 판단을 보류 (카카오 API로 확인)
+                return None
+            if crossings % 2 == 1:
+                inside.append(region_idx)
+        if len(inside) != 1:
+            return None
+        return self.regions[inside[0]]
+
+
+_index: Optional[RegionIndex] = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def get_region_index() -> Optional[RegionIndex]:
+    """경계 인덱스 싱글톤 (최초 호출 시 로드, 데이터가 없으면 None)"""
+    global _index, _index_loaded
+    if _index_loaded:
+        return _index
+    with _index_lock:
+        if not _index_loaded:
+            try:
+                _index = RegionIndex.load(Path(REGION_INDEX_DIR), use_mmap=REGION_INDEX_MMAP)
+                if _index is None:
+                    print(f"ℹ️  행정구역 경계 데이터가 없어 카카오 API로 조회합니다: {REGION_INDEX_DIR}")
+            except Exception as e:
+                print(f"행정구역 경계 인덱스 로드 오류: {e}")
+                _index = None
+            _index_loaded = True
+    return _index
+
+
+def lookup_region_offline(lon: float, lat: float) -> Optional[Tuple[str, str]]:
+    """오프라인 경계 데이터로 좌표 → (시도, 시군구) 조회"""
+    index = get_region_index()
+    if index is None:
+        return None
+    return index.lookup(lon, lat)
+
+
+_neighbors: Optional[Dict[Tuple[str, str], List[Tuple[str, str]]]] = None
+_neighbors_loaded = False
+
+
+def _load_neighbors() -> Optional[Dict[Tuple[str, str], List[Tuple[str, str]]]]:
+    global _neighbors, _neighbors_loaded
+    if _neighbors_loaded:
+        return _neighbors
+    with _index_lock:
+        if not _neighbors_loaded:
+            path = Path(REGION_INDEX_DIR) / NEIGHBORS_FILE_NAME
+            try:
+                if path.exists():
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    _neighbors = {
+                        (entry["sido"], entry["sigungu"]): [tuple(n) for n in entry.get("neighbors", [])]
+                        for entry in data.get("regions", [])
+                    }
+            except Exception as e:
+                print(f"인접 시군구 데이터 로드 오류: {e}")
+                _neighbors = None
+            _neighbors_loaded = True
+    return _neighbors
+
+
+def get_sigungu_neighbors(sido: str, sigungu: str, depth: int = 1) -> List[Tuple[str, str]]:
+    """(시도, 시군구)에서 depth 단계 이내로 인접한 시군구 목록 (자신 제외, 가까운 순, 데이터가 없으면 빈 목록)"""
+    neighbors = _load_neighbors()
+    if not neighbors or (sido, sigungu) not in neighbors:
+        return []
+    seen = {(sido, sigungu)}
+    ring: List[Tuple[str, str]] = []
+    frontier = [(sido, sigungu)]
+    for _ in range(max(0, depth)):
+        next_frontier = []
+        for region in frontier:
+            for neighbor in neighbors.get(region, []):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    ring.append(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return ring
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""요청 단위 구간(span) 시간 측정
+
+TRACE_ROUTE_PREFIXES에 해당하는 요청마다 Trace를 시작하고(routes/metrics.py 훅),
+라우트와 서비스 함수는 span("이름") / @traced("이름")으로 단계별 소요 시간을 기록한다.
+같은 이름의 구간은 합산(호출 횟수 포함)하며, 활성 Trace가 없으면(백그라운드 예열 등) 아무것도 하지 않는다.
+
+- 응답 헤더: Server-Timing: scope;dur=812.4, beds;dur=95.1, ..., total;dur=1200.3
+- ?debug_timings=1 또는 X-Debug-Timings: 1 요청이면 JSON 응답에 _timings 블록 추가
+- TRACE_SLOW_REQUEST_MS 이상 걸린 요청은 TRACE_SLOW_SAMPLE_RATE 비율로 TRACE_SLOW_LOG_PATH(JSONL)에 기록
+
+구간 정보는 contextvars로 요청(스레드/그린스레드)마다 분리되므로,
+병렬 조회 executor(new_executor) 작업자 안의 호출은 해당 작업 전체를 감싼 바깥 구간에 포함된다.
+"""
+
+import contextvars
+import functools
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from config import TRACE_SLOW_REQUEST_MS, TRACE_SLOW_SAMPLE_RATE, TRACE_SLOW_LOG_PATH
+
+_current_trace: "contextvars.ContextVar[Optional[Trace]]" = contextvars.ContextVar("trace", default=None)
+_slow_log_lock = threading.Lock()
+
+
+class Trace:
+    """요청 하나의 구간별 누적 시간 {이름: [합계(초), 횟수, 처음 시작 오프셋(초)]}"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.spans: "OrderedDict[str, list]" = OrderedDict()
+        self.tags: Dict[str, Any] = {}
+        self.total: Optional[float] = None
+
+    def open(self, name: str, started: float) -> list:
+        """구간 시작 시 자리 확보 (헤더가 바깥 구간부터 시작 순서대로 나오도록)"""
+        entry = self.spans.get(name)
+        if entry is None:
+            entry = self.spans[name] = [0.0, 0, started - self.started]
+        return entry
+
+    def finish(self) -> float:
+        if self.total is None:
+            self.total = time.perf_counter() - self.started
+        return self.total
+
+    def elapsed_ms(self) -> float:
+        total = self.total if self.total is not None else time.perf_counter() - self.started
+        return total * 1000.0
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (호출 횟수가 2 이상이면 desc에 표시)"""
+        parts = []
+        for name, (duration, count, _) in self.spans.items():
+            part = f"{name};dur={duration * 1000.0:.1f}"
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(parts)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "total_ms": round(self.elapsed_ms(), 1),
+            "spans": [
+                {"name": name, "ms": round(duration * 1000.0, 1), "count": count, "start_ms": round(offset * 1000.0, 1)}
+                for name, (duration, count, offset) in self.spans.items()
+            ],
+            "tags": dict(self.tags),
+        }
+
+
+def start_trace(name: str) -> Trace:
+    """현재 요청의 Trace 시작"""
+    trace = Trace(name)
+    _current_trace.set(trace)
+    return trace
+
+
+def end_trace() -> Optional[Trace]:
+    """현재 요청의 Trace 종료 후 반환 (시작하지 않았으면 None)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.finish()
+        _current_trace.set(None)
+    return trace
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """구간 시간 측정 (활성 Trace가 없으면 측정하지 않음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    entry = trace.open(name, started)
+    try:
+        yield
+    finally:
+        entry[0] += time.perf_counter() - started
+        entry[1] += 1
+
+
+def traced(name: str) -> Callable:
+    """함수 전체를 구간으로 측정하는 데코레이터"""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def annotate(**tags: Any) -> None:
+    """느린 요청 분석용 태그 추가 (시도, 후보 수 등)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.tags.update(tags)
+
+
+def maybe_log_slow_trace(trace: Trace, method: str, path: str, status: int) -> bool:
+    """TRACE_SLOW_REQUEST_MS 이상 걸린 요청을 표본 추출하여 JSONL로 기록"""
+    if not TRACE_SLOW_LOG_PATH or trace.elapsed_ms() < TRACE_SLOW_REQUEST_MS:
+        return False
+    if TRACE_SLOW_SAMPLE_RATE < 1.0 and random.random() >= TRACE_SLOW_SAMPLE_RATE:
+        return False
+    row = {"ts": int(trace.started_at), "method": method, "path": path, "status": status}
+    row.update(trace.as_dict())
+    try:
+        path_obj = Path(TRACE_SLOW_LOG_PATH)
+        path_obj.parent.mkdir(parents=True, exist_ok=True)
+        with _slow_log_lock:
+            with open(path_obj, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print(f"느린 요청 기록 오류: {e}")
+        return False
+    return True
@@ -1,9 +1,10 @@
 import React, { useState, useEffect, useRef, useMemo, useCallback } from "react";
 import type { ChatMessage, Hospital, Coords } from "../types";
 import { getChatSessions, getChatMessages, sendChatMessage, getChatSession, deleteChatSession, hospitalLogin, getCurrentUser, logout, getImageUrl, getRoute } from "../services/api";
-import { extractPatientAgeDisplay } from "../utils/hospitalUtils";
+import { extractPatientAgeDisplay, formatBedValue } from "../utils/hospitalUtils";
 import { KakaoAmbulanceMap } from "./KakaoAmbulanceMap";
-import { getSocket, disconnectSocket } from "../services/socket";
+import { getSocket, disconnectSocket, subscribeBeds } from "../services/socket";
+import type { BedFields } from "../services/socket";
 import type { Socket } from "socket.io-client";
 
 interface ChatSession {
@@ -45,6 +46,8 @@ export const ERDashboard: React.FC<ERDashboardProps> = ({
   const [isLoggedIn, setIsLoggedIn] = useState(false);
   const [hospitalId, setHospitalId] = useState<string | undefined>(propHospitalId);
   const [hospitalName, setHospitalName] = useState<string>(propHospitalName || "");
+  const [hospitalSido, setHospitalSido] = useState<string | null>(null);
+  const [myBeds, setMyBeds] = useState<BedFields | null>(null);  // 우리 병원 실시간 병상 (병상 변경 구독)
   const [loginHospitalId, setLoginHospitalId] = useState("");
   const [loginPassword, setLoginPassword] = useState("");
   const [loginError, setLoginError] = useState<string | null>(null);
@@ -104,7 +107,8 @@ export const ERDashboard: React.FC<ERDashboardProps> = ({
           mapData.ambulanceCoords.lat!,
           mapData.ambulanceCoords.lon!,
           mapData.hospital.wgs84Lat!,
-          mapData.hospital.wgs84Lon!
+          mapData.hospital.wgs84Lon!,
+          mapData.hospital.hpid
         );
         
         if (result?.path_coords && mapData.hospital.hpid) {
@@ -137,6 +141,7 @@ export const ERDashboard: React.FC<ERDashboardProps> = ({
         if (user && user.user_type === "HOSPITAL" && user.hospital_id) {
           setHospitalId(user.hospital_id);
           setHospitalName(user.hospital_name || "");
+          setHospitalSido(user.sido || null);
           setIsLoggedIn(true);
         } else {
           setIsLoggedIn(false);
@@ -166,6 +171,7 @@ export const ERDashboard: React.FC<ERDashboardProps> = ({
       console.log("ERDashboard: 로그인 성공, hospital_id:", result.hospital_id);
       setHospitalId(result.hospital_id);
       setHospitalName(result.hospital_name);
+      setHospitalSido(result.sido || null);
       setIsLoggedIn(true);
       setLoginPassword(""); // 보안을 위해 비밀번호 초기화
       // 로그인 후 세션 목록 자동 로드
@@ -302,6 +308,30 @@ export const ERDashboard: React.FC<ERDashboardProps> = ({
     return () => clearInterval(interval);
   }, [hospitalId, isLoggedIn, selectedSession?.session_id]);
 
+  // 우리 병원 병상 변경 구독 (시도 방의 변경분 중 우리 병원 것만 반영)
+  useEffect(() => {
+    if (!isLoggedIn || !hospitalId || !hospitalSido) {
+      setMyBeds(null);
+      return;
+    }
+    let version = -1;
+    return subscribeBeds(
+      hospitalSido,
+      (event) => {
+        version = event.version;
+        setMyBeds(event.beds[hospitalId] || null);
+      },
+      (event) => {
+        if (event.version <= version) return;  // 구독 직후 스냅샷보다 오래된 변경분 무시
+        version = event.version;
+        const change = event.changes.find((c) => c.hpid === hospitalId);
+        if (!change) return;
+        if (change.op === "remove") setMyBeds(null);
+        else setMyBeds((prev) => ({ ...(change.op === "add" ? {} : prev), ...change.fields }));
+      },
+    );
+  }, [isLoggedIn, hospitalId, hospitalSido]);
+
   // 선택된 세션 변경 시 메시지 로드 및 WebSocket 연결
   useEffect(() => {
     if (!selectedSession?.session_id) {
@@ -627,6 +657,11 @@ export const ERDashboard: React.FC<ERDashboardProps> = ({
             {hospitalId && (
               <span className="text-[11px] text-slate-500">ID: {hospitalId}</span>
             )}
+            {myBeds && (
+              <span className="text-[11px] text-slate-600">
+                응급실 {formatBedValue(myBeds.hvec ?? undefined)} · 수술실 {formatBedValue(myBeds.hvoc ?? undefined)} · 일반중환자실 {formatBedValue(myBeds.hvicc ?? undefined)}
+              </span>
+            )}
             <button
               onClick={handleLogoutClick}
               className="text-[11px] text-slate-500 hover:text-slate-700 px-2 py-1 rounded hover:bg-slate-100"
@@ -1,6 +1,6 @@
 import React, { useEffect, useMemo, useRef, useState } from "react";
 import { generateSBARSummary } from "../utils/sbarUtils";
-import { convertTextToSBAR } from "../services/api";
+import { convertTextToSBARStream } from "../services/api";
 import type { CriticalPreset } from "../types";
 
 interface PatientStatusInputProps {
@@ -80,6 +80,7 @@ export const PatientStatusInput: React.FC<PatientStatusInputProps> = ({
   const [isConvertingSBAR, setIsConvertingSBAR] = useState<boolean>(false);
   const debounceTimerRef = useRef<NodeJS.Timeout | null>(null);
   const lastConvertedTextRef = useRef<string>("");
+  const convertSeqRef = useRef<number>(0);  // 최신 변환 요청 번호 (이전 요청의 스트림 조각은 무시)
 
   // 텍스트 입력 시 실시간 SBAR 변환 (debounce 적용)
   useEffect(() => {
@@ -102,9 +103,23 @@ export const PatientStatusInput: React.FC<PatientStatusInputProps> = ({
 
     // 1.5초 후에 SBAR 변환 API 호출 (debounce)
     debounceTimerRef.current = setTimeout(async () => {
+      const seq = ++convertSeqRef.current;
+      const isLatest = () => seq === convertSeqRef.current;
+      let summary = "";
       try {
         setIsConvertingSBAR(true);
-        const result = await convertTextToSBAR(sttText);
+        // SBAR 토큰을 받는 대로 표시하고, 단계가 끝나면 완성된 요약으로 교체
+        const result = await convertTextToSBARStream(sttText, {
+          onDelta: (stage, content) => {
+            if (stage !== "sbar_summary" || !isLatest()) return;
+            summary += content;
+            setSbarText(summary);
+          },
+          onStage: (stage, content) => {
+            if (stage === "sbar_summary" && isLatest()) setSbarText(content);
+          },
+        });
+        if (!isLatest()) return;
         
         if (result.sbarSummary) {
           setSbarText(result.sbarSummary);
@@ -121,9 +136,9 @@ export const PatientStatusInput: React.FC<PatientStatusInputProps> = ({
       } catch (error: any) {
         console.error("SBAR 변환 실패:", error);
         // 에러 발생 시 원본 텍스트 사용
-    setSbarText(sttText);
+        if (isLatest()) setSbarText(sttText);
       } finally {
-        setIsConvertingSBAR(false);
+        if (isLatest()) setIsConvertingSBAR(false);
       }
     }, 1500); // 1.5초 debounce
 
@@ -3,10 +3,10 @@ import type { Coords, Region, Hospital, ApprovalStatus, HospitalHandoverSummary,
 import { symptomOptions } from "../constants";
 import {
   addressToCoord,
-  coordToAddress,
   coordToRegion,
+  locateCoords,
   searchHospitals,
-  transcribeAudio,
+  transcribeAudioStream,
   makeCall,
   getCallResponse,
   getRoute,
@@ -29,7 +29,8 @@ import { MapDisplay } from "./MapDisplay";
 import { ApprovedHospitalInfo } from "./ApprovedHospitalInfo";
 import { ParamedicChatSlideOver } from "./ParamedicChatSlideOver";
 import { KakaoAmbulanceMap } from "./KakaoAmbulanceMap";
-import { getSocket } from "../services/socket";
+import { getSocket, subscribeBeds, mergeBedFields, bedDeltaFields } from "../services/socket";
+import type { BedFields } from "../services/socket";
 
 export const SafeBridgeApp: React.FC = () => {
   const [address, setAddress] = useState<string>("");
@@ -284,7 +285,8 @@ export const SafeBridgeApp: React.FC = () => {
       
       // 주소 및 행정구역 역변환 (병렬 처리)
       try {
-        const [addressResult, regionResult] = await Promise.allSettled([coordToAddress(latitude, longitude), coordToRegion(latitude, longitude)]);
+        const located = locateCoords(latitude, longitude);
+        const [addressResult, regionResult] = await Promise.allSettled([located.then((r) => r.address), located.then((r) => r.region)]);
         
         // 주소 설정
         if (addressResult.status === "fulfilled" && addressResult.value) {
@@ -614,7 +616,7 @@ export const SafeBridgeApp: React.FC = () => {
       for (const hospital of targetHospitals) {
         if (hospital.wgs84Lat && hospital.wgs84Lon) {
           try {
-            const result = await getRoute(coords.lat!, coords.lon!, hospital.wgs84Lat, hospital.wgs84Lon);
+            const result = await getRoute(coords.lat!, coords.lon!, hospital.wgs84Lat, hospital.wgs84Lon, hospital.hpid);
             if (result?.path_coords) {
               paths[hospital.hpid || ""] = result.path_coords;
             }
@@ -708,10 +710,32 @@ export const SafeBridgeApp: React.FC = () => {
     }
   };
 
+  // 스트리밍 STT: Whisper 원문 → 의학용어 번역 → SBAR 요약을 도착하는 대로 화면에 반영
+  const transcribeWithProgress = (file: File) => {
+    let translated = "";
+    let summary = "";
+    return transcribeAudioStream(file, {
+      onTranscript: (text) => setSttText(text),
+      onDelta: (stage, content) => {
+        if (stage === "text") {
+          translated += content;
+          setSttText(translated);
+        } else if (stage === "sbar_summary") {
+          summary += content;
+          setSbarText(summary);
+        }
+      },
+      onStage: (stage, content) => {
+        if (stage === "text") setSttText(content);
+        else if (stage === "sbar_summary") setSbarText(content);
+      },
+    });
+  };
+
   const handleUploadAudio = async () => {
     if (!audioFile) return;
     try {
-      const result = await transcribeAudio(audioFile);
+      const result = await transcribeWithProgress(audioFile);
       if (result && result.text) {
         setSttText(String(result.text)); // 문자열로 확실히 변환
         if (result.sbarSummary) {
@@ -760,7 +784,7 @@ export const SafeBridgeApp: React.FC = () => {
         
         // 녹음된 파일을 업로드
         try {
-          const result = await transcribeAudio(audioFile);
+          const result = await transcribeWithProgress(audioFile);
           if (result && result.text) {
             setSttText(String(result.text)); // 문자열로 확실히 변환
             if (result.sbarSummary) {
@@ -1110,6 +1134,31 @@ export const SafeBridgeApp: React.FC = () => {
     };
   }, [hospitals]);
 
+  // 병상 변경 구독: 조회한 병원 목록이 있는 동안 시도 방의 변경분만 받아 병상 필드 갱신 (top3 재조회 없음)
+  const hasHospitalList = hospitals.length > 0 || neighborHospitals.length > 0 || !!approvedHospital;
+  useEffect(() => {
+    const sido = region?.sido;
+    if (!sido || !hasHospitalList) return;
+    let version = -1;
+    const applyBeds = (beds: Record<string, BedFields>) => {
+      setHospitals((prev) => mergeBedFields(prev, beds));
+      setNeighborHospitals((prev) => mergeBedFields(prev, beds));
+      setApprovedHospital((prev) => (prev ? mergeBedFields([prev], beds)[0] : prev));
+    };
+    return subscribeBeds(
+      sido,
+      (event) => {
+        version = event.version;
+        applyBeds(event.beds);
+      },
+      (event) => {
+        if (event.version <= version) return;  // 구독 직후 스냅샷보다 오래된 변경분 무시
+        version = event.version;
+        applyBeds(bedDeltaFields(event));
+      },
+    );
+  }, [region?.sido, hasHospitalList]);
+
   const FALLBACK_TWILIO_NUMBER = "010-4932-3766";
   // ARS용 환자 정보: 사용자가 선택한 STT 원문 또는 SBAR 텍스트만 사용
   // - Pre-KTAS 표기는 음성에서 자연스럽게 읽히도록 "프리케이타스"로 변환
@@ -156,6 +156,18 @@ export const coordToRegion = async (lat: number, lon: number): Promise<Region |
   }
 };
 
+// 좌표 → 주소 + 행정구역 동시 변환 (서버에서 병렬 조회, 병원/병상/등급 캐시 예열)
+export const locateCoords = async (lat: number, lon: number): Promise<{ address: string | null; region: Region | null }> => {
+  const res = await axios.get(`${API_BASE_URL}/api/geo/locate`, {
+    params: { lat, lon },
+    timeout: 15000,
+  });
+  return {
+    address: res.data?.address || null,
+    region: res.data?.sido && res.data?.sigungu ? { sido: res.data.sido, sigungu: res.data.sigungu } : null,
+  };
+};
+
 // 병원 조회
 export const searchHospitals = async (
   lat: number,
@@ -247,6 +259,80 @@ export const convertTextToSBAR = async (text: string): Promise<{ text: string; s
   }
 };
 
+// STT 스트리밍 이벤트 처리기 (/stream 경로, SSE)
+export type SttStreamStage = "text" | "sbar_summary" | "ars_narrative";
+
+export interface SttStreamHandlers {
+  onTranscript?: (text: string) => void;  // Whisper 원문 (텍스트 입력은 입력 원문)
+  onDelta?: (stage: SttStreamStage, content: string) => void;  // 번역/SBAR 토큰 조각
+  onStage?: (stage: SttStreamStage, content: string) => void;  // 단계 완료 (ARS 문장은 마지막에 한 번)
+}
+
+type SttResult = { text: string; sbarSummary?: string; arsNarrative?: string };
+
+const streamSttEvents = async (path: string, init: RequestInit, handlers: SttStreamHandlers): Promise<SttResult> => {
+  const res = await fetch(`${API_BASE_URL}${path}`, { method: "POST", credentials: "include", ...init });
+  if (!res.ok || !res.body) {
+    const data = await res.json().catch(() => null);
+    throw new Error(data?.error || "음성 인식 중 오류가 발생했습니다.");
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let result: SttResult | null = null;
+
+  const handleEvent = (block: string) => {
+    let event = "message";
+    const dataLines: string[] = [];
+    for (const line of block.split("\n")) {
+      if (line.startsWith("event:")) event = line.slice(6).trim();
+      else if (line.startsWith("data:")) dataLines.push(line.slice(5).trimStart());
+    }
+    if (dataLines.length === 0) return;  // 주석(연결 확인용) 무시
+    const data = JSON.parse(dataLines.join("\n"));
+    if (event === "transcript") handlers.onTranscript?.(data.text);
+    else if (event === "delta") handlers.onDelta?.(data.stage, data.content);
+    else if (event === "stage") handlers.onStage?.(data.stage, data.content);
+    else if (event === "error") throw new Error(data.error);
+    else if (event === "done") {
+      result = {
+        text: data.text || "",
+        sbarSummary: data.sbar_summary || undefined,
+        arsNarrative: data.ars_narrative || undefined,
+      };
+    }
+  };
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary >= 0) {
+      handleEvent(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+    }
+  }
+  if (!result) throw new Error("결과를 받기 전에 연결이 끊어졌습니다.");
+  return result;
+};
+
+// STT 음성 인식 (스트리밍): 원문 → 번역/SBAR 토큰 → ARS 문장 순서로 handlers 호출, 최종 결과 반환
+export const transcribeAudioStream = (audioFile: File, handlers: SttStreamHandlers = {}): Promise<SttResult> => {
+  const formData = new FormData();
+  formData.append("audio", audioFile);
+  return streamSttEvents("/api/stt/transcribe/stream", { body: formData }, handlers);
+};
+
+// 텍스트를 SBAR 형식으로 변환 (스트리밍)
+export const convertTextToSBARStream = (text: string, handlers: SttStreamHandlers = {}): Promise<SttResult> =>
+  streamSttEvents("/api/stt/convert-to-sbar/stream", {
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ text }),
+  }, handlers);
+
 // Twilio 전화 걸기
 export const makeCall = async (hospitalTel: string, hospitalName: string, patientInfo: string | null, callbackUrl?: string | null): Promise<{ call_sid: string }> => {
   try {
@@ -312,7 +398,8 @@ export const getRoute = async (
   originLat: number,
   originLon: number,
   destLat: number,
-  destLon: number
+  destLon: number,
+  hpid?: string
 ): Promise<{ path_coords?: number[][]; distance_km?: number; eta_minutes?: number } | null> => {
   try {
     const res = await axios.get(`${API_BASE_URL}/api/geo/route`, {
@@ -321,6 +408,8 @@ export const getRoute = async (
         origin_lon: originLon,
         dest_lat: destLat,
         dest_lon: destLon,
+        // 서버 경로 캐시를 top3 조회와 공유하기 위한 병원 ID
+        hpid,
       },
     });
     return res.data || null;
@@ -364,7 +453,7 @@ export const logout = async (): Promise<void> => {
   }
 };
 
-export const hospitalLogin = async (hospitalId: string, password: string): Promise<{ hospital_id: string; hospital_name: string }> => {
+export const hospitalLogin = async (hospitalId: string, password: string): Promise<{ hospital_id: string; hospital_name: string; sido?: string | null }> => {
   try {
     const res = await axios.post(`${API_BASE_URL}/api/auth/hospital-login`, {
       hospital_id: hospitalId,
@@ -386,6 +475,7 @@ export const getCurrentUser = async (): Promise<{
   region?: string | null;
   hospital_id?: string;
   hospital_name?: string;
+  sido?: string | null;  // 병원 주소의 시도 (병상 변경 구독용)
 } | null> => {
   try {
     const res = await axios.get(`${API_BASE_URL}/api/auth/me`, {
@@ -73,3 +73,70 @@ export const disconnectSocket = () => {
   }
 };
 
+
+export type BedFields = Record<string, string | null>;
+
+export interface BedSnapshotEvent {
+  sido: string;
+  version: number;
+  beds: Record<string, BedFields>;
+}
+
+export interface BedDeltaEvent {
+  sido: string;
+  version: number;
+  ts: number;
+  changes: Array<{ hpid: string; op: "add" | "update" | "remove"; fields?: BedFields }>;
+}
+
+// 시도 병상 변경 구독 (구독 직후 전체 상태, 이후 바뀐 필드만 수신) - 반환 함수 호출 시 구독 해제
+export const subscribeBeds = (
+  sido: string,
+  onSnapshot: (event: BedSnapshotEvent) => void,
+  onDelta: (event: BedDeltaEvent) => void,
+): (() => void) => {
+  const socket = getSocket();
+  const handleSnapshot = (event: BedSnapshotEvent) => {
+    if (event.sido === sido) onSnapshot(event);
+  };
+  const handleDelta = (event: BedDeltaEvent) => {
+    if (event.sido === sido) onDelta(event);
+  };
+  const subscribe = () => socket.emit("subscribe_beds", { sido });
+
+  socket.on("bed_snapshot", handleSnapshot);
+  socket.on("bed_delta", handleDelta);
+  // 재연결 시 서버에서 방 정보가 사라지므로 다시 구독
+  socket.on("connect", subscribe);
+  if (socket.connected) subscribe();
+
+  return () => {
+    socket.emit("unsubscribe_beds", { sido });
+    socket.off("bed_snapshot", handleSnapshot);
+    socket.off("bed_delta", handleDelta);
+    socket.off("connect", subscribe);
+  };
+};
+
+// 병원 목록에 병상 필드 반영 (해당 병원만 새 객체로 교체, 바뀐 병원이 없으면 같은 배열 반환)
+export const mergeBedFields = <T extends { hpid?: string }>(items: T[], beds: Record<string, BedFields>): T[] => {
+  let changed = false;
+  const next = items.map((item) => {
+    const fields = item.hpid ? beds[item.hpid] : undefined;
+    if (!fields) return item;
+    changed = true;
+    const merged: Record<string, unknown> = { ...item };
+    for (const [key, value] of Object.entries(fields)) merged[key] = value ?? undefined;
+    return merged as T;
+  });
+  return changed ? next : items;
+};
+
+// 변경 이벤트의 추가/수정 병원 필드 ({hpid: 바뀐 필드}, 목록에서 빠진 병원은 마지막 값 유지)
+export const bedDeltaFields = (event: BedDeltaEvent): Record<string, BedFields> => {
+  const beds: Record<string, BedFields> = {};
+  for (const change of event.changes) {
+    if (change.op !== "remove" && change.fields) beds[change.hpid] = change.fields;
+  }
+  return beds;
+};
@@ -45,6 +45,8 @@ export interface Hospital {
   hv11?: string;
   hvdnm?: string;
   hvidate?: string;
+  hvec_at_eta?: number | null;  // 도착 시점 예상 응급실 병상 수 (병상 이력 추세)
+  hvec_trend_per_hour?: number | null;
   _meets_conditions?: boolean;
   region_name?: string;
 }